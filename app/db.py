@@ -0,0 +1,103 @@
+# app/db.py
+
+import os
+import logging
+from typing import Optional
+from dotenv import load_dotenv
+from pgvector.psycopg import register_vector, register_vector_async
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+
+# 환경 변수 로드
+load_dotenv()
+DB_URL = os.getenv("DATABASE_URL")
+
+# 커넥션 풀 설정 (부하에 맞게 /metrics 의 풀 통계를 보고 조정)
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+# 커넥션 획득 대기 시간 (초). 초과 시 psycopg_pool.PoolTimeout 발생
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+# 유휴 커넥션 정리 시간 (초)
+POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "600"))
+# DB 가 내려간 경우 재연결을 시도하는 최대 시간 (초)
+POOL_RECONNECT_TIMEOUT = float(os.getenv("DB_POOL_RECONNECT_TIMEOUT", "300"))
+
+# ANN 검색 정확도/속도 조절 (세션 파라미터, 커넥션마다 설정)
+# IVFFlat: 살펴볼 리스트 수 (pgvector 기본 1 은 재현율이 낮음, 권장 시작값 sqrt(lists))
+VECTOR_IVFFLAT_PROBES = int(os.getenv("VECTOR_IVFFLAT_PROBES", "10"))
+# HNSW: 검색 후보 목록 크기 (top_k 이상이어야 함)
+VECTOR_HNSW_EF_SEARCH = int(os.getenv("VECTOR_HNSW_EF_SEARCH", "40"))
+# 아직 pgvector 가 로드되지 않은 세션에서도 설정할 수 있도록 set_config 사용
+VECTOR_SETTINGS_SQL = "SELECT set_config('ivfflat.probes', %s, false), set_config('hnsw.ef_search', %s, false)"
+VECTOR_SETTINGS = (str(VECTOR_IVFFLAT_PROBES), str(VECTOR_HNSW_EF_SEARCH))
+
+logger = logging.getLogger(__name__)
+
+
+def configure_connection(conn) -> None:
+    """새 커넥션 설정: pgvector 타입 어댑터 등록 + ANN 검색 파라미터"""
+    register_vector(conn)
+    conn.execute(VECTOR_SETTINGS_SQL, VECTOR_SETTINGS)
+
+
+async def configure_connection_async(conn) -> None:
+    await register_vector_async(conn)
+    await conn.execute(VECTOR_SETTINGS_SQL, VECTOR_SETTINGS)
+
+
+def create_pool(
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> ConnectionPool:
+    """
+    autocommit 커넥션 풀을 생성합니다.
+
+    - 체크아웃 시 check_connection 으로 상태를 확인하고, 끊어진 커넥션은 폐기 후 새로 연결합니다.
+    - 커넥션 생성 실패 시 reconnect_timeout 동안 백그라운드에서 재연결을 시도합니다.
+    - 새 커넥션마다 pgvector 타입 어댑터를 등록하여 임베딩을 numpy 배열로 주고받고,
+      ANN 검색 파라미터(ivfflat.probes, hnsw.ef_search)를 설정합니다.
+    """
+    logger.debug("Creating connection pool for database: %s", DB_URL)
+    return ConnectionPool(
+        DB_URL or "",
+        min_size=POOL_MIN_SIZE if min_size is None else min_size,
+        max_size=POOL_MAX_SIZE if max_size is None else max_size,
+        timeout=POOL_TIMEOUT if timeout is None else timeout,
+        max_idle=POOL_MAX_IDLE,
+        reconnect_timeout=POOL_RECONNECT_TIMEOUT,
+        kwargs={"autocommit": True},
+        configure=configure_connection,
+        check=ConnectionPool.check_connection,
+        name="searchright",
+        open=True,
+    )
+
+
+def pool_stats(pool) -> dict:
+    """풀 크기 산정을 위한 통계 (현재 크기, 대기 요청 수, 대기 시간, 오류 수 등)"""
+    return pool.get_stats()
+
+
+def create_async_pool(
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> AsyncConnectionPool:
+    """
+    create_pool 과 같은 설정의 비동기 커넥션 풀을 생성합니다.
+    이벤트 루프가 필요하므로 생성 시에는 열지 않고, 사용 시점에 `await pool.open()` 합니다.
+    """
+    logger.debug("Creating async connection pool for database: %s", DB_URL)
+    return AsyncConnectionPool(
+        DB_URL or "",
+        min_size=POOL_MIN_SIZE if min_size is None else min_size,
+        max_size=POOL_MAX_SIZE if max_size is None else max_size,
+        timeout=POOL_TIMEOUT if timeout is None else timeout,
+        max_idle=POOL_MAX_IDLE,
+        reconnect_timeout=POOL_RECONNECT_TIMEOUT,
+        kwargs={"autocommit": True},
+        configure=configure_connection_async,
+        check=AsyncConnectionPool.check_connection,
+        name="searchright-async",
+        open=False,
+    )
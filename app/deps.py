@@ -1,7 +1,17 @@
 # app/deps.py
+#
+# 무거운 공유 객체(LLM 클라이언트, 커넥션 풀, 토크나이저 등)의 레지스트리.
+# 모든 객체는 처음 사용할 때 생성되며, 앱 시작 시 warm-up 으로 미리 만들 수 있습니다.
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from openai import OpenAI
-from app.services.vector_search import VectorSearch
+import tiktoken
+from openai import AsyncOpenAI, OpenAI
+from app.db import POOL_MAX_SIZE
+from app.services.cache import create_tag_cache
+from app.services.jobs import JobStore
+from app.services.prompt_builder import PromptBuilder
+from app.services.single_flight import INFER_SINGLE_FLIGHT, SingleFlight
+from app.services.vector_search import AsyncVectorSearch, VectorSearch
 
 @lru_cache()
 def get_openai_client():
@@ -11,3 +21,55 @@ def get_openai_client():
 def get_vector_search():
     return VectorSearch()
 
+@lru_cache()
+def get_retrieval_executor():
+    # 동기 경로의 검색을 마감 시간과 함께 실행하는 스레드 풀 (요청마다 만들지 않음).
+    # 마감을 넘긴 검색도 끝날 때까지 스레드와 커넥션을 쓰므로 커넥션 풀 크기만큼으로 제한
+    return ThreadPoolExecutor(max_workers=POOL_MAX_SIZE, thread_name_prefix="retrieval")
+
+@lru_cache()
+def get_async_openai_client():
+    return AsyncOpenAI()
+
+@lru_cache()
+def get_async_vector_search():
+    return AsyncVectorSearch()
+
+@lru_cache()
+def get_tag_cache():
+    return create_tag_cache()
+
+@lru_cache()
+def get_single_flight():
+    # 요청마다 만드는 InferenceService 들이 진행 중인 호출을 공유하도록 프로세스당 하나
+    return SingleFlight() if INFER_SINGLE_FLIGHT else None
+
+@lru_cache()
+def get_tokenizer(model: str):
+    # BPE 파일 로딩이 느리므로 모델별로 한 번만 생성
+    return tiktoken.encoding_for_model(model)
+
+@lru_cache()
+def get_prompt_builder(model: str):
+    # 고정 프롬프트를 한 번만 만들고 토큰화
+    return PromptBuilder(get_tokenizer(model))
+
+@lru_cache()
+def get_job_store():
+    # 검색과 같은 비동기 커넥션 풀을 사용
+    return JobStore(get_async_vector_search().pool)
+
+async def close_all() -> None:
+    """생성된 커넥션 풀을 닫고 레지스트리를 비웁니다. 생성되지 않은 객체는 만들지 않습니다."""
+    if get_async_vector_search.cache_info().currsize:
+        await get_async_vector_search().close()
+    if get_retrieval_executor.cache_info().currsize:
+        get_retrieval_executor().shutdown(wait=False, cancel_futures=True)
+    if get_vector_search.cache_info().currsize:
+        get_vector_search().close()
+    for factory in (
+        get_openai_client, get_vector_search, get_retrieval_executor, get_async_openai_client,
+        get_async_vector_search, get_tag_cache, get_tokenizer, get_prompt_builder, get_job_store,
+        get_single_flight,
+    ):
+        factory.cache_clear()
@@ -0,0 +1,84 @@
+# app/logging_config.py
+
+import os
+import json
+import random
+import logging
+from typing import Optional, Sequence
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 서비스 로그 레벨 (운영 기본값 INFO). DEBUG 는 요청마다 포지션·검색 행을 기록하므로 개발용
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# text: 사람이 읽는 한 줄 포맷, json: 로그 수집기용 구조화 포맷
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+# 프롬프트·LLM 응답·임베딩처럼 큰 값을 DEBUG 로그에 남길 비율 (0~1)
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))
+# 샘플로 남길 때 잘라낼 최대 길이 (문자 / 벡터 차원 수)
+LOG_PREVIEW_CHARS = int(os.getenv("LOG_PREVIEW_CHARS", "500"))
+LOG_PREVIEW_DIMS = 8
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+
+# LogRecord 기본 속성 (extra 로 전달된 필드만 JSON 에 포함하기 위해 제외)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 포맷터. logger.info(..., extra={...}) 의 필드를 최상위 키로 포함합니다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+_configured = False
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None, force: bool = False) -> None:
+    """
+    서비스 로깅을 한 번만 설정합니다 (앱 시작 시 호출).
+    app 패키지 로거에만 핸들러를 달고, uvicorn 등 다른 라이브러리의 설정은 건드리지 않습니다.
+    """
+    global _configured
+    if _configured and not force:
+        return
+
+    handler = logging.StreamHandler()
+    if (fmt or LOG_FORMAT) == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    app_logger = logging.getLogger("app")
+    app_logger.handlers[:] = [handler]
+    app_logger.setLevel((level or LOG_LEVEL).upper())
+    app_logger.propagate = False
+    _configured = True
+
+
+def sampled(rate: Optional[float] = None) -> bool:
+    """큰 값을 로그로 남길지 결정합니다. 호출부에서 isEnabledFor 확인 후 사용하세요."""
+    rate = LOG_SAMPLE_RATE if rate is None else rate
+    return rate > 0 and (rate >= 1 or random.random() < rate)
+
+
+def preview_text(text: str, limit: Optional[int] = None) -> str:
+    limit = LOG_PREVIEW_CHARS if limit is None else limit
+    return text if len(text) <= limit else f"{text[:limit]}… (+{len(text) - limit} chars)"
+
+
+def preview_vector(vec: Sequence[float], dims: int = LOG_PREVIEW_DIMS) -> str:
+    head = ", ".join(f"{v:.4f}" for v in vec[:dims])
+    return f"[{head}, …] (dim={len(vec)})"
@@ -1,12 +1,67 @@
 # app/main.py
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from app.deps import (
+    close_all, get_async_openai_client, get_async_vector_search, get_job_store, get_prompt_builder, get_tag_cache,
+)
+from app.logging_config import configure_logging
 from app.routers.infer import router as infer_router
+from app.routers.jobs import router as jobs_router
+from app.routers.metrics import router as metrics_router
+from app.services.inference import LLM_MODEL, InferenceService
+from app.services.jobs import JOB_WORKERS, JobWorker
+
+# 시작 시 커넥션 풀 연결, 프로파일 임베딩 로드, 프롬프트 토큰화를 미리 수행 (0 이면 첫 요청 시 지연 생성)
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") == "1"
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up() -> None:
+    get_async_openai_client()
+    await get_async_vector_search().warm_up()
+    logger.info("Warm-up complete (prompt template: %d tokens)", get_prompt_builder(LLM_MODEL).static_tokens)
+
+
+def job_service() -> InferenceService:
+    return InferenceService(
+        llm_client=get_async_openai_client(),
+        vector_search=get_async_vector_search(),
+        cache=get_tag_cache(),
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_logging()
+    if WARMUP_ON_STARTUP:
+        try:
+            await warm_up()
+        except Exception:
+            # DB 가 아직 준비되지 않았더라도 기동은 계속하고, 첫 요청에서 다시 시도
+            logger.warning("Warm-up failed; falling back to lazy initialization", exc_info=True)
+    # 대량 작업(POST /jobs) 워커. 중단된 작업은 재시작 후 lease 가 지나면 이어서 처리
+    workers = [
+        asyncio.create_task(JobWorker(get_job_store(), job_service).run_forever())
+        for _ in range(JOB_WORKERS)
+    ]
+    yield
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    await close_all()
+
 
 app = FastAPI(
     title="Talent Inference API",
     description="상세 이력서에서 경험·역량 태그를 추론하는 API (한국어)",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.include_router(infer_router)
-
+app.include_router(jobs_router)
+app.include_router(metrics_router)
@@ -1,11 +1,15 @@
 # app/routers/infer.py
 
+import json
+import logging
 from fastapi import APIRouter, Depends, HTTPException
-from app.schemas import DetailedTalentInput, TagResponse
-from app.services.inference import InferenceService
-from app.deps import get_openai_client, get_vector_search
+from fastapi.responses import StreamingResponse
+from app.schemas import BatchInferRequest, BatchTagResponse, DetailedTalentInput, TagResponse
+from app.services.inference import INFER_BATCH_MAX_ITEMS, InferenceService
+from app.deps import get_async_openai_client, get_async_vector_search, get_single_flight, get_tag_cache
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @router.post(
     "/infer",
@@ -52,18 +56,125 @@ router = APIRouter()
         500: {"description": "서버 내부 오류"}
     },
 )
-def infer(
+async def infer(
     payload: DetailedTalentInput,
-    openai_client=Depends(get_openai_client),
-    vsearch=Depends(get_vector_search),
+    openai_client=Depends(get_async_openai_client),
+    vsearch=Depends(get_async_vector_search),
+    cache=Depends(get_tag_cache),
+    single_flight=Depends(get_single_flight),
 ):
     # positions 최소 1건 이상 검증
     if not payload.positions:
         raise HTTPException(status_code=400, detail="positions 리스트가 비어있습니다.")
     try:
-        svc = InferenceService(llm_client=openai_client, vector_search=vsearch)
-        return svc.run(payload)
+        svc = InferenceService(
+            llm_client=openai_client, vector_search=vsearch, cache=cache, single_flight=single_flight
+        )
+        return await svc.arun(payload)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception:
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post(
+    "/infer/batch",
+    response_model=BatchTagResponse,
+    summary="여러 지원자 태그 일괄 추론",
+    description=(
+        "여러 지원자의 태그를 한 번에 추론합니다. 배치 전체에서 같은 회사·기간의 검색은 한 번만 실행하고, "
+        "LLM 호출은 INFER_BATCH_CONCURRENCY 개까지 동시에 실행합니다. "
+        "결과는 입력 순서대로 반환되며, 실패한 항목은 result 대신 error 를 담습니다. "
+        "검색 마감(RETRIEVAL_DEADLINE)을 넘겨 일부 문서 없이 추론한 항목은 degraded 가 true 입니다."
+    ),
+    responses={
+        200: {
+            "description": "항목별 추론 결과 (일부 항목이 실패해도 200)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "results": [
+                            {"index": 0, "result": {"tags": ["상위권대학교 (연세대학교)"]}, "error": None, "degraded": False},
+                            {"index": 1, "result": None, "error": "positions 리스트가 비어있습니다.", "degraded": False}
+                        ]
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "배치 크기 초과",
+            "content": {
+                "application/json": {
+                    "example": {"detail": f"items 는 최대 {INFER_BATCH_MAX_ITEMS}건까지 보낼 수 있습니다."}
+                }
+            }
+        },
+        422: {"description": "유효성 검사 실패 (입력 스키마 위반)"},
+    },
+)
+async def infer_batch(
+    payload: BatchInferRequest,
+    openai_client=Depends(get_async_openai_client),
+    vsearch=Depends(get_async_vector_search),
+    cache=Depends(get_tag_cache),
+):
+    if len(payload.items) > INFER_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"items 는 최대 {INFER_BATCH_MAX_ITEMS}건까지 보낼 수 있습니다.")
+    svc = InferenceService(llm_client=openai_client, vector_search=vsearch, cache=cache)
+    return BatchTagResponse(results=await svc.arun_batch(payload.items))
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.post(
+    "/infer/stream",
+    summary="지원자 태그 추론 (Server-Sent Events 스트리밍)",
+    description=(
+        "/infer 와 같은 입력을 받아 결과를 SSE 로 스트리밍합니다. "
+        "`retrieval` (검색된 문서) → `tag` (생성되는 대로 태그 하나씩) → `done` (최종 TagResponse) 순서이며, "
+        "스트리밍 도중 실패하면 `error` 이벤트로 끝납니다."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {
+                "text/event-stream": {
+                    "example": (
+                        'event: retrieval\ndata: {"docs": [...], "complete": true, "cached": false}\n\n'
+                        'event: tag\ndata: {"tag": "상위권대학교 (연세대학교)"}\n\n'
+                        'event: done\ndata: {"tags": ["상위권대학교 (연세대학교)"], "usage": {...}}\n\n'
+                    )
+                }
+            }
+        },
+        400: {"description": "비즈니스 로직 에러 (positions 가 비어있음)"},
+    },
+)
+async def infer_stream(
+    payload: DetailedTalentInput,
+    openai_client=Depends(get_async_openai_client),
+    vsearch=Depends(get_async_vector_search),
+    cache=Depends(get_tag_cache),
+):
+    if not payload.positions:
+        raise HTTPException(status_code=400, detail="positions 리스트가 비어있습니다.")
+    svc = InferenceService(llm_client=openai_client, vector_search=vsearch, cache=cache)
+
+    async def events():
+        try:
+            async for event, data in svc.astream(payload):
+                yield _sse(event, data)
+        except ValueError as e:
+            yield _sse("error", {"detail": str(e)})
+        except Exception:
+            # 응답 헤더는 이미 보냈으므로 상태 코드 대신 error 이벤트로 알림
+            logger.exception("Streaming inference failed")
+            yield _sse("error", {"detail": "Internal server error"})
+
+    # 프록시(nginx)가 이벤트를 모아 두지 않도록 버퍼링 비활성화
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,90 @@
+# app/routers/jobs.py
+
+import json
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from app.deps import get_job_store
+from app.schemas import JobCreated, JobReference, JobStatus
+from app.services.jobs import file_chunks, input_path, jsonl_lines
+
+router = APIRouter()
+
+@router.post(
+    "/jobs",
+    response_model=JobCreated,
+    status_code=202,
+    summary="대량 태그 추론 작업 등록",
+    description=(
+        "JSONL(한 줄에 DetailedTalentInput 하나)을 요청 본문으로 업로드하거나 "
+        "(`Content-Type: application/x-ndjson`), JOB_INPUT_DIR 안의 JSONL 파일을 "
+        "`{\"path\": \"requests.jsonl\"}` 로 참조해 작업을 등록합니다. "
+        "항목은 Postgres 에 저장된 뒤 워커가 순서대로 처리하며, 진행률은 GET /jobs/{id} 로 확인합니다."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "application/json": {"schema": JobReference.model_json_schema()},
+            },
+            "required": True,
+        }
+    },
+    responses={
+        400: {
+            "description": "잘못된 JSONL 줄 또는 참조",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "3번째 줄이 올바른 이력서가 아닙니다: Field required"}
+                }
+            }
+        },
+    },
+)
+async def create_job(request: Request, store=Depends(get_job_store)):
+    try:
+        if request.headers.get("content-type", "").startswith("application/json"):
+            ref = JobReference.model_validate_json(await request.body())
+            chunks = file_chunks(input_path(ref.path))
+        else:
+            chunks = request.stream()
+        job_id, total = await store.create(jsonl_lines(chunks))
+    except ValueError as e:
+        # {"path": ...} 본문 검증 실패(ValidationError)는 첫 오류 메시지만 반환
+        detail = e.errors()[0]["msg"] if isinstance(e, ValidationError) else str(e)
+        raise HTTPException(status_code=400, detail=detail)
+    return JobCreated(id=job_id, total=total)
+
+async def _job_or_404(job_id: uuid.UUID, store) -> dict:
+    job = await store.get(str(job_id))
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobStatus,
+    summary="작업 진행률 조회",
+)
+async def get_job(job_id: uuid.UUID, store=Depends(get_job_store)):
+    return await _job_or_404(job_id, store)
+
+@router.get(
+    "/jobs/{job_id}/results",
+    summary="작업 결과 스트리밍 (JSONL)",
+    description=(
+        "처리된 항목을 입력 순서대로 한 줄에 하나씩 `{index, result, error}` 로 스트리밍합니다. "
+        "작업이 진행 중이면 지금까지 끝난 항목만 반환하므로, 마지막으로 받은 index 를 `after` 로 넘겨 이어 받을 수 있습니다."
+    ),
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def get_job_results(job_id: uuid.UUID, after: int = -1, store=Depends(get_job_store)):
+    await _job_or_404(job_id, store)
+
+    async def lines():
+        async for idx, result, error in store.results(str(job_id), after):
+            yield json.dumps({"index": idx, "result": result, "error": error}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
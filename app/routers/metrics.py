@@ -0,0 +1,25 @@
+# app/routers/metrics.py
+
+from fastapi import APIRouter, Depends
+from app.deps import get_async_vector_search, get_single_flight, get_tag_cache
+
+router = APIRouter()
+
+@router.get(
+    "/metrics",
+    summary="서비스 내부 지표 조회",
+    description=(
+        "DB 커넥션 풀 통계(현재 크기, 대기 요청 수, 대기 시간, 오류 수 등)와 "
+        "태그 캐시 적중/미스 통계, 동시 요청 합치기(single-flight) 통계를 반환합니다."
+    ),
+)
+async def metrics(
+    vsearch=Depends(get_async_vector_search),
+    cache=Depends(get_tag_cache),
+    single_flight=Depends(get_single_flight),
+):
+    return {
+        "db_pool": vsearch.pool_stats(),
+        "tag_cache": cache.stats() if cache is not None else None,
+        "single_flight": single_flight.stats() if single_flight is not None else None,
+    }
@@ -1,6 +1,10 @@
+import datetime
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
+# 예상하지 못한 오류(LLM 장애·타임아웃 등)에 돌려주는 메시지 (내부 정보는 노출하지 않음)
+INTERNAL_ERROR = "Internal server error"
+
 class DateInfo(BaseModel):
     year: int = Field(..., example=2021)
     month: int = Field(..., ge=1, le=12, example=4)
@@ -37,5 +41,51 @@ class DetailedTalentInput(BaseModel):
             }
         }
 
+class PromptUsage(BaseModel):
+    prompt_tokens: int = Field(..., description="프롬프트 토큰 수 (tiktoken 기준)")
+    max_prompt_tokens: int = Field(..., description="프롬프트 토큰 예산 (PROMPT_MAX_TOKENS)")
+    static_tokens: int = Field(..., description="지시문·예시·답변 형식 토큰 수")
+    resume_tokens: int = Field(..., description="이력서 토큰 수 (필드 정리·자르기 후)")
+    doc_tokens: int = Field(..., description="관련 문서 스니펫 토큰 수")
+    docs_included: int = Field(..., description="예산 안에 포함된 문서 수")
+    docs_available: int = Field(..., description="검색된 문서 수 (중복 제거 후)")
+    llm_prompt_tokens: Optional[int] = Field(None, description="LLM 이 보고한 입력 토큰 수 (메시지 포맷 포함, 캐시 적중 시 null)")
+    completion_tokens: Optional[int] = Field(None, description="LLM 이 보고한 출력 토큰 수 (캐시 적중 시 null)")
+
 class TagResponse(BaseModel):
-    tags: List[str]
\ No newline at end of file
+    tags: List[str]
+    usage: Optional[PromptUsage] = Field(None, description="프롬프트 토큰 사용량")
+
+class BatchInferRequest(BaseModel):
+    items: List[DetailedTalentInput] = Field(..., min_length=1, description="지원자 이력서 목록 (INFER_BATCH_MAX_ITEMS 건 이하)")
+
+class BatchItemResult(BaseModel):
+    index: int = Field(..., description="입력 items 에서의 위치")
+    result: Optional[TagResponse] = Field(None, description="태그 추론 결과 (실패 시 null)")
+    error: Optional[str] = Field(None, description="항목별 오류 메시지 (성공 시 null)")
+    degraded: bool = Field(False, description="검색 마감을 넘긴 포지션이 있어 일부 문서 없이 추론됨")
+
+    @property
+    def retryable(self) -> bool:
+        """다시 시도하면 달라질 수 있는 결과인지 (예상하지 못한 오류이거나 검색 마감 초과)"""
+        return self.error == INTERNAL_ERROR or self.degraded
+
+class BatchTagResponse(BaseModel):
+    results: List[BatchItemResult] = Field(..., description="입력 순서와 같은 항목별 결과")
+
+class JobReference(BaseModel):
+    path: str = Field(..., description="JOB_INPUT_DIR 안의 JSONL 파일 (한 줄에 이력서 하나)", example="requests.jsonl")
+
+class JobCreated(BaseModel):
+    id: str = Field(..., description="작업 id")
+    total: int = Field(..., description="작업에 포함된 이력서 수")
+
+class JobStatus(BaseModel):
+    id: str
+    status: str = Field(..., description="queued | running | done")
+    total: int
+    completed: int = Field(..., description="처리된 항목 수 (실패 포함)")
+    failed: int = Field(..., description="error 로 끝난 항목 수")
+    created_at: datetime.datetime
+    updated_at: datetime.datetime
+    finished_at: Optional[datetime.datetime] = None
@@ -0,0 +1,66 @@
+# app/services/ann_index.py
+
+import os
+import math
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# company_docs.embedding 의 근사 최근접(ANN) 인덱스 설정 (scripts/manage_index.py 에서 사용)
+ANN_INDEX_NAME = "idx_company_docs_embedding"
+INDEX_METHODS = ("hnsw", "ivfflat")
+ANN_INDEX_METHOD = os.getenv("ANN_INDEX_METHOD", "hnsw")
+# HNSW 그래프 이웃 수 / 빌드 시 후보 수 (pgvector 기본값)
+HNSW_M = int(os.getenv("HNSW_M", "16"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "64"))
+# IVFFlat 리스트 수. 0 이면 행 수로 계산 (ivfflat_lists)
+IVFFLAT_LISTS = int(os.getenv("IVFFLAT_LISTS", "0"))
+
+# 검색 대상은 프로필이 아닌 문서뿐이므로 인덱스에서 프로필을 제외 (ANN 후보를 프로필이 차지하지 않도록)
+ANN_INDEX_WHERE = "doc_type <> 'profile'"
+
+# IVFFlat 은 리스트당 최소 이 정도 행이 있어야 중심점 학습이 의미가 있음
+ROWS_PER_LIST = 1000
+LARGE_TABLE_ROWS = 1_000_000
+
+
+def ivfflat_lists(rows: int) -> int:
+    """pgvector 권장값: 100만 행까지는 rows / 1000, 그 이상은 sqrt(rows) (최소 1)"""
+    if rows <= LARGE_TABLE_ROWS:
+        return max(1, rows // ROWS_PER_LIST)
+    return int(math.sqrt(rows))
+
+
+def ivfflat_probes(lists: int) -> int:
+    """검색 시 살펴볼 리스트 수의 권장 시작값: sqrt(lists)"""
+    return max(1, int(math.sqrt(lists)))
+
+
+def index_ddl(
+    method: str,
+    rows: int = 0,
+    name: str = ANN_INDEX_NAME,
+    table: str = "company_docs",
+    lists: Optional[int] = None,
+    m: int = HNSW_M,
+    ef_construction: int = HNSW_EF_CONSTRUCTION,
+    concurrently: bool = True,
+    where: Optional[str] = ANN_INDEX_WHERE,
+) -> str:
+    """
+    코사인 거리(<=>) 검색용 ANN 인덱스 CREATE INDEX 문을 만듭니다 (where 가 있으면 부분 인덱스).
+    IVFFlat 의 lists 는 지정하지 않으면 (IVFFLAT_LISTS 또는) 현재 행 수로 정합니다.
+    """
+    if method == "hnsw":
+        options = f"m = {m}, ef_construction = {ef_construction}"
+    elif method == "ivfflat":
+        options = f"lists = {lists or IVFFLAT_LISTS or ivfflat_lists(rows)}"
+    else:
+        raise ValueError(f"Unknown index method {method!r}; expected one of {INDEX_METHODS}")
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}{name} "
+        f"ON {table} USING {method} (embedding vector_cosine_ops) WITH ({options})"
+        + (f" WHERE {where}" if where else "")
+    )
@@ -0,0 +1,171 @@
+# app/services/bulk_load.py
+
+import logging
+from typing import Any, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+from psycopg.types.json import Jsonb
+
+logger = logging.getLogger(__name__)
+
+# 각 적재는 하나의 트랜잭션에서 실행됩니다:
+#   1) 세션 임시 스테이징 테이블 생성 (커밋 시 삭제)
+#   2) COPY ... FROM STDIN 으로 행을 스트리밍 (전체를 메모리에 올리지 않음)
+#   3) 스테이징 내 중복 제거 후 단일 INSERT ... ON CONFLICT DO NOTHING 으로 병합
+# 스테이징의 seq 는 입력 순서이며, 중복 중에서는 먼저 들어온 행이 남습니다(기존 로더와 동일).
+
+COMPANY_STAGE_DDL = """
+    CREATE TEMP TABLE company_stage (
+      seq BIGINT GENERATED ALWAYS AS IDENTITY, name TEXT, data JSONB
+    ) ON COMMIT DROP
+"""
+COMPANY_MERGE_SQL = """
+    INSERT INTO company (name, data)
+    SELECT DISTINCT ON (name) name, data
+      FROM company_stage
+     ORDER BY name, seq
+    ON CONFLICT (name) DO NOTHING
+"""
+
+NEWS_STAGE_DDL = """
+    CREATE TEMP TABLE news_stage (
+      seq BIGINT GENERATED ALWAYS AS IDENTITY,
+      company_name TEXT, title TEXT, original_link TEXT, news_date DATE
+    ) ON COMMIT DROP
+"""
+NEWS_MISSING_COMPANY_SQL = """
+    SELECT COUNT(*)
+      FROM news_stage s
+     WHERE NOT EXISTS (SELECT 1 FROM company c WHERE c.name = s.company_name)
+"""
+NEWS_MERGE_SQL = """
+    INSERT INTO company_news (company_id, title, original_link, news_date)
+    SELECT DISTINCT ON (c.id, s.title, s.news_date)
+           c.id, s.title, s.original_link, s.news_date
+      FROM news_stage s
+      JOIN company c ON c.name = s.company_name
+     ORDER BY c.id, s.title, s.news_date, s.seq
+    ON CONFLICT (company_id, title, news_date) DO NOTHING
+"""
+
+DOCS_STAGE_DDL = """
+    CREATE TEMP TABLE docs_stage (
+      seq BIGINT GENERATED ALWAYS AS IDENTITY,
+      company_id INTEGER, doc_type TEXT, content TEXT, embedding VECTOR(1536), published_at DATE
+    ) ON COMMIT DROP
+"""
+DOCS_MISSING_COMPANY_SQL = """
+    SELECT COUNT(*)
+      FROM docs_stage s
+     WHERE NOT EXISTS (SELECT 1 FROM company c WHERE c.id = s.company_id)
+"""
+DOCS_MERGE_SQL = """
+    INSERT INTO company_docs (company_id, doc_type, content, embedding, published_at)
+    SELECT DISTINCT ON (s.company_id, s.doc_type, md5(s.content))
+           s.company_id, s.doc_type::doc_type, s.content, s.embedding, s.published_at
+      FROM docs_stage s
+      JOIN company c ON c.id = s.company_id
+     ORDER BY s.company_id, s.doc_type, md5(s.content), s.seq
+    ON CONFLICT (company_id, doc_type, content_hash) DO NOTHING
+"""
+# replace=True: 스테이징된 문서가 같은 (회사, doc_type) 의 기존 문서를 대체 (회사당 1건인 profile 용)
+DOCS_REPLACE_SQL = """
+    DELETE FROM company_docs d
+     USING docs_stage s
+     WHERE d.company_id = s.company_id
+       AND d.doc_type   = s.doc_type::doc_type
+"""
+DOCS_COPY_TYPES = ["int4", "text", "text", "vector", "date"]
+
+
+class LoadResult(NamedTuple):
+    staged: int        # COPY 로 스테이징에 적재된 행 수
+    inserted: int      # 실제 대상 테이블에 추가된 행 수
+    missing: int = 0   # 참조 대상(회사)이 없어 건너뛴 행 수
+    replaced: int = 0  # 새 행으로 대체되어 삭제된 기존 행 수
+
+    @property
+    def skipped(self) -> int:
+        """중복(스테이징 내 또는 기존 데이터)으로 건너뛴 행 수"""
+        return self.staged - self.inserted - self.missing
+
+
+def _copy_and_merge(
+    conn,
+    target: str,
+    stage_ddl: str,
+    stage: str,
+    columns: Sequence[str],
+    rows: Iterable[Tuple[Any, ...]],
+    merge_sql: str,
+    types: Optional[Sequence[str]] = None,
+    missing_sql: Optional[str] = None,
+    replace_sql: Optional[str] = None,
+) -> LoadResult:
+    copy_sql = f"COPY {stage} ({', '.join(columns)}) FROM STDIN"
+    if types is not None:
+        copy_sql += " (FORMAT BINARY)"
+
+    with conn.transaction(), conn.cursor() as cur:
+        cur.execute(stage_ddl)
+        staged = 0
+        with cur.copy(copy_sql) as copy:
+            if types is not None:
+                copy.set_types(types)
+            for row in rows:
+                copy.write_row(row)
+                staged += 1
+
+        missing = 0
+        if missing_sql is not None:
+            cur.execute(missing_sql)
+            missing = cur.fetchone()[0]
+        replaced = 0
+        if replace_sql is not None:
+            # 삭제와 삽입이 같은 트랜잭션이므로 조회 측에서는 한 번에 교체된 것으로 보임
+            cur.execute(replace_sql)
+            replaced = cur.rowcount
+        cur.execute(merge_sql)
+        inserted = cur.rowcount
+
+    result = LoadResult(staged, inserted, missing, replaced)
+    logger.info(
+        "Bulk load into %s: %d staged, %d inserted, %d duplicate, %d missing reference, %d replaced",
+        target, result.staged, result.inserted, result.skipped, result.missing, result.replaced
+    )
+    return result
+
+
+def bulk_load_companies(conn, rows: Iterable[Tuple[str, dict]]) -> LoadResult:
+    """(회사명, 데이터 dict) 를 company 에 적재합니다. 이미 있는 회사명은 건너뜁니다."""
+    return _copy_and_merge(
+        conn, "company", COMPANY_STAGE_DDL, "company_stage", ("name", "data"),
+        ((name, Jsonb(data)) for name, data in rows),
+        COMPANY_MERGE_SQL,
+    )
+
+
+def bulk_load_news(conn, rows: Iterable[Tuple[str, str, Optional[str], Any]]) -> LoadResult:
+    """
+    (회사명, 제목, 링크, 날짜) 를 company_news 에 적재합니다.
+    (회사, 제목, 날짜) 가 같은 뉴스와 존재하지 않는 회사의 뉴스는 건너뜁니다.
+    """
+    return _copy_and_merge(
+        conn, "company_news", NEWS_STAGE_DDL, "news_stage", ("company_name", "title", "original_link", "news_date"),
+        rows, NEWS_MERGE_SQL, missing_sql=NEWS_MISSING_COMPANY_SQL,
+    )
+
+
+def bulk_load_docs(conn, rows: Iterable[Tuple[int, str, str, Any, Any]], replace: bool = False) -> LoadResult:
+    """
+    (company_id, doc_type, 본문, 임베딩, 발행일) 을 company_docs 에 적재합니다.
+    존재하지 않는 회사의 문서는 건너뜁니다.
+    임베딩(float32 ndarray)은 바이너리 COPY 로 전송되므로 커넥션에 pgvector 어댑터가 등록되어 있어야 합니다.
+    replace=True 이면 같은 회사·doc_type 의 기존 문서를 같은 트랜잭션에서 삭제한 뒤 삽입합니다
+    (내용이 같아도 새 임베딩으로 교체).
+    """
+    return _copy_and_merge(
+        conn, "company_docs", DOCS_STAGE_DDL, "docs_stage",
+        ("company_id", "doc_type", "content", "embedding", "published_at"),
+        rows, DOCS_MERGE_SQL, types=DOCS_COPY_TYPES, missing_sql=DOCS_MISSING_COMPANY_SQL,
+        replace_sql=DOCS_REPLACE_SQL if replace else None,
+    )
@@ -0,0 +1,197 @@
+# app/services/cache.py
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+from dotenv import load_dotenv
+
+from app.schemas import DetailedTalentInput
+
+load_dotenv()
+
+# 프로세스 내부 LRU 캐시 설정 (TAG_CACHE_SIZE=0 이면 캐시 비활성화)
+TAG_CACHE_SIZE = int(os.getenv("TAG_CACHE_SIZE", "1024"))
+TAG_CACHE_TTL = float(os.getenv("TAG_CACHE_TTL", "3600"))
+# 공유 캐시 (Redis 호환 서버). 설정된 경우에만 사용
+TAG_CACHE_REDIS_URL = os.getenv("TAG_CACHE_REDIS_URL")
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_json(value: Any) -> str:
+    """키 순서·공백과 무관하게 동일한 값이면 동일한 문자열을 만듭니다."""
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def tag_cache_key(
+    payload: DetailedTalentInput,
+    model: str,
+    prompt_version: str,
+    docs: Iterable,
+) -> str:
+    """
+    태그 결과 캐시 키: 정규화된 이력서 + 모델명 + 프롬프트 버전 + 검색된 문서 집합.
+
+    문서는 (id, 본문 md5) 로 식별하므로, 프롬프트 템플릿이 바뀌거나 뉴스 코퍼스가
+    추가·수정되어 검색 결과가 달라지면 자동으로 다른 키가 됩니다.
+    """
+    doc_ids = [
+        [d.id, hashlib.md5(d.content.encode("utf-8")).hexdigest()]
+        for d in docs
+    ]
+    raw = canonical_json({
+        "payload": payload.model_dump(mode="json"),
+        "model": model,
+        "prompt_version": prompt_version,
+        "docs": doc_ids,
+    })
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def request_key(payload: DetailedTalentInput, model: str, prompt_version: str) -> str:
+    """
+    동시 요청 합치기(single-flight) 키: 정규화된 이력서 + 모델명 + 프롬프트 버전.
+
+    검색 전에 계산하므로 문서 집합은 포함하지 않습니다 (같은 순간의 같은 입력은 같은 문서를 검색).
+    """
+    raw = canonical_json({
+        "payload": payload.model_dump(mode="json"),
+        "model": model,
+        "prompt_version": prompt_version,
+    })
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+    """크기 제한(LRU)과 TTL 을 갖는 스레드 안전 인메모리 캐시"""
+
+    def __init__(self, maxsize: int = TAG_CACHE_SIZE, ttl: float = TAG_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCache:
+    """
+    Redis 호환 공유 캐시 계층.
+    get(key) / set(key, value, ex=seconds) 를 지원하는 클라이언트면 무엇이든 사용할 수 있습니다.
+    """
+
+    def __init__(self, client, ttl: float = TAG_CACHE_TTL, prefix: str = "tags:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        self.client.set(self.prefix + key, json.dumps(value, ensure_ascii=False), ex=int(self.ttl))
+
+
+class TagCache:
+    """
+    로컬 LRU 계층 + (선택) 공유 계층으로 구성된 태그 결과 캐시.
+    공유 계층에서 찾은 값은 로컬 계층에도 채워 넣습니다. 공유 계층 오류는 캐시 미스로 취급합니다.
+    """
+
+    def __init__(self, local: TTLCache, shared: Optional[RedisCache] = None):
+        self.local = local
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._stats = {"hits_local": 0, "hits_shared": 0, "misses": 0, "sets": 0, "errors": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            self._count("hits_local")
+            return value
+        if self.shared is not None:
+            try:
+                value = self.shared.get(key)
+            except Exception:
+                logger.warning("Shared tag cache get failed", exc_info=True)
+                self._count("errors")
+                value = None
+            if value is not None:
+                self._count("hits_shared")
+                self.local.set(key, value)
+                return value
+        self._count("misses")
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        self._count("sets")
+        self.local.set(key, value)
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value)
+            except Exception:
+                logger.warning("Shared tag cache set failed", exc_info=True)
+                self._count("errors")
+
+    # 공유 계층은 블로킹 클라이언트이므로 비동기 경로에서는 스레드로 넘깁니다.
+    async def aget(self, key: str) -> Optional[Any]:
+        if self.shared is None:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        if self.shared is None:
+            return self.set(key, value)
+        await asyncio.to_thread(self.set, key, value)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits_local"] + stats["hits_shared"] + stats["misses"]
+        stats["hit_ratio"] = round((lookups - stats["misses"]) / lookups, 4) if lookups else 0.0
+        stats["local_size"] = len(self.local)
+        stats["shared"] = self.shared is not None
+        return stats
+
+
+def create_tag_cache() -> Optional[TagCache]:
+    """환경 변수 설정으로 태그 캐시를 생성합니다. TAG_CACHE_SIZE=0 이면 None."""
+    if TAG_CACHE_SIZE <= 0:
+        return None
+    shared = None
+    if TAG_CACHE_REDIS_URL:
+        import redis  # 공유 캐시를 쓸 때만 필요한 선택 의존성 (redis extra)
+
+        shared = RedisCache(redis.Redis.from_url(TAG_CACHE_REDIS_URL), ttl=TAG_CACHE_TTL)
+    return TagCache(TTLCache(TAG_CACHE_SIZE, TAG_CACHE_TTL), shared)
@@ -0,0 +1,136 @@
+# app/services/candidate_stats.py
+
+import os
+import time
+import bisect
+import datetime
+import logging
+from typing import List, Optional, Sequence
+
+from dotenv import load_dotenv
+from app.db import VECTOR_HNSW_EF_SEARCH
+
+load_dotenv()
+
+# 회사별 후보 문서 수(추정)가 이 값 이하이면 정확 검색, 넘으면 ANN 인덱스 검색
+# (정확 검색은 회사의 기간 내 문서 전체와 거리를 계산하므로 후보 수에 비례해 느려짐)
+VECTOR_EXACT_MAX_ROWS = int(os.getenv("VECTOR_EXACT_MAX_ROWS", "20000"))
+# ANN 검색에서 인덱스로 뽑는 후보 수. HNSW 는 hnsw.ef_search 개까지만 돌려주므로 같은 값을 사용
+VECTOR_ANN_CANDIDATES = int(os.getenv("VECTOR_ANN_CANDIDATES", str(VECTOR_HNSW_EF_SEARCH)))
+# 플래너 통계를 다시 읽는 주기 (초). 통계는 ANALYZE(autovacuum) 때만 바뀌므로 길게 잡아도 됨
+CANDIDATE_STATS_INTERVAL = float(os.getenv("CANDIDATE_STATS_INTERVAL", "300"))
+
+# company_docs 의 행 수, company_id 컬럼 통계 (최빈값과 빈도, 고유값 수), published_at 히스토그램 경계
+CANDIDATE_STATS_SQL = """
+    SELECT c.reltuples, s.n_distinct, s.most_common_vals::text::int[], s.most_common_freqs,
+           p.histogram_bounds::text::date[]
+      FROM pg_class c
+      LEFT JOIN pg_stats s
+        ON s.schemaname = current_schema()
+       AND s.tablename = 'company_docs'
+       AND s.attname = 'company_id'
+      LEFT JOIN pg_stats p
+        ON p.schemaname = current_schema()
+       AND p.tablename = 'company_docs'
+       AND p.attname = 'published_at'
+     WHERE c.oid = 'company_docs'::regclass
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class CandidateStats:
+    """
+    플래너 통계(pg_stats)로 요청별 후보 문서 수(회사 문서 중 기간 내 문서)를 추정해 정확 검색 / ANN 검색을 고릅니다.
+
+    회사 문서 수는 최빈값(most_common_vals)에 있는 회사는 빈도 × 전체 행 수, 나머지는 남은 행을
+    나머지 고유값 수로 나눈 값으로 추정합니다 (플래너의 등호 조건 추정과 같은 방식).
+    기간 필터가 있으면 published_at 히스토그램으로 구한 기간 내 비율을 곱합니다 (회사와 날짜는 독립으로 가정).
+
+    정확 검색은 (company_id, published_at) 인덱스로 후보 문서만 읽으므로 후보 수에 비례해 느려집니다.
+    ANN 검색은 전체 문서 중 가까운 ann_candidates 개를 뽑은 뒤 회사·기간으로 거르므로,
+    후보가 exact_max_rows 보다 많고 ANN 후보 안에 top_k 의 2배 이상 들어올 것으로 기대될 때만 선택합니다.
+    그 외(통계가 없는 경우 포함)는 정확 검색입니다. 추정이 빗나가 ANN 이 top_k 를 채우지 못한 요청은
+    VectorSearch 가 정확 검색으로 다시 조회합니다.
+    """
+
+    def __init__(
+        self,
+        exact_max_rows: int = VECTOR_EXACT_MAX_ROWS,
+        ann_candidates: int = VECTOR_ANN_CANDIDATES,
+        check_interval: float = CANDIDATE_STATS_INTERVAL,
+    ):
+        self.exact_max_rows = exact_max_rows
+        self.ann_candidates = ann_candidates
+        self.check_interval = check_interval
+        # (전체 행 수, company_id → 추정 행 수, 그 외 회사의 추정 행 수, published_at 히스토그램 경계) 스냅샷을 통째로 교체
+        self._snapshot: tuple = (0.0, {}, None, [])
+        self._checked_at = float("-inf")
+
+    def due_for_check(self) -> bool:
+        return time.monotonic() - self._checked_at >= self.check_interval
+
+    def replace(self, rows: Sequence[tuple]) -> None:
+        """CANDIDATE_STATS_SQL 결과로 스냅샷을 교체합니다."""
+        self._checked_at = time.monotonic()
+        if not rows or rows[0][1] is None or rows[0][0] <= 0:
+            self._snapshot = (0.0, {}, None, [])
+            return
+        reltuples, n_distinct, mcv, freqs, date_bounds = rows[0]
+        mcv, freqs = mcv or [], freqs or []
+        if n_distinct < 0:
+            n_distinct = -n_distinct * reltuples
+        common = {company_id: f * reltuples for company_id, f in zip(mcv, freqs)}
+        rest = (1 - sum(freqs)) * reltuples / max(n_distinct - len(mcv), 1)
+        self._snapshot = (reltuples, common, rest, date_bounds or [])
+        logger.debug("Candidate stats loaded: %d rows, %d common companies", reltuples, len(common))
+
+    def estimate(self, company_id: int) -> Optional[float]:
+        _, common, rest, _ = self._snapshot
+        return common.get(company_id, rest)
+
+    def date_fraction(
+        self, start_date: Optional[datetime.date], end_date: Optional[datetime.date]
+    ) -> Optional[float]:
+        """published_at 이 기간 안에 드는 행의 비율 (기간 필터가 없으면 1, 히스토그램이 없으면 None)"""
+        # BATCH_SEARCH_SQL 과 같이 start_date, end_date 가 모두 있을 때만 기간 필터가 적용됨
+        if start_date is None or end_date is None:
+            return 1.0
+        bounds = self._snapshot[3]
+        if len(bounds) < 2:
+            return None
+        return max(_below(bounds, end_date + datetime.timedelta(days=1)) - _below(bounds, start_date), 0.0)
+
+    def exact_flags(
+        self,
+        company_ids: Sequence[int],
+        start_dates: Sequence[Optional[datetime.date]],
+        end_dates: Sequence[Optional[datetime.date]],
+        top_ks: Sequence[int],
+    ) -> List[bool]:
+        """요청별로 정확 검색을 쓸지 여부 (후보 수가 적거나 추정 불가 시 True)"""
+        total = self._snapshot[0]
+        flags = []
+        for company_id, start_date, end_date, top_k in zip(company_ids, start_dates, end_dates, top_ks):
+            rows = self.estimate(company_id)
+            fraction = self.date_fraction(start_date, end_date)
+            in_range = None if rows is None or fraction is None else rows * fraction
+            ann = (
+                in_range is not None
+                and in_range > self.exact_max_rows
+                and self.ann_candidates * in_range / total >= 2 * top_k
+            )
+            flags.append(not ann)
+        return flags
+
+
+def _below(bounds: Sequence[datetime.date], day: datetime.date) -> float:
+    """히스토그램 경계(행 수가 같은 구간들)로 추정한 published_at < day 인 행의 비율 (구간 안은 선형 보간)"""
+    if day <= bounds[0]:
+        return 0.0
+    if day > bounds[-1]:
+        return 1.0
+    i = bisect.bisect_left(bounds, day) - 1
+    lo, hi = bounds[i], bounds[i + 1]
+    within = (day - lo).days / max((hi - lo).days, 1)
+    return (i + within) / (len(bounds) - 1)
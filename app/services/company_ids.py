@@ -0,0 +1,49 @@
+# app/services/company_ids.py
+
+import os
+import time
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 회사명 → id 매핑 유지 시간 (초). 회사명이 바뀌어도 이 시간이 지나면 새 이름으로 조회됩니다.
+COMPANY_ID_CACHE_TTL = float(os.getenv("COMPANY_ID_CACHE_TTL", "300"))
+
+COMPANY_IDS_SQL = "SELECT name, id FROM company WHERE name = ANY(%s)"
+
+logger = logging.getLogger(__name__)
+
+
+class CompanyIds:
+    """
+    회사명 → company.id 의 프로세스 로컬 캐시.
+
+    검색 SQL 은 company_docs.company_id (정수) 로만 거르므로, 요청의 회사명은 여기서 한 번
+    id 로 바꿉니다. 캐시에 없는 이름만 COMPANY_IDS_SQL 로 조회하며(호출하는 쪽이 담당),
+    매핑 전체를 ttl 마다 비워 회사명 변경을 반영합니다. 없는 회사는 캐시하지 않습니다.
+    """
+
+    def __init__(self, ttl: float = COMPANY_ID_CACHE_TTL):
+        self.ttl = ttl
+        self._ids: Dict[str, int] = {}
+        self._loaded_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def lookup(self, company_names: Sequence[str]) -> List[Optional[int]]:
+        """회사별 id 또는 (캐시에 없으면) None 을 반환합니다."""
+        if time.monotonic() - self._loaded_at >= self.ttl:
+            self._ids = {}
+            self._loaded_at = time.monotonic()
+        ids = self._ids
+        return [ids.get(n) for n in company_names]
+
+    def add(self, rows: Iterable[Tuple[str, int]]) -> None:
+        """COMPANY_IDS_SQL 결과 (회사명, id) 를 캐시에 추가합니다."""
+        rows = list(rows)
+        self._ids = {**self._ids, **dict(rows)}
+        logger.debug("Company ids cached: %d new, %d total", len(rows), len(self._ids))
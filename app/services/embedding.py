@@ -0,0 +1,427 @@
+# app/services/embedding.py
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+from openai import APIConnectionError
+
+load_dotenv()
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-ada-002")
+# 입력 하나(청크)의 최대 토큰 수. 긴 문서는 이 크기로 잘라 임베딩 후 풀링합니다.
+EMBED_MAX_INPUT_TOKENS = int(os.getenv("EMBED_MAX_INPUT_TOKENS", "8000"))
+# 청크 벡터 풀링 방식: mean(단순 평균) | token_mean(청크 토큰 수 가중 평균)
+EMBED_POOLING = os.getenv("EMBED_POOLING", "mean")
+POOLING_STRATEGIES = ("mean", "token_mean")
+# 요청 하나에 담을 최대 토큰 합계 / 입력 수 (OpenAI 제한: 300k 토큰, 2048 입력)
+EMBED_BATCH_MAX_TOKENS = int(os.getenv("EMBED_BATCH_MAX_TOKENS", "250000"))
+EMBED_BATCH_MAX_ITEMS = int(os.getenv("EMBED_BATCH_MAX_ITEMS", "2048"))
+
+# 동시에 보낼 embeddings 요청 수
+EMBED_CONCURRENCY = int(os.getenv("EMBED_CONCURRENCY", "4"))
+# 분당 요청 수 / 토큰 수 예산 (계정 한도에 맞게 설정, 0 이면 제한 없음)
+EMBED_RPM = int(os.getenv("EMBED_RPM", "3000"))
+EMBED_TPM = int(os.getenv("EMBED_TPM", "1000000"))
+# 429·5xx·연결 오류 재시도 횟수와 지수 백오프 (초)
+EMBED_MAX_RETRIES = int(os.getenv("EMBED_MAX_RETRIES", "6"))
+EMBED_BACKOFF_BASE = float(os.getenv("EMBED_BACKOFF_BASE", "1"))
+EMBED_BACKOFF_MAX = float(os.getenv("EMBED_BACKOFF_MAX", "60"))
+
+logger = logging.getLogger(__name__)
+
+
+class Chunk(NamedTuple):
+    doc_index: int
+    text: str
+    n_tokens: int
+
+
+class EmbeddedDoc(NamedTuple):
+    index: int
+    vector: Optional[np.ndarray]
+    error: Optional[str] = None
+
+
+@dataclass
+class EmbeddingStats:
+    docs: int = 0
+    chunks: int = 0
+    tokens: int = 0
+    requests: int = 0
+    retries: int = 0
+    failed: int = 0
+    cached: int = 0
+    seconds: float = 0.0
+
+    @property
+    def docs_per_sec(self) -> float:
+        return self.docs / self.seconds if self.seconds else 0.0
+
+    @property
+    def tokens_per_sec(self) -> float:
+        return self.tokens / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.docs} docs, {self.chunks} chunks ({self.cached} cached), "
+            f"{self.tokens} tokens in {self.requests} request(s), "
+            f"{self.retries} retries, {self.failed} failed, "
+            f"{self.seconds:.1f}s → {self.docs_per_sec:.1f} docs/s, {self.tokens_per_sec:.0f} tokens/s"
+        )
+
+
+def _split_text(text: str, encoder, max_tokens: int, seps: Sequence[str] = ("\n\n", "\n")) -> List[Tuple[str, int]]:
+    """
+    텍스트를 max_tokens 이하의 (조각, 토큰 수) 로 나눕니다.
+    문단("\n\n") → 줄("\n") 경계 순으로 나누고 인접한 조각은 한도 내에서 다시 합치며,
+    경계가 없는 조각만 토큰 단위로 자릅니다.
+    """
+    tokens = encoder.encode(text)
+    if len(tokens) <= max_tokens:
+        return [(text, len(tokens))]
+    if not seps:
+        return [
+            (encoder.decode(tokens[start:start + max_tokens]), len(tokens[start:start + max_tokens]))
+            for start in range(0, len(tokens), max_tokens)
+        ]
+    sep, rest = seps[0], seps[1:]
+    parts = text.split(sep)
+    if len(parts) == 1:
+        return _split_text(text, encoder, max_tokens, rest)
+
+    sep_tokens = len(encoder.encode(sep))
+    out: List[Tuple[str, int]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for part in parts:
+        pieces = _split_text(part, encoder, max_tokens, rest)
+        if len(pieces) > 1:
+            # 한도를 넘는 조각은 그 자체로 청크가 됨
+            if current:
+                out.append((sep.join(current), current_tokens))
+            out.extend(pieces[:-1])
+            current, current_tokens = [pieces[-1][0]], pieces[-1][1]
+            continue
+        piece, n = pieces[0]
+        if current and current_tokens + sep_tokens + n > max_tokens:
+            out.append((sep.join(current), current_tokens))
+            current, current_tokens = [], 0
+        current_tokens += n + (sep_tokens if current else 0)
+        current.append(piece)
+    if current:
+        out.append((sep.join(current), current_tokens))
+    return out
+
+
+def chunk_documents(texts: Sequence[str], encoder, max_tokens: int = EMBED_MAX_INPUT_TOKENS) -> List[Chunk]:
+    """
+    문서를 max_tokens 이하의 청크로 나눕니다. 한 청크로 충분한 문서는 원문을 그대로 사용하고,
+    긴 문서는 문단·줄 경계를 지키며 나눕니다(경계가 없으면 토큰 단위).
+    """
+    return [
+        Chunk(i, part, n_tokens)
+        for i, text in enumerate(texts)
+        for part, n_tokens in _split_text(text, encoder, max_tokens)
+    ]
+
+
+def pack_batches(
+    chunks: Sequence[Chunk],
+    max_tokens: int = EMBED_BATCH_MAX_TOKENS,
+    max_items: int = EMBED_BATCH_MAX_ITEMS,
+) -> Iterator[List[Chunk]]:
+    """청크를 순서대로 묶어, 요청당 토큰 합계와 입력 수 제한을 넘지 않는 배치를 만듭니다."""
+    batch: List[Chunk] = []
+    batch_tokens = 0
+    for chunk in chunks:
+        if batch and (batch_tokens + chunk.n_tokens > max_tokens or len(batch) >= max_items):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(chunk)
+        batch_tokens += chunk.n_tokens
+    if batch:
+        yield batch
+
+
+class RateLimiter:
+    """
+    분당 요청 수(RPM)·토큰 수(TPM) 예산을 지키는 토큰 버킷 (스레드 안전).
+    예산이 0 이면 해당 항목은 제한하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        rpm: int = EMBED_RPM,
+        tpm: int = EMBED_TPM,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._clock = clock
+        self._sleep = sleep
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def acquire(self, tokens: int) -> float:
+        """요청 1건과 tokens 만큼의 예산을 확보할 때까지 대기하고, 대기한 시간(초)을 반환합니다."""
+        # 예산보다 큰 요청은 버킷이 가득 찼을 때 통과시킴
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(self._clock())
+                need_req = 1 - self._requests if self.rpm else 0
+                need_tok = tokens - self._tokens if self.tpm else 0
+                if need_req <= 0 and need_tok <= 0:
+                    if self.rpm:
+                        self._requests -= 1
+                    if self.tpm:
+                        self._tokens -= tokens
+                    return waited
+                wait = max(
+                    need_req * 60 / self.rpm if self.rpm else 0,
+                    need_tok * 60 / self.tpm if self.tpm else 0,
+                )
+            self._sleep(wait)
+            waited += wait
+
+
+def is_retryable(exc: Exception) -> bool:
+    """429 / 408 / 5xx 응답과 연결·타임아웃 오류만 재시도합니다."""
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in (408, 429) or status >= 500
+    return isinstance(exc, (APIConnectionError, ConnectionError, TimeoutError))
+
+
+def backoff_delay(attempt: int, exc: Optional[Exception] = None,
+                  base: float = EMBED_BACKOFF_BASE, cap: float = EMBED_BACKOFF_MAX) -> float:
+    """지수 백오프 + full jitter. 서버가 Retry-After 를 주면 그 이상 기다립니다."""
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    response = getattr(exc, "response", None)
+    retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    try:
+        return max(delay, float(retry_after)) if retry_after else delay
+    except ValueError:
+        return delay
+
+
+class EmbeddingCheckpoint:
+    """
+    임베딩 실행 진행 상황 파일 (JSON).
+
+    완료된 문서는 company_docs 의 content_hash 중복 제거로 건너뛰므로, 이 파일에는
+    재시도 후에도 실패한 문서(content_hash → 오류)와 누적 처리 수만 기록합니다.
+    재시작 시 실패 문서를 건너뛰어(또는 --retry-failed 로 다시 시도) 중단 지점부터 이어갑니다.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.failed: Dict[str, str] = {}
+        self.done = 0
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            self.failed = state.get("failed", {})
+            self.done = state.get("done", 0)
+
+    def record(self, done: int = 0, failed: Optional[Dict[str, str]] = None, succeeded: Sequence[str] = ()) -> None:
+        self.done += done
+        self.failed.update(failed or {})
+        for key in succeeded:
+            self.failed.pop(key, None)
+        self.save()
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        # 임시 파일에 쓴 뒤 교체하여 중간에 중단돼도 파일이 깨지지 않도록 함
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"done": self.done, "failed": self.failed, "updated_at": time.time()}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+class EmbeddingBatcher:
+    """
+    여러 문서의 청크를 embeddings 요청으로 묶어 워커 스레드로 동시에 보내고,
+    응답 벡터를 문서별로 풀링(pooling: mean | token_mean)한 float32 벡터를 반환합니다.
+
+    - 요청마다 RateLimiter 로 RPM/TPM 예산을 확보합니다.
+    - 429·5xx·연결 오류는 지수 백오프(jitter)로 재시도합니다.
+    - 재시도 후에도 실패한 배치는 문서별 요청으로 나누어 다시 보내, 실패를 해당 문서로 한정합니다.
+    - cache(EmbeddingCache)가 주어지면 이미 임베딩한 청크 텍스트는 요청하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        client,
+        encoder,
+        model: str = EMBEDDING_MODEL,
+        max_input_tokens: int = EMBED_MAX_INPUT_TOKENS,
+        batch_max_tokens: int = EMBED_BATCH_MAX_TOKENS,
+        batch_max_items: int = EMBED_BATCH_MAX_ITEMS,
+        concurrency: int = EMBED_CONCURRENCY,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_retries: int = EMBED_MAX_RETRIES,
+        sleep: Callable[[float], None] = time.sleep,
+        pooling: str = EMBED_POOLING,
+        cache=None,
+    ):
+        if pooling not in POOLING_STRATEGIES:
+            raise ValueError(f"Unknown pooling {pooling!r}; expected one of {POOLING_STRATEGIES}")
+        self.client = client
+        self.encoder = encoder
+        self.model = model
+        self.max_input_tokens = max_input_tokens
+        self.batch_max_tokens = batch_max_tokens
+        self.batch_max_items = batch_max_items
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = rate_limiter or RateLimiter(rpm=0, tpm=0)
+        self.max_retries = max_retries
+        self.pooling = pooling
+        self.cache = cache
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.stats = EmbeddingStats()
+
+    def embed(self, texts: Sequence[str]) -> List[np.ndarray]:
+        """texts 와 같은 순서로 문서별 임베딩을 반환합니다. 실패한 문서가 있으면 RuntimeError."""
+        results: List[Optional[EmbeddedDoc]] = [None] * len(texts)
+        for doc in self.embed_iter(texts):
+            results[doc.index] = doc
+        failed = {d.index: d.error for d in results if d.vector is None}
+        if failed:
+            raise RuntimeError(f"Embedding failed for document(s) {failed}")
+        return [d.vector for d in results]
+
+    def embed_iter(self, texts: Sequence[str]) -> Iterator[EmbeddedDoc]:
+        """
+        완료되는 순서대로 문서별 결과를 돌려줍니다.
+        실패한 문서는 vector=None, error=오류 메시지 로 전달되며 나머지 문서 처리는 계속됩니다.
+        """
+        t0 = time.perf_counter()
+        chunks = chunk_documents(texts, self.encoder, self.max_input_tokens)
+        remaining = [0] * len(texts)
+        for c in chunks:
+            remaining[c.doc_index] += 1
+        # 문서별 가중합과 가중치 합을 누적 (mean: 청크당 1, token_mean: 청크 토큰 수)
+        sums: List[Optional[np.ndarray]] = [None] * len(texts)
+        weights = [0.0] * len(texts)
+        errors: Dict[int, str] = {}
+
+        for results in self._results(chunks):
+            for chunk, vec, error in results:
+                i = chunk.doc_index
+                if error is not None:
+                    errors.setdefault(i, error)
+                elif i not in errors:
+                    w = float(max(chunk.n_tokens, 1)) if self.pooling == "token_mean" else 1.0
+                    sums[i] = w * vec if sums[i] is None else sums[i] + w * vec
+                    weights[i] += w
+                remaining[i] -= 1
+                if remaining[i]:
+                    continue
+                # 문서의 모든 청크가 끝났을 때 결과 전달
+                if i in errors:
+                    self.stats.failed += 1
+                    yield EmbeddedDoc(i, None, errors[i])
+                else:
+                    yield EmbeddedDoc(i, (sums[i] / weights[i]).astype(np.float32, copy=False))
+
+        self.stats.docs += len(texts)
+        self.stats.chunks += len(chunks)
+        self.stats.seconds += time.perf_counter() - t0
+
+    def _results(self, chunks: List[Chunk]) -> Iterator[list]:
+        """
+        [(chunk, vector, error)] 묶음을 완료 순서대로 돌려줍니다.
+        캐시에 있는 청크는 요청 없이 먼저 전달하고, 나머지는 요청 후 캐시에 저장합니다.
+        """
+        cached = self.cache.get_many([c.text for c in chunks]) if self.cache is not None else [None] * len(chunks)
+        hits = [(c, v, None) for c, v in zip(chunks, cached) if v is not None]
+        pending = [c for c, v in zip(chunks, cached) if v is None]
+        self.stats.cached += len(hits)
+        self.stats.tokens += sum(c.n_tokens for c in pending)
+        if hits:
+            yield hits
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="embed") as executor:
+            futures = [
+                executor.submit(self._embed_batch, batch)
+                for batch in pack_batches(pending, self.batch_max_tokens, self.batch_max_items)
+            ]
+            for fut in as_completed(futures):
+                results = fut.result()
+                if self.cache is not None:
+                    ok = [(c.text, v) for c, v, error in results if error is None]
+                    self.cache.put_many([t for t, _ in ok], [v for _, v in ok])
+                yield results
+
+    def _embed_batch(self, batch: List[Chunk]) -> list:
+        """워커 스레드에서 실행: [(chunk, vector, error)]"""
+        try:
+            return [(c, v, None) for c, v in zip(batch, self._request(batch))]
+        except Exception as exc:
+            docs = [list(g) for _, g in groupby(batch, key=lambda c: c.doc_index)]
+            if len(docs) == 1:
+                return [(c, None, repr(exc)) for c in batch]
+            logger.warning("Batch of %d docs failed (%r); retrying per document", len(docs), exc)
+
+        results = []
+        for doc_chunks in docs:
+            try:
+                results += [(c, v, None) for c, v in zip(doc_chunks, self._request(doc_chunks))]
+            except Exception as exc:
+                logger.warning("Embedding failed for document %d: %r", doc_chunks[0].doc_index, exc)
+                results += [(c, None, repr(exc)) for c in doc_chunks]
+        return results
+
+    def _request(self, chunks: List[Chunk]) -> List[np.ndarray]:
+        tokens = sum(c.n_tokens for c in chunks)
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(tokens)
+            with self._lock:
+                self.stats.requests += 1
+            try:
+                resp = self.client.embeddings.create(input=[c.text for c in chunks], model=self.model)
+            except Exception as exc:
+                if attempt == self.max_retries or not is_retryable(exc):
+                    raise
+                delay = backoff_delay(attempt, exc)
+                logger.info("Embedding request failed (%r); retry %d in %.1fs", exc, attempt + 1, delay)
+                with self._lock:
+                    self.stats.retries += 1
+                self._sleep(delay)
+                continue
+
+            # 응답 순서가 아닌 index 로 청크와 매칭
+            vectors: List[Optional[np.ndarray]] = [None] * len(chunks)
+            for item in resp.data:
+                vectors[item.index] = np.asarray(item.embedding, dtype=np.float32)
+            missing = sum(v is None for v in vectors)
+            if missing:
+                raise RuntimeError(f"Embedding response missing {missing} vector(s)")
+            logger.debug("Embedded batch of %d chunk(s), %d tokens", len(chunks), tokens)
+            return vectors
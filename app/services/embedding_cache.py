@@ -0,0 +1,177 @@
+# app/services/embedding_cache.py
+
+import os
+import math
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 로컬 임베딩 캐시 파일 (빈 문자열이면 비활성화)
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", ".embed_cache.sqlite")
+# 캐시 최대 크기(MB). 넘으면 오래 사용되지 않은 항목부터 EMBED_CACHE_EVICT_TO 비율까지 삭제
+EMBED_CACHE_MAX_MB = float(os.getenv("EMBED_CACHE_MAX_MB", "1024"))
+EMBED_CACHE_EVICT_TO = 0.9
+
+# SQLite 변수 개수 제한(기본 999) 안에서 조회하도록 나눔
+LOOKUP_CHUNK = 500
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS embeddings (
+  model     TEXT    NOT NULL,
+  key       BLOB    NOT NULL,
+  vector    BLOB    NOT NULL,
+  last_used REAL    NOT NULL,
+  PRIMARY KEY (model, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used);
+"""
+
+
+def text_key(text: str) -> bytes:
+    """캐시 키: 입력 텍스트의 sha256 (모델명과 함께 기본 키를 이룸)"""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+@dataclass
+class EmbeddingCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.0%} hit rate), "
+            f"{self.writes} writes, {self.evictions} evicted, "
+            f"{self.entries} entries / {self.size_bytes / 2**20:.1f} MB"
+        )
+
+
+class EmbeddingCache:
+    """
+    (모델, sha256(텍스트)) → float32 벡터 를 저장하는 로컬 SQLite 캐시.
+
+    벡터는 float32 바이트 BLOB 으로 저장되며, 크기가 max_bytes 를 넘으면
+    마지막 사용 시각이 오래된 항목부터 삭제합니다(LRU). 여러 스레드에서 공유할 수 있습니다.
+    """
+
+    def __init__(self, path: str = EMBED_CACHE_PATH, model: str = "", max_mb: float = EMBED_CACHE_MAX_MB):
+        self.path = path
+        self.model = model
+        self.max_bytes = int(max_mb * 2**20)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA_SQL)
+        self.stats = EmbeddingCacheStats()
+        self._refresh_size()
+
+    def _refresh_size(self) -> None:
+        # 전체 테이블을 읽으므로 시작할 때와 _evict 뒤에만 실행 (쓰기는 put_many 에서 증분으로 반영)
+        entries, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()
+        self.stats.entries, self.stats.size_bytes = entries, size
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """texts 와 같은 순서로 캐시된 벡터(없으면 None)를 반환하고, 찾은 항목의 사용 시각을 갱신합니다."""
+        keys = [text_key(t) for t in texts]
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_CHUNK):
+                part = keys[start:start + LOOKUP_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({','.join('?' * len(part))})",
+                    [self.model, *part],
+                ).fetchall()
+                found.update(rows)
+            if found:
+                # autocommit 연결이므로 한 트랜잭션으로 묶어 항목마다 커밋하지 않음
+                now = time.time()
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND key = ?",
+                    [(now, self.model, k) for k in found],
+                )
+                self._conn.execute("COMMIT")
+            hits = sum(k in found for k in keys)
+            self.stats.hits += hits
+            self.stats.misses += len(keys) - hits
+        return [
+            np.frombuffer(found[k], dtype=np.float32) if k in found else None
+            for k in keys
+        ]
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[np.ndarray]) -> None:
+        """벡터를 저장하고, 크기 제한을 넘으면 오래된 항목을 제거합니다."""
+        if not texts:
+            return
+        now = time.time()
+        # 같은 텍스트가 여러 번 있으면 마지막 것만 저장 (INSERT OR REPLACE 와 같은 결과)
+        vectors_by_key = {
+            text_key(t): np.asarray(v, dtype=np.float32).tobytes()
+            for t, v in zip(texts, vectors)
+        }
+        rows = [(self.model, k, vec, now) for k, vec in vectors_by_key.items()]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            replaced = self._stored_sizes(list(vectors_by_key))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute("COMMIT")
+            self.stats.writes += len(rows)
+            # 덮어쓴 항목은 이전 크기를 빼고 새 크기를 더함
+            self.stats.entries += len(rows) - len(replaced)
+            self.stats.size_bytes += sum(len(vec) for vec in vectors_by_key.values()) - sum(replaced.values())
+            if self.stats.size_bytes > self.max_bytes:
+                self._evict()
+
+    def _stored_sizes(self, keys: List[bytes]) -> dict:
+        """이미 저장된 키 → 벡터 바이트 수"""
+        sizes = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            part = keys[start:start + LOOKUP_CHUNK]
+            sizes.update(self._conn.execute(
+                f"SELECT key, LENGTH(vector) FROM embeddings WHERE model = ? AND key IN ({','.join('?' * len(part))})",
+                [self.model, *part],
+            ).fetchall())
+        return sizes
+
+    def _evict(self) -> None:
+        entry_bytes = self.stats.size_bytes / max(self.stats.entries, 1)
+        excess = self.stats.size_bytes - self.max_bytes * EMBED_CACHE_EVICT_TO
+        n = max(1, math.ceil(excess / entry_bytes))
+        deleted = self._conn.execute(
+            """
+            DELETE FROM embeddings
+             WHERE (model, key) IN (SELECT model, key FROM embeddings ORDER BY last_used LIMIT ?)
+            """,
+            (n,),
+        ).rowcount
+        self.stats.evictions += deleted
+        self._refresh_size()
+        logger.info("Embedding cache evicted %d entries (%s)", deleted, self.stats.summary())
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
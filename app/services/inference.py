@@ -1,21 +1,59 @@
 # app/services/inference.py
 
+import os
 import json
 import re
+import asyncio
+import time
 import datetime
 import calendar
-from openai import OpenAI
+import itertools
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
 from dotenv import load_dotenv
-from typing import List
-from app.schemas import DetailedTalentInput, TagResponse
-from .vector_search import VectorSearch, Document
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from app.deps import (
+    get_openai_client, get_prompt_builder, get_retrieval_executor, get_vector_search,
+)
+from app.logging_config import preview_text, sampled
+from app.schemas import INTERNAL_ERROR, BatchItemResult, DetailedTalentInput, PromptUsage, TagResponse
+from .cache import TagCache, request_key, tag_cache_key
+from .prompt_builder import Prompt, PromptBuilder
+from .single_flight import SingleFlight
+from .tag_stream import TagStreamParser
+from .vector_search import Document, SearchRequest
 
 import logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
 load_dotenv()
-client = OpenAI()
-vsearch = VectorSearch()
+
+logger = logging.getLogger(__name__)
+
+# -------------------------------
+# 검색 단계 설정
+# -------------------------------
+# batch : 모든 포지션을 단일 SQL 로 일괄 조회 (most_similar_many)
+# fanout: 포지션별 most_similar 를 동시에 실행 (지연시간 = 가장 느린 포지션)
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "batch")
+# fanout 모드에서 요청당 동시에 실행할 검색 수
+RETRIEVAL_CONCURRENCY = int(os.getenv("RETRIEVAL_CONCURRENCY", "4"))
+# 요청당 검색 마감 시간 (초, 0 이면 무제한). 마감 내 끝나지 않은 포지션은 "문서 없음"으로 처리
+RETRIEVAL_DEADLINE = float(os.getenv("RETRIEVAL_DEADLINE", "5"))
+
+# -------------------------------
+# 배치 추론 (POST /infer/batch)
+# -------------------------------
+# 배치 요청 하나에 담을 수 있는 최대 지원자 수
+INFER_BATCH_MAX_ITEMS = int(os.getenv("INFER_BATCH_MAX_ITEMS", "100"))
+# 배치 요청 하나에서 동시에 실행할 LLM 호출 수
+INFER_BATCH_CONCURRENCY = int(os.getenv("INFER_BATCH_CONCURRENCY", "8"))
+# 배치 검색을 나눠 조회할 (회사, 기간) 검색 수. 청크마다 RETRIEVAL_DEADLINE 이 따로 적용되고
+# RETRIEVAL_CONCURRENCY 개 청크까지 동시에 조회
+INFER_BATCH_RETRIEVAL_CHUNK = int(os.getenv("INFER_BATCH_RETRIEVAL_CHUNK", "20"))
+
+# -------------------------------
+# LLM (프롬프트 템플릿과 토큰 예산은 prompt_builder.py)
+# -------------------------------
+LLM_MODEL = "gpt-3.5-turbo"
 
 # -------------------------------
 # 법인명 → 서비스명 유사어(별칭) 목록
@@ -36,6 +74,24 @@ COMPANY_TO_SERVICE_ALIASES = {
     # 필요 시 추가
 }
 
+def _usage(prompt: Prompt, llm_usage=None) -> PromptUsage:
+    """빌더가 센 프롬프트 토큰 수와 LLM 응답의 usage (있으면) 를 합칩니다."""
+    return PromptUsage(
+        prompt_tokens=prompt.tokens,
+        max_prompt_tokens=prompt.max_tokens,
+        static_tokens=prompt.static_tokens,
+        resume_tokens=prompt.resume_tokens,
+        doc_tokens=prompt.doc_tokens,
+        docs_included=prompt.docs_included,
+        docs_available=prompt.docs_available,
+        llm_prompt_tokens=getattr(llm_usage, "prompt_tokens", None),
+        completion_tokens=getattr(llm_usage, "completion_tokens", None),
+    )
+
+def _cache_value(result: TagResponse) -> dict:
+    """태그 캐시에 저장할 값. usage 는 호출마다 다르므로 저장하지 않습니다."""
+    return result.model_dump(exclude={"usage"})
+
 def normalize(text: str) -> str:
     t = text.lower()
     return re.sub(r'[^a-z0-9ㄱ-힣]+', ' ', t).strip()
@@ -49,26 +105,359 @@ def map_service_to_company(service_name: str) -> str:
     return service_name
 
 class InferenceService:
-    def __init__(self, llm_client=None, vector_search=None):
-        self.client = llm_client or client
-        self.vsearch = vector_search or vsearch
+    """
+    이력서 → 벡터 검색 → 프롬프트 구성 → LLM 호출 → 태그 파싱 파이프라인.
+
+    run 은 동기 클라이언트(OpenAI, VectorSearch)로, arun 은 비동기 클라이언트
+    (AsyncOpenAI, AsyncVectorSearch)로 동작합니다. 두 경로는 프롬프트 구성과
+    응답 파싱 로직을 공유합니다.
+
+    cache 가 주어지면 (이력서, 모델, 프롬프트 버전, 검색 문서 집합) 이 같은 요청은
+    LLM 을 호출하지 않고 캐시된 태그를 반환합니다. 응답의 usage 에는 프롬프트 토큰 수가 담기며,
+    캐시 적중 시에는 LLM 토큰 수(llm_prompt_tokens, completion_tokens)가 None 입니다.
+
+    single_flight 가 주어지면 (이력서, 모델, 프롬프트 버전) 이 같은 요청이 동시에 들어왔을 때
+    run / arun 의 검색과 LLM 호출을 한 번만 실행하고 모든 호출자가 같은 결과를 받습니다.
+    요청마다 만드는 인스턴스끼리 합치려면 같은 SingleFlight 를 넘겨야 합니다.
+    """
+
+    def __init__(
+        self,
+        llm_client=None,
+        vector_search=None,
+        retrieval_mode: Optional[str] = None,
+        retrieval_concurrency: Optional[int] = None,
+        retrieval_deadline: Optional[float] = None,
+        cache: Optional[TagCache] = None,
+        prompt_builder: Optional[PromptBuilder] = None,
+        single_flight: Optional[SingleFlight] = None,
+        executor: Optional[Executor] = None,
+    ):
+        # 주입되지 않으면 app.deps 의 공유 인스턴스를 처음 사용할 때 생성
+        self.client = llm_client or get_openai_client()
+        self.vsearch = vector_search or get_vector_search()
+        # 동기 경로(run)의 검색 실행용 공유 스레드 풀
+        self.executor = executor or get_retrieval_executor()
+        self.prompts = prompt_builder or get_prompt_builder(LLM_MODEL)
+        self.cache = cache
+        # 없으면 합치지 않음 (라우터는 app.deps.get_single_flight 의 프로세스 공유 인스턴스를 주입)
+        self.single_flight = single_flight
+        self.retrieval_mode = retrieval_mode or RETRIEVAL_MODE
+        self.retrieval_concurrency = max(1, retrieval_concurrency or RETRIEVAL_CONCURRENCY)
+        deadline = RETRIEVAL_DEADLINE if retrieval_deadline is None else retrieval_deadline
+        self.retrieval_deadline = deadline if deadline > 0 else None
 
     def run(self, payload: DetailedTalentInput) -> TagResponse:
-        # 1) 포지션별 회사명, 기간, 직무 정보 추출 및 로깅
+        if self.single_flight is None:
+            return self._run(payload)
+        return self.single_flight.do(self._request_key(payload), lambda: self._run(payload))
+
+    async def arun(self, payload: DetailedTalentInput) -> TagResponse:
+        if self.single_flight is None:
+            return await self._arun(payload)
+        return await self.single_flight.ado(self._request_key(payload), lambda: self._arun(payload))
+
+    def _request_key(self, payload: DetailedTalentInput) -> str:
+        return request_key(payload, LLM_MODEL, self.prompts.version)
+
+    def _run(self, payload: DetailedTalentInput) -> TagResponse:
+        self._log_positions(payload)
+        groups, complete = self._retrieve(self._search_requests(payload))
+        docs = [d for g in groups for d in g]
+
+        key = self._cache_key(payload, docs)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return self._cached_response(payload, docs, cached)
+
+        # LLM 호출
+        prompt = self._build_prompt(payload, docs)
+        resp = self.client.chat.completions.create(**self._completion_args(prompt))
+        result = self._parse_response(resp.choices[0].message.content, _usage(prompt, getattr(resp, "usage", None)))
+
+        # 검색이 마감으로 일부 누락된 결과는 캐시하지 않음
+        if key is not None and complete:
+            self.cache.set(key, _cache_value(result))
+        return result
+
+    async def _arun(self, payload: DetailedTalentInput) -> TagResponse:
+        self._log_positions(payload)
+        groups, complete = await self._aretrieve(self._search_requests(payload))
+        return await self._agenerate(payload, groups, complete)
+
+    async def arun_batch(
+        self,
+        payloads: Sequence[DetailedTalentInput],
+        concurrency: Optional[int] = None,
+        retrieval_chunk: Optional[int] = None,
+    ) -> List[BatchItemResult]:
+        """
+        여러 지원자를 한 번에 추론해 입력 순서대로 항목별 결과를 반환합니다.
+
+        배치 전체의 포지션 검색 요청을 (회사, 기간) 으로 중복 제거한 뒤 retrieval_chunk 개씩 나눠 조회하고,
+        LLM 호출은 concurrency 개까지 동시에 실행합니다. 검색 마감은 청크마다 따로 적용되며, 마감을 넘긴
+        청크의 검색을 쓰는 지원자는 문서 없이 추론하고 degraded 로 표시합니다. 한 지원자의 실패는 그 항목의
+        error 에만 담기며, 메시지는 단건 /infer 와 같은 기준입니다 (ValueError 는 그대로, 나머지는 내부 오류).
+        """
+        per_item = []
+        for payload in payloads:
+            self._log_positions(payload)
+            per_item.append(self._search_requests(payload))
+        unique = list(dict.fromkeys(r for reqs in per_item for r in reqs))
+        size = max(1, retrieval_chunk or INFER_BATCH_RETRIEVAL_CHUNK)
+        chunks = [unique[i:i + size] for i in range(0, len(unique), size)]
+        logger.info(
+            "Batch of %d candidate(s): %d position search(es), %d unique in %d chunk(s)",
+            len(payloads), sum(map(len, per_item)), len(unique), len(chunks)
+        )
+
+        async def retrieve(reqs: List[SearchRequest]):
+            return await self._aretrieve(reqs) if reqs else ([], True)
+
+        # 청크 검색은 동시에 retrieval_concurrency 개까지 (커넥션을 기다리는 시간이 마감에 포함되지 않도록)
+        chunk_sem = asyncio.Semaphore(self.retrieval_concurrency)
+
+        async def retrieve_chunk(reqs: List[SearchRequest]):
+            async with chunk_sem:
+                return await retrieve(reqs)
+
+        outcomes = await asyncio.gather(*(retrieve_chunk(c) for c in chunks), return_exceptions=True)
+        found = {}
+        failed = set()
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, ValueError):
+                failed.update(chunk)
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                groups, complete = outcome
+                found.update((r, (g, complete)) for r, g in zip(chunk, groups))
+
+        async def retrieved_for(reqs: List[SearchRequest]):
+            if failed.intersection(reqs):
+                # 프로파일이 없는 회사가 섞인 청크를 쓰는 지원자는 따로 다시 검색해 그 지원자만 실패하도록
+                return await retrieve(reqs)
+            return [found[r][0] for r in reqs], all(found[r][1] for r in reqs)
+
+        if failed:
+            logger.warning("Batch retrieval failed for %d search(es); retrying per candidate", len(failed))
+        retrieved = await asyncio.gather(*(retrieved_for(reqs) for reqs in per_item), return_exceptions=True)
+
+        sem = asyncio.Semaphore(max(1, concurrency or INFER_BATCH_CONCURRENCY))
+
+        async def generate(payload: DetailedTalentInput, item) -> TagResponse:
+            if not payload.positions:
+                raise ValueError("positions 리스트가 비어있습니다.")
+            if isinstance(item, Exception):
+                raise item
+            async with sem:
+                return await self._agenerate(payload, *item)
+
+        outcomes = await asyncio.gather(
+            *(generate(p, item) for p, item in zip(payloads, retrieved)), return_exceptions=True
+        )
+        results = []
+        for i, (outcome, item) in enumerate(zip(outcomes, retrieved)):
+            if isinstance(outcome, ValueError):
+                results.append(BatchItemResult(index=i, error=str(outcome)))
+            elif isinstance(outcome, Exception):
+                logger.error("Batch item %d failed", i, exc_info=outcome)
+                results.append(BatchItemResult(index=i, error=INTERNAL_ERROR))
+            else:
+                results.append(BatchItemResult(index=i, result=outcome, degraded=not item[1]))
+        return results
+
+    async def astream(self, payload: DetailedTalentInput) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        arun 의 스트리밍 버전: (이벤트, 데이터) 를 순서대로 내보냅니다.
+
+        - retrieval: 검색된 문서 목록 (LLM 호출 전)
+        - tag      : 생성 중인 답변에서 완성된 태그 하나
+        - done     : 전체 답변을 _parse_response 로 파싱한 최종 TagResponse
+
+        캐시에 있으면 LLM 을 호출하지 않고 캐시된 태그를 같은 순서로 내보냅니다.
+        """
+        self._log_positions(payload)
+        groups, complete = await self._aretrieve(self._search_requests(payload))
+        docs = [d for g in groups for d in g]
+        key = self._cache_key(payload, docs)
+        cached = await self.cache.aget(key) if key is not None else None
+        yield "retrieval", {
+            "docs": [
+                {"id": d.id, "company_name": d.company_name, "doc_type": d.doc_type,
+                 "published_at": d.published_at.isoformat() if d.published_at else None, "distance": d.distance}
+                for d in docs
+            ],
+            "complete": complete,
+            "cached": cached is not None,
+        }
+        if cached is not None:
+            result = self._cached_response(payload, docs, cached)
+            for tag in result.tags:
+                yield "tag", {"tag": tag}
+            yield "done", result.model_dump()
+            return
+
+        prompt = self._build_prompt(payload, docs)
+        stream = await self.client.chat.completions.create(
+            **self._completion_args(prompt), stream=True, stream_options={"include_usage": True}
+        )
+        parser = TagStreamParser()
+        sent: List[str] = []
+        llm_usage = None
+        async for chunk in stream:
+            # usage 는 choices 가 빈 마지막 청크에 담겨 옴
+            llm_usage = getattr(chunk, "usage", None) or llm_usage
+            if not chunk.choices:
+                continue
+            for tag in parser.feed(chunk.choices[0].delta.content or ""):
+                sent.append(tag)
+                yield "tag", {"tag": tag}
+
+        result = self._parse_response(parser.text, _usage(prompt, llm_usage))
+        # 증분 파서가 놓친 태그(예상과 다른 JSON 형태)는 최종 결과 기준으로 마저 보냄 (done 이 최종 기준)
+        missed = result.tags[len(sent):] if result.tags[:len(sent)] == sent else []
+        for tag in missed:
+            yield "tag", {"tag": tag}
+        if key is not None and complete:
+            await self.cache.aset(key, _cache_value(result))
+        yield "done", result.model_dump()
+
+    async def _agenerate(
+        self,
+        payload: DetailedTalentInput,
+        groups: List[List[Document]],
+        complete: bool,
+    ) -> TagResponse:
+        docs = [d for g in groups for d in g]
+
+        key = self._cache_key(payload, docs)
+        if key is not None:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                return self._cached_response(payload, docs, cached)
+
+        # LLM 호출 (응답을 기다리는 동안 이벤트 루프를 점유하지 않음)
+        prompt = self._build_prompt(payload, docs)
+        resp = await self.client.chat.completions.create(**self._completion_args(prompt))
+        result = self._parse_response(resp.choices[0].message.content, _usage(prompt, getattr(resp, "usage", None)))
+
+        if key is not None and complete:
+            await self.cache.aset(key, _cache_value(result))
+        return result
+
+    def _cached_response(self, payload: DetailedTalentInput, docs: List[Document], cached: dict) -> TagResponse:
+        # 캐시 적중 시 LLM 을 호출하지 않았으므로 LLM 토큰 수는 None, 프롬프트 토큰 수는 이번 요청 기준
+        return TagResponse(tags=cached["tags"], usage=_usage(self._build_prompt(payload, docs)))
+
+    def _cache_key(self, payload: DetailedTalentInput, docs: List[Document]) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return tag_cache_key(payload, LLM_MODEL, self.prompts.version, docs)
+
+    def _retrieve(self, requests: List[SearchRequest]) -> Tuple[List[List[Document]], bool]:
+        """포지션별 검색 결과와, 모든 포지션이 마감 내에 끝났는지 여부를 반환합니다."""
+        if self.retrieval_mode != "fanout":
+            # 공유 스레드 풀에서 실행해 마감 시간을 적용 (마감을 넘긴 검색은 백그라운드에서 끝까지 실행됨)
+            future = self.executor.submit(self.vsearch.most_similar_many, requests)
+            try:
+                return future.result(timeout=self.retrieval_deadline), True
+            except TimeoutError:
+                logger.warning("Retrieval deadline (%ss) exceeded; continuing without docs", self.retrieval_deadline)
+                return [[] for _ in requests], False
+
+        # 포지션별 검색을 공유 스레드 풀로 동시에 실행하되, 요청당 retrieval_concurrency 개까지만 제출
+        # (VectorSearch 는 커넥션 풀 기반이라 스레드 안전)
+        unique = list(dict.fromkeys(requests))
+        queue = iter(unique)
+        futures = {}
+
+        def submit(n: int) -> set:
+            submitted = set()
+            for r in itertools.islice(queue, n):
+                futures[r] = self.executor.submit(self.vsearch.most_similar, *r)
+                submitted.add(futures[r])
+            return submitted
+
+        deadline = None if self.retrieval_deadline is None else time.monotonic() + self.retrieval_deadline
+        running = submit(self.retrieval_concurrency)
+        while running:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, running = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            running |= submit(len(done))
+        # 마감까지 제출하지 못한 포지션은 완료되지 않은 Future 로 채움
+        for r in queue:
+            futures[r] = Future()
+        return self._collect(requests, futures, {f for f in futures.values() if not f.done()})
+
+    async def _aretrieve(self, requests: List[SearchRequest]) -> Tuple[List[List[Document]], bool]:
+        if self.retrieval_mode != "fanout":
+            try:
+                groups = await asyncio.wait_for(
+                    self.vsearch.most_similar_many(requests), self.retrieval_deadline
+                )
+                return groups, True
+            except asyncio.TimeoutError:
+                logger.warning("Retrieval deadline (%ss) exceeded; continuing without docs", self.retrieval_deadline)
+                return [[] for _ in requests], False
+
+        # 세마포어로 동시 실행 수를 제한하면서 포지션별 검색을 동시에 실행
+        sem = asyncio.Semaphore(self.retrieval_concurrency)
+
+        async def search(r: SearchRequest) -> List[Document]:
+            async with sem:
+                return await self.vsearch.most_similar(*r)
+
+        unique = list(dict.fromkeys(requests))
+        tasks = {r: asyncio.ensure_future(search(r)) for r in unique}
+        _, pending = await asyncio.wait(tasks.values(), timeout=self.retrieval_deadline)
+        for t in pending:
+            t.cancel()
+        return self._collect(requests, tasks, pending)
+
+    def _collect(
+        self,
+        requests: List[SearchRequest],
+        futures: dict,
+        pending: set,
+    ) -> Tuple[List[List[Document]], bool]:
+        """마감 내 끝난 검색 결과를 요청 순서대로 모읍니다. 미완료 포지션은 빈 결과로 대체합니다."""
+        results: List[List[Document]] = []
+        for r in requests:
+            fut = futures[r]
+            if fut in pending:
+                logger.warning(
+                    "Retrieval deadline (%ss) exceeded for %s; continuing without docs",
+                    self.retrieval_deadline, r.company_name,
+                    extra={"company": r.company_name, "deadline_s": self.retrieval_deadline},
+                )
+                results.append([])
+            else:
+                results.append(fut.result())  # 프로파일 없음(ValueError) 등은 그대로 전파
+        return results, not pending
+
+    def _log_positions(self, payload: DetailedTalentInput) -> None:
+        # 1) 포지션별 회사명, 기간, 직무 정보 로깅 (DEBUG 가 아니면 문자열을 만들지 않음)
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         for pos in payload.positions:
             mapped_name = map_service_to_company(pos.companyName)
-            logging.debug(f"원본 companyName: {pos.companyName} -> 매핑된 회사명: {mapped_name}")
+            logger.debug("원본 companyName: %s -> 매핑된 회사명: %s", pos.companyName, mapped_name)
 
             s = pos.startEndDate.start
             p_str = f"{s.year}.{s.month:02d}"
             if pos.startEndDate.end:
                 e = pos.startEndDate.end
                 p_str += f"–{e.year}.{e.month:02d}"
-            logging.debug(f"parsed period: {p_str}")
-            logging.debug(f"parsed title: {pos.title}")
+            logger.debug("parsed period: %s", p_str)
+            logger.debug("parsed title: %s", pos.title)
 
-        # 2) 벡터 검색: 포지션별 재직 기간을 반영하여 상위 3개 문서 추출
-        docs: List[Document] = []
+    def _search_requests(self, payload: DetailedTalentInput) -> List[SearchRequest]:
+        # 2) 벡터 검색: 포지션별 재직 기간을 반영하여 상위 3개 문서 추출 (단일 SQL 로 일괄 조회)
+        requests: List[SearchRequest] = []
         for pos in payload.positions:
             comp = map_service_to_company(pos.companyName)
 
@@ -83,101 +472,34 @@ class InferenceService:
             else:
                 end_date = datetime.date.today()
 
-            logging.debug(f"Searching docs for {comp} from {start_date} to {end_date}")
-            docs += self.vsearch.most_similar(
-                comp,
-                start_date=start_date,
-                end_date=end_date,
-                top_k=3,
-            )
-        # 3) Few-shot 예시 추가
-        example_section = (
-            "추론 예시:\n"
-            "- Input: talent1.json\n"
-            "  Output: 상위권대학교 (KAIST), 대규모 회사 경험 (삼성전자·네이버), 성장기스타트업 경험 (토스 조직 4.5배 확장), 리더쉽 (CTO·Director·팀장), 대용량데이터처리경험 (네이버 하이퍼클로바 개발), M&A 경험 (요기요 매각), 신규 투자유치 (토스 시리즈 F·엘박스 시리즈 B)\n"
-            "- Input: talent2.json\n"
-            "  Output: 상위권대학교 (고려대학교), 성장기스타트업 경험 (토스 16년–19년 조직·투자 규모 2배 성장), 리더쉽 (챕터 리드·테크 리드), 대용량데이터처리경험 (LLM 대규모 파이프라인 구축)\n"
-            "- Input: talent3.json\n"
-            "  Output: 상위권대학교 (연세대학교), 대규모 회사 경험 (KT 전략기획실·미디어 성장전략), 리더쉽 (팀장·CFO), IPO 경험 (밀리의서재 IPO), M&A 경험 (밀리의서재 인수)\n"
-            "- Input: talent4.json\n"
-            "  Output: 상위권대학교 (서울대학교), 대규모 회사 경험 (삼성전자·SKT), M&A 경험 (요기요 사모펀드 매각), 리더쉽 (CPO·창업), 신규 투자유치\n\n"
-        )
+            logger.debug("Searching docs for %s from %s to %s", comp, start_date, end_date)
+            requests.append(SearchRequest(comp, start_date, end_date, 3))
 
-        PROMPT_TEMPLATE = """\
-당신은 전문 리쿠르터입니다. 지원자의 이력서(JSON)와 
-"[news] KT (2017-12-21): [2017 디지털혁신상품] KT 기가지니  https://m.ddaily.co.kr/page/view/2017122115161782509"
-"[news] 엘박스 (2024-01-26): [더벨][VC 투자기업] 판례 검색 1위 엘박스, 소송금융 시장 뛰어든다  https://www.thebell.co.kr/free/content/ArticleView.asp?key=202401231844596240101829"
-형태로 제공되는 뉴스데이터를 참고하여, **아래 7가지 핵심 카테고리**를 가능하다면 포함해주세요.
-이 외에도 자유롭게 의미 있는 추가 태그를 뽑아 **태그 형태**로 추출하세요.
-
-뉴스데이터는 반드시 함께 제공되는 링크를 방문하여 본문의 내용을 결과에 반영하세요.
-**절대** 이력서에 없는 회사의 문서를 사용하거나, 다른 회사 경험을 만들어내지 마세요.
-또한, 예제나 플레이스홀더를 그대로 복붙하지 마세요.
-
-핵심 카테고리:
-1. **학력**: 최상위권 대학교 졸업 여부  
-예시: “상위권대학교 (학교명)”
-
-2. **대규모 회사 경험**: 메이저 기업 근무 여부  
-예시: “대규모 회사 경험 (회사1·회사2·…)”
-
-3. **성장기 스타트업 경험**: 포지션 기간 기반 조직·투자 규모 성장  
-예시: “성장기스타트업 경험 (스타트업명 YYYY–YYYY: 조직·투자 규모 X배 성장)”
-
-4. **리더십**: 매니징 직책 보유 여부  
-예시: “리더쉽 (직책1·직책2·…)”
-
-5. **대용량 데이터 처리 경험**: 대규모 기술 프로젝트 참여  
-예시: “대용량데이터처리경험 (회사명 프로젝트명)”
-
-6. **M&A 경험**: 인수·합병 참여 여부  
-예시: “M&A 경험 (인수 대상·매각 대상)”
-
-7. **IPO 및 투자 유치**: 상장·펀딩 주도 여부  
-예시: “IPO 경험 (회사명 IPO)” 또는 “신규 투자 유치 경험 (스타트업명 YYYY: 투자액)”
-
-출력은 **JSON** 형태로, `"tags"` 배열에 각 태그를 넣어주세요.  
-
-예시)
-```json
-{
-"tags": [
-    "상위권대학교 (연세대학교)",
-    "대규모 회사 경험 (네이버·토스)",
-    "성장기스타트업 경험 (토스 2016–2019: 조직·투자 규모 2배 성장)",
-    "리더쉽 (Tech Lead·Chapter Lead)",
-    "대용량데이터처리경험 (네이버 하이퍼클로바 개발)",
-    "M&A 경험 (요기요 매각)",
-    "신규 투자 유치 경험 (비바리퍼블리카 2018-12-10: 900억 투자)",
-    "수상 경력 (사내 우수 엔지니어상 수상)"
-]
-}
-"""
-
-        # 4) 프롬프트 구성
-        prompt = PROMPT_TEMPLATE
-        prompt += example_section
-        prompt += (
-            "지원자 이력서(JSON):\n"
-            f"{json.dumps(payload.dict(), ensure_ascii=False)}\n\n"
-            "관련 회사 문서:\n"
-        )
-        for d in docs:
-            snippet = d.content.replace("\n", " ")[:200]
-            prompt += f"- [{d.doc_type}] {d.company_name} ({d.published_at}): {snippet}...\n"
-        prompt += (
-            "\n답변 형식(한국어 JSON):\n```json\n"
-            '{ "tags": ["태그1", "태그2", ...] }\n```'
+        return requests
+
+    def _build_prompt(self, payload: DetailedTalentInput, docs: List[Document]) -> Prompt:
+        # 3) 프롬프트 구성 (지시문 + Few-shot 예시 + 이력서 + 관련 문서, 토큰 예산 안에서)
+        prompt = self.prompts.build(payload.model_dump(), docs)
+        logger.debug(
+            "[PROMPT] %d/%d tokens (resume %d, docs %d/%d → %d tokens)",
+            prompt.tokens, prompt.max_tokens, prompt.resume_tokens,
+            prompt.docs_included, prompt.docs_available, prompt.doc_tokens
         )
+        if logger.isEnabledFor(logging.DEBUG) and sampled():
+            logger.debug("[PROMPT] %d chars\n%s", len(prompt.text), preview_text(prompt.text))
+        return prompt
 
-        # 5) LLM 호출 및 raw 응답 로깅
-        resp = self.client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
+    def _completion_args(self, prompt: Prompt) -> dict:
+        return dict(
+            model=LLM_MODEL,
+            messages=[{"role": "user", "content": prompt.text}],
             temperature=0.0
         )
-        raw = resp.choices[0].message.content
-        logging.debug(f"[LLM RAW RESPONSE]\n{raw!r}")
+
+    def _parse_response(self, raw: str, usage: Optional[PromptUsage] = None) -> TagResponse:
+        # 5) raw 응답 로깅 (샘플링된 요청만, 앞부분만)
+        if logger.isEnabledFor(logging.DEBUG) and sampled():
+            logger.debug("[LLM RAW RESPONSE] %d chars\n%r", len(raw), preview_text(raw))
         content = raw.strip()
 
         # 6) 코드블록 제거
@@ -193,7 +515,7 @@ class InferenceService:
         try:
             parsed = json.loads(content)
         except json.JSONDecodeError:
-            logging.error("[JSON PARSE ERROR] 응답 내용이 JSON이 아닙니다:\n%s", content, exc_info=True)
+            logger.error("[JSON PARSE ERROR] 응답 내용이 JSON이 아닙니다:\n%s", preview_text(content), exc_info=True)
             raise
 
-        return TagResponse(tags=parsed.get("tags", []))
+        return TagResponse(tags=parsed.get("tags", []), usage=usage)
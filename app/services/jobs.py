@@ -0,0 +1,316 @@
+# app/services/jobs.py
+
+import os
+import json
+import uuid
+import asyncio
+import logging
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Callable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from psycopg.errors import UndefinedTable
+from psycopg_pool import AsyncConnectionPool
+from pydantic import ValidationError
+
+from app.schemas import DetailedTalentInput
+
+load_dotenv()
+
+# API 프로세스 안에서 실행할 작업 워커 수. 기본 0: 워커는 /infer 와 같은 DB 풀·LLM 한도를 쓰므로
+# scripts/run_job_workers.py 로 별도 프로세스에서 실행
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "0"))
+# 워커가 한 번에 처리하고 저장하는 항목 수 (InferenceService.arun_batch 한 번)
+JOB_CHUNK_SIZE = int(os.getenv("JOB_CHUNK_SIZE", "50"))
+# 실행 중인 작업의 갱신(updated_at)이 이 시간(초) 넘게 없으면 워커가 죽은 것으로 보고 다른 워커가 이어받음
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "300"))
+# 대기 중인 작업이 없을 때 다시 확인하는 간격 (초)
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+# 일시적인 실패(LLM 장애·타임아웃 등 예상하지 못한 오류, 검색 마감 초과)를 다시 시도하는 최대 횟수 (첫 시도 포함)
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# 재시도 전 대기 시간 (초, 시도마다 2배, lease 의 절반을 넘지 않음)
+JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", "30"))
+# POST /jobs 의 {"path": ...} 로 참조할 수 있는 서버 측 JSONL 파일 디렉터리
+JOB_INPUT_DIR = os.getenv("JOB_INPUT_DIR", "jobs")
+
+logger = logging.getLogger(__name__)
+
+# 스키마는 scripts/init_db.py 10) 참고
+CREATE_JOB_SQL = "INSERT INTO tag_job (id, status) VALUES (%s, 'loading')"
+COPY_ITEMS_SQL = "COPY tag_job_item (job_id, idx, input) FROM STDIN"
+QUEUE_JOB_SQL = "UPDATE tag_job SET status = 'queued', total = %s, updated_at = now() WHERE id = %s"
+JOB_SQL = """
+    SELECT id, status, total, completed, failed, created_at, updated_at, finished_at
+      FROM tag_job
+     WHERE id = %s
+"""
+# 대기 중이거나, 실행 중이지만 lease 가 지난 (워커가 죽은) 가장 오래된 작업 하나를 가져감.
+# SKIP LOCKED 로 여러 워커·프로세스가 같은 작업을 동시에 가져가지 않음
+CLAIM_JOB_SQL = """
+    UPDATE tag_job
+       SET status = 'running', updated_at = now()
+     WHERE id = (SELECT id
+                   FROM tag_job
+                  WHERE status = 'queued'
+                     OR (status = 'running' AND updated_at < now() - make_interval(secs => %s))
+                  ORDER BY created_at
+                  LIMIT 1
+                    FOR UPDATE SKIP LOCKED)
+    RETURNING id
+"""
+PENDING_ITEMS_SQL = """
+    SELECT idx, input
+      FROM tag_job_item
+     WHERE job_id = %s AND NOT done AND idx > %s
+     ORDER BY idx
+     LIMIT %s
+"""
+# 항목 결과 저장과 작업 진행률 갱신을 한 문장으로 (이미 저장된 항목은 다시 세지 않음)
+SAVE_ITEMS_SQL = """
+    WITH saved AS (
+        UPDATE tag_job_item i
+           SET result = r.result, error = r.error, done = true
+          FROM unnest(%s::int[], %s::jsonb[], %s::text[]) AS r(idx, result, error)
+         WHERE i.job_id = %s AND i.idx = r.idx AND NOT i.done
+        RETURNING i.error
+    )
+    UPDATE tag_job
+       SET completed = completed + (SELECT count(*) FROM saved),
+           failed = failed + (SELECT count(*) FROM saved WHERE error IS NOT NULL),
+           updated_at = now()
+     WHERE id = %s
+"""
+TOUCH_JOB_SQL = "UPDATE tag_job SET updated_at = now() WHERE id = %s"
+FINISH_JOB_SQL = """
+    UPDATE tag_job
+       SET status = 'done', finished_at = now(), updated_at = now()
+     WHERE id = %s
+       AND NOT EXISTS (SELECT 1 FROM tag_job_item WHERE job_id = %s AND NOT done)
+"""
+RESULTS_SQL = """
+    SELECT idx, result, error
+      FROM tag_job_item
+     WHERE job_id = %s AND done AND idx > %s
+     ORDER BY idx
+     LIMIT %s
+"""
+
+JOB_COLUMNS = ("id", "status", "total", "completed", "failed", "created_at", "updated_at", "finished_at")
+
+
+async def jsonl_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """바이트 청크 스트림을 (줄 번호, 줄) 로 나눕니다. 빈 줄은 건너뜁니다."""
+    buffer = b""
+    lineno = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            lineno += 1
+            if line.strip():
+                yield lineno, line.decode("utf-8")
+    if buffer.strip():
+        yield lineno + 1, buffer.decode("utf-8")
+
+
+async def file_chunks(path: Path, size: int = 1 << 20) -> AsyncIterator[bytes]:
+    """로컬 파일을 이벤트 루프를 막지 않고 size 바이트씩 읽습니다."""
+    f = await asyncio.to_thread(open, path, "rb")
+    try:
+        while chunk := await asyncio.to_thread(f.read, size):
+            yield chunk
+    finally:
+        f.close()
+
+
+def input_path(name: str, root: str = JOB_INPUT_DIR) -> Path:
+    """{"path": ...} 참조를 JOB_INPUT_DIR 안의 .jsonl 파일 경로로 바꿉니다 (디렉터리 밖 경로는 거부)."""
+    base = Path(root).resolve()
+    path = (base / name).resolve()
+    if path.suffix != ".jsonl" or base not in path.parents:
+        raise ValueError(f"path 는 {JOB_INPUT_DIR} 안의 .jsonl 파일이어야 합니다.")
+    if not path.is_file():
+        raise ValueError(f"{name} 파일이 없습니다.")
+    return path
+
+
+class JobStore:
+    """
+    태그 추론 작업(tag_job)과 항목(tag_job_item)의 Postgres 저장소.
+
+    업로드된 이력서는 항목 테이블에 그대로 저장되고, 워커는 완료되지 않은 항목을 순서대로 읽어
+    결과를 청크 단위로 기록합니다. 모든 상태가 DB 에 있으므로 재시작 후에도 마지막으로
+    저장된 항목 다음부터 이어서 처리합니다.
+    """
+
+    def __init__(self, pool: AsyncConnectionPool):
+        self.pool = pool
+
+    async def _open(self) -> None:
+        if self.pool.closed:
+            await self.pool.open()
+
+    async def create(self, lines: AsyncIterable[Tuple[int, str]]) -> Tuple[str, int]:
+        """JSONL 줄(이력서 하나씩)을 검증하며 항목으로 적재하고 (작업 id, 항목 수) 를 반환합니다.
+
+        잘못된 줄이 있으면 ValueError 를 내고 작업 전체를 만들지 않습니다 (한 트랜잭션).
+        """
+        await self._open()
+        job_id = str(uuid.uuid4())
+        total = 0
+        async with self.pool.connection() as conn, conn.transaction():
+            await conn.execute(CREATE_JOB_SQL, (job_id,))
+            async with conn.cursor() as cur, cur.copy(COPY_ITEMS_SQL) as copy:
+                async for lineno, line in lines:
+                    try:
+                        payload = DetailedTalentInput.model_validate_json(line)
+                    except ValidationError as e:
+                        raise ValueError(f"{lineno}번째 줄이 올바른 이력서가 아닙니다: {e.errors()[0]['msg']}")
+                    await copy.write_row((job_id, total, payload.model_dump_json()))
+                    total += 1
+            if total == 0:
+                raise ValueError("작업에 이력서가 없습니다.")
+            await conn.execute(QUEUE_JOB_SQL, (total, job_id))
+        logger.info("Job %s queued with %d item(s)", job_id, total)
+        return job_id, total
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        await self._open()
+        async with self.pool.connection() as conn:
+            row = await (await conn.execute(JOB_SQL, (job_id,))).fetchone()
+        if row is None:
+            return None
+        return dict(zip(JOB_COLUMNS, (str(row[0]), *row[1:])))
+
+    async def results(self, job_id: str, after: int = -1, chunk: int = 1000) -> AsyncIterator[tuple]:
+        """완료된 항목의 (idx, result, error) 를 idx 순서로 chunk 개씩 끊어 읽습니다 (커넥션을 오래 잡지 않음)."""
+        await self._open()
+        while True:
+            async with self.pool.connection() as conn:
+                rows = await (await conn.execute(RESULTS_SQL, (job_id, after, chunk))).fetchall()
+            for row in rows:
+                yield row
+            if len(rows) < chunk:
+                return
+            after = rows[-1][0]
+
+    async def claim(self, lease: float = JOB_LEASE_SECONDS) -> Optional[str]:
+        await self._open()
+        async with self.pool.connection() as conn:
+            row = await (await conn.execute(CLAIM_JOB_SQL, (lease,))).fetchone()
+        return str(row[0]) if row else None
+
+    async def pending(self, job_id: str, after: int, limit: int) -> List[Tuple[int, dict]]:
+        """idx 가 after 보다 큰, 완료되지 않은 항목을 idx 순서로 limit 개"""
+        async with self.pool.connection() as conn:
+            return await (await conn.execute(PENDING_ITEMS_SQL, (job_id, after, limit))).fetchall()
+
+    async def save(self, job_id: str, rows: List[Tuple[int, Optional[dict], Optional[str]]]) -> None:
+        """(idx, 결과 dict, 오류 메시지) 목록을 저장하고 진행률을 갱신합니다 (lease 도 연장됨)."""
+        params = [
+            [idx for idx, _, _ in rows],
+            [json.dumps(result, ensure_ascii=False) if result is not None else None for _, result, _ in rows],
+            [error for _, _, error in rows],
+            job_id,
+            job_id,
+        ]
+        async with self.pool.connection() as conn:
+            await conn.execute(SAVE_ITEMS_SQL, params)
+
+    async def touch(self, job_id: str) -> None:
+        """진행 중임을 알려 lease 를 연장합니다."""
+        async with self.pool.connection() as conn:
+            await conn.execute(TOUCH_JOB_SQL, (job_id,))
+
+    async def finish(self, job_id: str) -> None:
+        async with self.pool.connection() as conn:
+            await conn.execute(FINISH_JOB_SQL, (job_id, job_id))
+
+
+class JobWorker:
+    """
+    대기 중인 작업을 가져와 완료되지 않은 항목을 chunk_size 개씩 InferenceService.arun_batch 로 처리합니다.
+
+    service_factory 는 InferenceService (또는 arun_batch 를 가진 객체) 를 만듭니다.
+    청크를 처리하는 중에 프로세스가 죽으면 그 청크만 다시 처리되며, 저장된 항목은 건너뜁니다.
+    일시적으로 실패한 항목(BatchItemResult.retryable)은 저장하지 않고 남겨 두었다가, 한 바퀴를 돈 뒤
+    대기 후 다시 처리합니다. max_attempts 번째 시도의 결과는 실패여도 그대로 저장합니다.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        service_factory: Callable,
+        chunk_size: int = JOB_CHUNK_SIZE,
+        lease: float = JOB_LEASE_SECONDS,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        retry_backoff: float = JOB_RETRY_BACKOFF,
+    ):
+        self.store = store
+        self.service_factory = service_factory
+        self.chunk_size = max(1, chunk_size)
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                if await self.run_once():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except UndefinedTable:
+                # 스키마가 없으면 다시 시도해도 같으므로 워커를 멈춤
+                logger.error("Job tables are missing; run scripts/init_db.py. Job worker stopped.")
+                return
+            except Exception:
+                # DB 장애 등: 잠시 후 다시 시도 (처리 중이던 작업은 lease 가 지나면 다시 가져감)
+                logger.exception("Job worker iteration failed")
+            await asyncio.sleep(self.poll_interval)
+
+    async def run_once(self) -> bool:
+        """작업 하나를 가져와 끝까지 처리합니다. 가져올 작업이 없으면 False."""
+        job_id = await self.store.claim(self.lease)
+        if job_id is None:
+            return False
+        logger.info("Job %s claimed", job_id)
+        await self.process(job_id)
+        return True
+
+    async def process(self, job_id: str) -> None:
+        svc = self.service_factory()
+        for attempt in range(1, self.max_attempts + 1):
+            deferred = await self._process_pending(job_id, svc, final=attempt == self.max_attempts)
+            if not deferred:
+                break
+            # 대기하는 동안 다른 워커가 가져가지 않도록 lease 를 연장하고, lease 의 절반까지만 대기
+            delay = min(self.retry_backoff * 2 ** (attempt - 1), self.lease / 2)
+            logger.warning(
+                "Job %s: %d item(s) failed transiently; retrying in %.0fs (attempt %d/%d)",
+                job_id, deferred, delay, attempt + 1, self.max_attempts
+            )
+            await self.store.touch(job_id)
+            await asyncio.sleep(delay)
+        await self.store.finish(job_id)
+        logger.info("Job %s done", job_id)
+
+    async def _process_pending(self, job_id: str, svc, final: bool) -> int:
+        """완료되지 않은 항목을 한 바퀴 처리하고, 다음 시도로 미룬 항목 수를 반환합니다."""
+        after, deferred = -1, 0
+        while items := await self.store.pending(job_id, after, self.chunk_size):
+            payloads = [DetailedTalentInput.model_validate(data) for _, data in items]
+            results = await svc.arun_batch(payloads)
+            rows = []
+            for (idx, _), r in zip(items, results):
+                if r.retryable and not final:
+                    deferred += 1
+                    continue
+                rows.append((idx, r.result.model_dump(mode="json") if r.result is not None else None, r.error))
+            # 저장할 항목이 없어도 진행률 갱신으로 lease 는 연장됨
+            await self.store.save(job_id, rows)
+            logger.debug("Job %s: saved %d of items %d–%d", job_id, len(rows), items[0][0], items[-1][0])
+            after = items[-1][0]
+        return deferred
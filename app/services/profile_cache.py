@@ -0,0 +1,86 @@
+# app/services/profile_cache.py
+
+import os
+import time
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 버전 스탬프 확인 주기 (초). 이 시간 동안은 DB 조회 없이 메모리의 임베딩을 사용합니다.
+PROFILE_CACHE_CHECK_INTERVAL = float(os.getenv("PROFILE_CACHE_CHECK_INTERVAL", "30"))
+
+# 임베딩 파이프라인(scripts/embed_docs.py)이 프로파일을 추가·갱신할 때마다 nextval 로 올리는 시퀀스
+# (nextval 이 한 번도 호출되지 않은 시퀀스는 0 으로 취급)
+PROFILE_VERSION_SQL = """
+    SELECT CASE WHEN is_called THEN last_value ELSE 0 END
+      FROM profile_embedding_version
+"""
+BUMP_PROFILE_VERSION_SQL = "SELECT nextval('profile_embedding_version')"
+PROFILE_EMBEDDINGS_SQL = """
+    SELECT company_id, embedding
+      FROM company_docs
+     WHERE doc_type = 'profile'
+       AND embedding IS NOT NULL
+     ORDER BY company_id, id
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileCache:
+    """
+    회사 프로파일 임베딩의 프로세스 로컬 캐시.
+
+    (company_id → 행 번호) 인덱스와 float32 행렬 (회사 수 × 차원) 로 보관합니다.
+    DB 조회와 동시 갱신 제어(잠금)는 호출하는 쪽(VectorSearch / AsyncVectorSearch)이 담당하고,
+    이 클래스는 확인 주기 관리와 스냅샷 교체만 처리합니다.
+    """
+
+    def __init__(self, check_interval: float = PROFILE_CACHE_CHECK_INTERVAL):
+        self.check_interval = check_interval
+        # (version, company_id → 행 번호, 행렬) 스냅샷을 통째로 교체하여 읽기 시 잠금이 필요 없음
+        self._snapshot: Tuple[Optional[int], Dict[int, int], np.ndarray] = (
+            None, {}, np.empty((0, 0), dtype=np.float32)
+        )
+        self._checked_at = float("-inf")
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._snapshot[0]
+
+    @property
+    def loaded(self) -> bool:
+        return self._snapshot[0] is not None
+
+    def __len__(self) -> int:
+        return len(self._snapshot[1])
+
+    def due_for_check(self, interval: Optional[float] = None) -> bool:
+        interval = self.check_interval if interval is None else interval
+        return not self.loaded or time.monotonic() - self._checked_at >= interval
+
+    def mark_checked(self) -> None:
+        self._checked_at = time.monotonic()
+
+    def replace(self, version: int, rows: Iterable[Tuple[int, Sequence[float]]]) -> None:
+        """DB 에서 읽은 (company_id, 임베딩) 목록으로 스냅샷을 교체합니다. 중복 회사는 첫 행을 사용합니다."""
+        rows_of: Dict[int, int] = {}
+        vectors: List[np.ndarray] = []
+        for company_id, embedding in rows:
+            if company_id in rows_of:
+                continue
+            rows_of[company_id] = len(vectors)
+            vectors.append(np.asarray(embedding, dtype=np.float32))
+        matrix = np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+        self._snapshot = (version, rows_of, matrix)
+        self.mark_checked()
+        logger.info("Profile cache loaded: %d companies (version %s)", len(rows_of), version)
+
+    def lookup(self, company_ids: Sequence[Optional[int]]) -> List[Optional[np.ndarray]]:
+        """회사별 프로파일 임베딩(행렬의 행) 또는 None 을 반환합니다."""
+        _, rows_of, matrix = self._snapshot
+        return [matrix[rows_of[c]] if c in rows_of else None for c in company_ids]
@@ -0,0 +1,199 @@
+# app/services/profile_text.py
+
+from typing import Any, Dict, List, Optional, Tuple
+
+# 섹션별 시계열·목록의 최대 항목 수 (최근 항목 우선)
+MAX_SERIES_POINTS = 36
+MAX_LIST_ITEMS = 30
+
+
+def _dicts(items) -> List[dict]:
+    """목록 중 dict 항목만 (회사마다 필드 형식이 조금씩 다름)"""
+    return [x for x in items if isinstance(x, dict)] if isinstance(items, list) else []
+
+
+def _join(values, sep: str = ", ") -> str:
+    return sep.join(str(v) for v in values if v not in (None, "", "-"))
+
+
+def _line(label: str, value: Any) -> Optional[str]:
+    if value in (None, "", "-", [], {}):
+        return None
+    return f"{label}: {value}"
+
+
+def _recent(rows: List[dict], key: str, limit: int = MAX_SERIES_POINTS) -> List[dict]:
+    """key(날짜 문자열) 기준 최근 limit 개를 오래된 순으로 반환"""
+    return sorted(_dicts(rows), key=lambda r: str(r.get(key) or ""))[-limit:]
+
+
+def _overview(data: dict) -> List[str]:
+    base = (data.get("base_company_info") or {}).get("data") or {}
+    # 일부 데이터는 seedCorp 없이 최상위에 회사 정보가 있음
+    corp = base.get("seedCorp") or data
+    og = (data.get("base_company_info") or {}).get("ogTagContent") or {}
+    name = _join([corp.get("corpNameKr"), corp.get("corpNameEn")], " / ")
+    return [
+        _line("회사", name),
+        _line("소개", _join([corp.get("corpIntroKr"), corp.get("corpIntroEn")], " / ")),
+        _line("요약", og.get("description")),
+        _line("업종", corp.get("bizInfoKr") or corp.get("bizNameKr")),
+        _line("설립일", corp.get("foundAt")),
+        _line("상태", _join([corp.get("corpStatCdKr"), corp.get("corpStockCdKr")])),
+        _line("홈페이지", corp.get("homeUrl")),
+        _line("주소", corp.get("corpAddrKr")),
+        _line("직원 수", corp.get("empWholeVal")),
+        _line("누적 투자", corp.get("invstSumValText")),
+        _line("최근 투자일", corp.get("lastInvstAt")),
+        _line("매출", corp.get("finacRevenueVal")),
+    ]
+
+
+def _categories(data: dict) -> List[str]:
+    base = (data.get("base_company_info") or {}).get("data") or {}
+    return [
+        _line("분야", _join(b.get("bizNameKr") for b in _dicts(base.get("seedCorpBiz")))),
+        _line("태그", _join(t.get("tagNameKr") or t.get("tagNameEn") for t in _dicts(base.get("seedCorpTag")))),
+        _line("배지", _join(b.get("badge") for b in _dicts(base.get("seedBadge")))),
+        _line("키워드", _join(k.get("advertisementKeyword") for k in _dicts(base.get("seedAdvertisementKeywords")))),
+    ]
+
+
+def _people(data: dict) -> List[str]:
+    base = (data.get("base_company_info") or {}).get("data") or {}
+    return [
+        _line("인물", _join(
+            _join([p.get("pplNameKr"), p.get("pplPosKr") or p.get("pplPosEn")], " ")
+            for p in _dicts(base.get("seedPeople"))
+        )),
+    ]
+
+
+def _products(data: dict) -> List[str]:
+    lines = []
+    products = data.get("products")
+    for p in (products if isinstance(products, list) else [])[:MAX_LIST_ITEMS]:
+        if not isinstance(p, dict):
+            lines.append(f"- {p}")
+            continue
+        types = _join(t.get("type") for t in _dicts(p.get("types")))
+        status = f", 종료 {p['finishedAt']}" if p.get("finishedAt") else ""
+        lines.append(f"- {p.get('name')} ({types}{status})" if types else f"- {p.get('name')}{status}")
+    product = ((data.get("base_company_info") or {}).get("data") or {}).get("seedProduct") or {}
+    lines.append(_line("대표 제품", _join([product.get("prodNameKr"), product.get("prodIntroKr")], " - ")))
+    return lines
+
+
+def _investment(data: dict) -> List[str]:
+    inv = data.get("investment") or {}
+    lines = [
+        _line("최근 단계", inv.get("lastInvestmentLevel")),
+        _line("총 투자금", inv.get("totalInvestmentAmount")),
+        _line("설명", inv.get("investmentDescription")),
+    ]
+    for r in reversed(_recent(inv.get("data"), "investAt", MAX_LIST_ITEMS)):
+        investors = _join(i.get("name") for i in _dicts(r.get("investor")))
+        lines.append("- " + _join(
+            [r.get("investAt"), r.get("level"), r.get("investmentAmount"), investors, r.get("investmentDescription")],
+            " ",
+        ))
+    return lines
+
+
+def _organization(data: dict) -> List[str]:
+    org = data.get("organization") or {}
+    series = _join(
+        f"{r.get('referenceMonth')} {r.get('value')}(+{r.get('in', 0)}/-{r.get('out', 0)})"
+        for r in _recent(org.get("data"), "referenceMonth")
+    )
+    return [_line("퇴사율", org.get("retireRate")), _line("월별 인원(입사/퇴사)", series)]
+
+
+def _finance(data: dict) -> List[str]:
+    lines = []
+    for r in _recent((data.get("finance") or {}).get("data"), "year", MAX_LIST_ITEMS):
+        # 지표 이름은 회사마다 다름 (profit, netProfit, aum, fundSize ...)
+        fields = _join(f"{k} {v}" for k, v in r.items() if k not in ("year", "type") and v is not None)
+        lines.append(f"- {_join([r.get('year'), r.get('type')], ' ')}: {fields}")
+    return lines
+
+
+def _patent(data: dict) -> List[str]:
+    patent = data.get("patent") or {}
+    return [
+        _line("특허 수", patent.get("totalCount")),
+        _line("평균 등급", patent.get("averageRank")),
+        _line("등급 분포", _join(f"{c.get('level')} {c.get('count')}" for c in _dicts(patent.get("chart")))),
+        _line("키워드", _join(w.get("text") for w in _dicts(patent.get("words"))[:MAX_LIST_ITEMS])),
+    ] + [f"- {p.get('registerAt')} [{p.get('level')}] {p.get('title')}" for p in _dicts(patent.get("list"))[:MAX_LIST_ITEMS]]
+
+
+def _mau(data: dict) -> List[str]:
+    names = {p.get("id"): p.get("name") for p in _dicts(data.get("products"))}
+    lines = []
+    for item in _dicts((data.get("mau") or {}).get("list")):
+        series = _join(f"{r.get('referenceMonth')} {r.get('value')}" for r in _recent(item.get("data"), "referenceMonth"))
+        if series:
+            lines.append(f"- {names.get(item.get('productId'), item.get('productId'))}: {series}")
+    return lines
+
+
+def _customers(data: dict) -> List[str]:
+    ctype = data.get("customerType") or {}
+    sales = data.get("customerSales") or {}
+    return [
+        _line("가구", _join(f"{r.get('type')} {r.get('rate')}%" for r in _dicts(ctype.get("salesFamily")))),
+        _line("소득", _join(f"{r.get('type')} {r.get('rate')}%" for r in _dicts(ctype.get("salesIncome")))),
+        _line("성별·연령", _join(
+            f"{r.get('gender')} {r.get('ageGroup')} {r.get('rate')}%" for r in _dicts(ctype.get("salesPerson"))
+        )),
+        _line("월 매출(증감률·건수·객단가)", _join(
+            f"{r.get('referenceMonth')} {r.get('rate')}%/{r.get('count')}/{r.get('unitPrice')}"
+            for r in _recent(sales.get("salesBasic"), "referenceMonth")
+        )),
+        _line("재구매율", _join(f"{r.get('period')} {r.get('repurchaseRate')}%" for r in _dicts(sales.get("salesPeriod")))),
+    ]
+
+
+def _similar(data: dict) -> List[str]:
+    return [
+        f"- {_join([c.get('corpNameKr'), c.get('bizNameKr'), c.get('corpIntroKr')], ' | ')}"
+        for c in _dicts(data.get("similarCorps"))[:MAX_LIST_ITEMS]
+    ]
+
+
+# (섹션 제목, 추출 함수) — 임베딩 텍스트에 나타나는 순서
+SECTIONS = (
+    ("개요", _overview),
+    ("분야", _categories),
+    ("인물", _people),
+    ("제품", _products),
+    ("투자", _investment),
+    ("조직", _organization),
+    ("재무", _finance),
+    ("특허", _patent),
+    ("MAU", _mau),
+    ("고객", _customers),
+    ("유사 기업", _similar),
+)
+
+
+def profile_sections(data: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """
+    company.data(JSONB) 에서 의미 있는 섹션만 뽑아 (제목, 간결한 텍스트) 목록으로 반환합니다.
+    URL·이미지·내부 ID·작성자 같은 필드와 JSON 구두점은 제외되며, 비어 있는 섹션은 생략됩니다.
+    """
+    sections = []
+    for title, extract in SECTIONS:
+        lines = [line for line in extract(data) if line]
+        if lines:
+            sections.append((title, "\n".join(lines)))
+    return sections
+
+
+def profile_text(data: Dict[str, Any]) -> str:
+    """
+    임베딩용 프로필 텍스트. 섹션을 빈 줄("\\n\\n")로 구분하므로
+    chunk_documents 가 긴 프로필을 섹션 경계에서 나눕니다.
+    """
+    return "\n\n".join(f"[{title}]\n{body}" for title, body in profile_sections(data))
@@ -0,0 +1,242 @@
+# app/services/prompt_builder.py
+
+import os
+import json
+import hashlib
+import logging
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# 프롬프트 전체(지시문 + 예시 + 이력서 + 문서 + 답변 형식)의 최대 토큰 수 (tiktoken 기준)
+PROMPT_MAX_TOKENS = int(os.getenv("PROMPT_MAX_TOKENS", "4000"))
+# 이력서 문자열 필드(직무 설명 등) 하나의 최대 토큰 수
+PROMPT_FIELD_MAX_TOKENS = int(os.getenv("PROMPT_FIELD_MAX_TOKENS", "200"))
+# 관련 문서 스니펫 하나의 최대 토큰 수
+PROMPT_DOC_MAX_TOKENS = int(os.getenv("PROMPT_DOC_MAX_TOKENS", "100"))
+
+# 태그 추론에 쓰는 이력서 필드 (값이 튜플이면 리스트 원소에서 남길 하위 필드).
+# 이름·사진·링크·로고 등 나머지 extra 필드는 프롬프트에서 제외합니다.
+RESUME_FIELDS = {
+    "headline": None,
+    "summary": None,
+    "industryName": None,
+    "skills": None,
+    "positions": ("title", "companyName", "description", "startEndDate"),
+    "educations": ("schoolName", "degreeName", "fieldOfStudy", "description", "startEndDate"),
+    "projects": None,
+}
+
+PROMPT_TEMPLATE = """\
+당신은 전문 리쿠르터입니다. 지원자의 이력서(JSON)와 
+"[news] KT (2017-12-21): [2017 디지털혁신상품] KT 기가지니  https://m.ddaily.co.kr/page/view/2017122115161782509"
+"[news] 엘박스 (2024-01-26): [더벨][VC 투자기업] 판례 검색 1위 엘박스, 소송금융 시장 뛰어든다  https://www.thebell.co.kr/free/content/ArticleView.asp?key=202401231844596240101829"
+형태로 제공되는 뉴스데이터를 참고하여, **아래 7가지 핵심 카테고리**를 가능하다면 포함해주세요.
+이 외에도 자유롭게 의미 있는 추가 태그를 뽑아 **태그 형태**로 추출하세요.
+
+뉴스데이터는 반드시 함께 제공되는 링크를 방문하여 본문의 내용을 결과에 반영하세요.
+**절대** 이력서에 없는 회사의 문서를 사용하거나, 다른 회사 경험을 만들어내지 마세요.
+또한, 예제나 플레이스홀더를 그대로 복붙하지 마세요.
+
+핵심 카테고리:
+1. **학력**: 최상위권 대학교 졸업 여부  
+예시: “상위권대학교 (학교명)”
+
+2. **대규모 회사 경험**: 메이저 기업 근무 여부  
+예시: “대규모 회사 경험 (회사1·회사2·…)”
+
+3. **성장기 스타트업 경험**: 포지션 기간 기반 조직·투자 규모 성장  
+예시: “성장기스타트업 경험 (스타트업명 YYYY–YYYY: 조직·투자 규모 X배 성장)”
+
+4. **리더십**: 매니징 직책 보유 여부  
+예시: “리더쉽 (직책1·직책2·…)”
+
+5. **대용량 데이터 처리 경험**: 대규모 기술 프로젝트 참여  
+예시: “대용량데이터처리경험 (회사명 프로젝트명)”
+
+6. **M&A 경험**: 인수·합병 참여 여부  
+예시: “M&A 경험 (인수 대상·매각 대상)”
+
+7. **IPO 및 투자 유치**: 상장·펀딩 주도 여부  
+예시: “IPO 경험 (회사명 IPO)” 또는 “신규 투자 유치 경험 (스타트업명 YYYY: 투자액)”
+
+출력은 **JSON** 형태로, `"tags"` 배열에 각 태그를 넣어주세요.  
+
+예시)
+```json
+{
+"tags": [
+    "상위권대학교 (연세대학교)",
+    "대규모 회사 경험 (네이버·토스)",
+    "성장기스타트업 경험 (토스 2016–2019: 조직·투자 규모 2배 성장)",
+    "리더쉽 (Tech Lead·Chapter Lead)",
+    "대용량데이터처리경험 (네이버 하이퍼클로바 개발)",
+    "M&A 경험 (요기요 매각)",
+    "신규 투자 유치 경험 (비바리퍼블리카 2018-12-10: 900억 투자)",
+    "수상 경력 (사내 우수 엔지니어상 수상)"
+]
+}
+"""
+
+# Few-shot 예시
+EXAMPLE_SECTION = (
+    "추론 예시:\n"
+    "- Input: talent1.json\n"
+    "  Output: 상위권대학교 (KAIST), 대규모 회사 경험 (삼성전자·네이버), 성장기스타트업 경험 (토스 조직 4.5배 확장), 리더쉽 (CTO·Director·팀장), 대용량데이터처리경험 (네이버 하이퍼클로바 개발), M&A 경험 (요기요 매각), 신규 투자유치 (토스 시리즈 F·엘박스 시리즈 B)\n"
+    "- Input: talent2.json\n"
+    "  Output: 상위권대학교 (고려대학교), 성장기스타트업 경험 (토스 16년–19년 조직·투자 규모 2배 성장), 리더쉽 (챕터 리드·테크 리드), 대용량데이터처리경험 (LLM 대규모 파이프라인 구축)\n"
+    "- Input: talent3.json\n"
+    "  Output: 상위권대학교 (연세대학교), 대규모 회사 경험 (KT 전략기획실·미디어 성장전략), 리더쉽 (팀장·CFO), IPO 경험 (밀리의서재 IPO), M&A 경험 (밀리의서재 인수)\n"
+    "- Input: talent4.json\n"
+    "  Output: 상위권대학교 (서울대학교), 대규모 회사 경험 (삼성전자·SKT), M&A 경험 (요기요 사모펀드 매각), 리더쉽 (CPO·창업), 신규 투자유치\n\n"
+)
+
+ANSWER_FORMAT = (
+    "\n답변 형식(한국어 JSON):\n```json\n"
+    '{ "tags": ["태그1", "태그2", ...] }\n```'
+)
+
+RESUME_HEADER = "지원자 이력서(JSON):\n"
+DOCS_HEADER = "\n\n관련 회사 문서 (관련도 순):\n"
+TRUNCATED = "…"
+
+
+class Prompt(NamedTuple):
+    text: str
+    tokens: int              # 프롬프트 전체 토큰 수
+    max_tokens: int          # 토큰 예산
+    static_tokens: int       # 지시문 + 예시 + 답변 형식 (미리 토큰화된 고정 부분)
+    resume_tokens: int
+    doc_tokens: int
+    docs_included: int
+    docs_available: int      # 중복 제거 후 후보 문서 수
+
+
+def _period(value: Any) -> Any:
+    """포지션 재직 기간 {start: {year, month}, end: ...} → "2019.02–2021.04" (종료가 없으면 "–현재")"""
+    if not isinstance(value, dict) or "start" not in value:
+        return value
+
+    def ym(d):
+        return f"{d['year']}.{d['month']:02d}" if d.get("month") else str(d["year"])
+
+    return f"{ym(value['start'])}–{ym(value['end']) if value.get('end') else '현재'}"
+
+
+def _empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def prune_resume(data: dict) -> dict:
+    """RESUME_FIELDS 에 있는 필드만 남기고 빈 값을 제거합니다. 재직 기간은 짧은 문자열로 바꿉니다."""
+    pruned = {}
+    for field, subfields in RESUME_FIELDS.items():
+        value = data.get(field)
+        if subfields is not None and isinstance(value, list):
+            value = [
+                {k: _period(item[k]) if k == "startEndDate" else item[k]
+                 for k in subfields if not _empty(item.get(k))}
+                for item in value if isinstance(item, dict)
+            ]
+        if not _empty(value):
+            pruned[field] = value
+    return pruned
+
+
+class PromptBuilder:
+    """
+    토큰 예산 안에서 태그 추론 프롬프트를 만듭니다.
+
+    고정 부분(지시문 + Few-shot 예시 + 답변 형식)은 생성 시 한 번 만들고 토큰 수를 세어 둡니다.
+    요청마다 이력서는 RESUME_FIELDS 로 줄이고 긴 문자열 필드를 field_max_tokens 로 자른 뒤
+    (그래도 넘치면 이력서 JSON 자체를 자름), 남은 예산을 관련도(거리) 순 문서 스니펫에 배분합니다.
+    부분별 토큰 수의 합은 전체 프롬프트의 토큰 수 이상이므로(경계의 줄바꿈이 한 토큰으로
+    합쳐질 수 있음) 예산을 넘지 않으며, 이 합을 Prompt.tokens 로 보고합니다.
+    """
+
+    def __init__(
+        self,
+        tokenizer,
+        max_tokens: int = PROMPT_MAX_TOKENS,
+        field_max_tokens: int = PROMPT_FIELD_MAX_TOKENS,
+        doc_max_tokens: int = PROMPT_DOC_MAX_TOKENS,
+    ):
+        self.tokenizer = tokenizer
+        self.max_tokens = max_tokens
+        self.field_max_tokens = field_max_tokens
+        self.doc_max_tokens = doc_max_tokens
+        self.prefix = PROMPT_TEMPLATE + EXAMPLE_SECTION + RESUME_HEADER
+        self.suffix = ANSWER_FORMAT
+        self.static_tokens = self._count(self.prefix) + self._count(DOCS_HEADER) + self._count(self.suffix)
+        if self.static_tokens >= max_tokens:
+            raise ValueError(f"PROMPT_MAX_TOKENS={max_tokens} leaves no room after the {self.static_tokens}-token template")
+        # 태그 캐시 키에 들어가는 버전: 템플릿이나 예산·필드 설정이 바뀌면 캐시가 자동 무효화됨
+        settings = json.dumps([max_tokens, field_max_tokens, doc_max_tokens, RESUME_FIELDS])
+        self.version = hashlib.sha256((self.prefix + DOCS_HEADER + self.suffix + settings).encode("utf-8")).hexdigest()[:12]
+
+    def _count(self, text: str) -> int:
+        return len(self.tokenizer.encode(text))
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        tokens = self.tokenizer.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        if max_tokens <= 0:
+            return ""
+        # 토큰 경계에서 자르면 멀티바이트 문자가 깨질 수 있으므로 대체 문자는 버림 (말줄임표 자리 1 토큰)
+        return self.tokenizer.decode(tokens[:max_tokens - 1]).rstrip("\ufffd") + TRUNCATED
+
+    def _resume_text(self, data: dict, budget: int) -> str:
+        pruned = prune_resume(data)
+        for item in pruned.get("positions", []) + pruned.get("educations", []):
+            if isinstance(item.get("description"), str):
+                item["description"] = self._truncate(item["description"], self.field_max_tokens)
+        for field in ("headline", "summary"):
+            if isinstance(pruned.get(field), str):
+                pruned[field] = self._truncate(pruned[field], self.field_max_tokens)
+        text = json.dumps(pruned, ensure_ascii=False, separators=(",", ":"))
+        return self._truncate(text, budget)
+
+    def build(self, resume: dict, docs: Iterable) -> Prompt:
+        """resume 는 이력서 dict, docs 는 distance 가 있는 Document (작을수록 관련도 높음)."""
+        budget = self.max_tokens - self.static_tokens
+        resume_text = self._resume_text(resume, budget)
+        resume_tokens = self._count(resume_text)
+        budget -= resume_tokens
+
+        # 같은 문서가 여러 포지션에서 검색될 수 있으므로 중복 제거 후 관련도 순으로 배분
+        unique = list({(d.id, d.content): d for d in docs}.values())
+        ranked = sorted(unique, key=lambda d: float("inf") if d.distance is None else d.distance)
+        lines: List[str] = []
+        doc_tokens = 0
+        for d in ranked:
+            snippet = self._truncate(d.content.replace("\n", " "), self.doc_max_tokens)
+            line = f"- [{d.doc_type}] {d.company_name} ({d.published_at}): {snippet}\n"
+            n = self._count(line)
+            if n > budget:
+                break
+            lines.append(line)
+            doc_tokens += n
+            budget -= n
+
+        text = self.prefix + resume_text + DOCS_HEADER + "".join(lines) + self.suffix
+        prompt = Prompt(
+            text=text,
+            tokens=self.static_tokens + resume_tokens + doc_tokens,
+            max_tokens=self.max_tokens,
+            static_tokens=self.static_tokens,
+            resume_tokens=resume_tokens,
+            doc_tokens=doc_tokens,
+            docs_included=len(lines),
+            docs_available=len(ranked),
+        )
+        if prompt.docs_included < prompt.docs_available:
+            logger.debug(
+                "Prompt budget %d reached: %d/%d docs included",
+                self.max_tokens, prompt.docs_included, prompt.docs_available
+            )
+        return prompt
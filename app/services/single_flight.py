@@ -0,0 +1,86 @@
+# app/services/single_flight.py
+
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 동시에 들어온 같은 /infer 요청을 한 번만 계산 (0 이면 비활성화)
+INFER_SINGLE_FLIGHT = os.getenv("INFER_SINGLE_FLIGHT", "1") == "1"
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 호출을 하나의 실행으로 합칩니다 (single-flight).
+
+    먼저 들어온 호출(leader)만 fn 을 실행하고, 실행 중에 같은 키로 들어온 호출은 그 결과(또는 예외)를
+    함께 받습니다. 실행이 끝나면 키를 지우므로 결과를 보관하지는 않습니다 (보관은 TagCache 담당).
+    do 는 스레드(동기 경로), ado 는 이벤트 루프(비동기 경로)용이며 서로의 실행은 공유하지 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._tasks: Dict[str, asyncio.Future] = {}
+        self._stats = {"calls": 0, "executed": 0, "coalesced": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._stats["calls"] += 1
+            fut = self._calls.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._calls[key] = Future()
+                self._stats["executed"] += 1
+            else:
+                self._stats["coalesced"] += 1
+        if not leader:
+            logger.debug("Coalesced with in-flight call %s", key[:12])
+            return fut.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        with self._lock:
+            self._stats["calls"] += 1
+            task = self._tasks.get(key)
+            if task is None:
+                task = self._tasks[key] = asyncio.ensure_future(fn())
+                task.add_done_callback(lambda t: self._finish(key, t))
+                self._stats["executed"] += 1
+            else:
+                self._stats["coalesced"] += 1
+                logger.debug("Coalesced with in-flight call %s", key[:12])
+        # 한 호출자가 취소(클라이언트 연결 종료)되어도 다른 호출자가 기다리는 실행은 계속됨
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        with self._lock:
+            self._tasks.pop(key, None)
+        # 기다리던 호출자가 모두 취소된 경우에도 "exception was never retrieved" 경고가 나지 않도록 확인
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls) + len(self._tasks)
+        return stats
@@ -0,0 +1,70 @@
+# app/services/tag_stream.py
+
+import re
+import json
+from typing import List
+
+# 답변 JSON 의 "tags" 배열 시작 (코드블록·앞뒤 설명 문장과 무관하게 찾음)
+TAGS_START = re.compile(r'"tags"\s*:\s*\[')
+
+
+class TagStreamParser:
+    """
+    생성 중인 LLM 답변에서 "tags" 배열의 문자열을 완성되는 대로 꺼내는 증분 파서.
+
+    InferenceService._parse_response (코드블록 제거 + json.loads) 의 스트리밍 버전으로,
+    feed 에 델타 문자열을 넣을 때마다 새로 닫힌 태그 문자열만 반환합니다. 최종 결과는
+    여전히 전체 답변을 _parse_response 로 파싱해 확정합니다.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = None   # "tags" 배열 안에서 다음에 읽을 위치 (배열을 찾기 전에는 None)
+        self.closed = False
+
+    def feed(self, delta: str) -> List[str]:
+        self.text += delta
+        if self.closed:
+            return []
+        if self._pos is None:
+            m = TAGS_START.search(self.text)
+            if m is None:
+                return []
+            self._pos = m.end()
+
+        tags: List[str] = []
+        text, i = self.text, self._pos
+        while i < len(text):
+            ch = text[i]
+            if ch in " \t\r\n,":
+                i += 1
+            elif ch == "]":
+                self.closed = True
+                i += 1
+                break
+            elif ch == '"':
+                end = self._string_end(text, i + 1)
+                if end is None:
+                    break  # 아직 닫히지 않은 문자열
+                tags.append(json.loads(text[i:end + 1]))
+                i = end + 1
+            else:
+                # 문자열이 아닌 원소는 무시하고 다음 구분자까지 건너뜀
+                nxt = min((j for j in (text.find(",", i), text.find("]", i)) if j != -1), default=None)
+                if nxt is None:
+                    break
+                i = nxt
+        self._pos = i
+        return tags
+
+    @staticmethod
+    def _string_end(text: str, i: int):
+        """i 부터 시작하는 JSON 문자열 본문의 닫는 따옴표 위치 (이스케이프 고려). 없으면 None"""
+        while i < len(text):
+            if text[i] == "\\":
+                i += 2
+            elif text[i] == '"':
+                return i
+            else:
+                i += 1
+        return None
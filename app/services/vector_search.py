@@ -1,21 +1,27 @@
 # app/services/vector_search.py
 
 import os
+import asyncio
 import datetime
-import psycopg
 import logging
-from typing import List, NamedTuple, Optional
+import threading
+from collections import Counter
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
 from dotenv import load_dotenv
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
+from app.db import create_async_pool, create_pool, pool_stats
+from app.logging_config import preview_vector, sampled
+from .candidate_stats import CANDIDATE_STATS_SQL, CandidateStats
+from .company_ids import COMPANY_IDS_SQL, CompanyIds
+from .profile_cache import PROFILE_EMBEDDINGS_SQL, PROFILE_VERSION_SQL, ProfileCache
 
 # 환경 변수 로드
 load_dotenv()
-DB_URL = os.getenv("DATABASE_URL")
+# 진단 모드: 켜면 검색마다 전체/기간 내 문서 수 COUNT 쿼리를 추가로 실행합니다.
+DIAGNOSTICS = os.getenv("VECTOR_SEARCH_DIAGNOSTICS", "").lower() in ("1", "true", "yes")
 
-# 로거 설정
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 
@@ -24,14 +30,197 @@ class Document(NamedTuple):
     doc_type: str
     content: str
     published_at: datetime.date
+    id: Optional[int] = None
+    # 회사 프로파일 임베딩과의 코사인 거리 (작을수록 관련도 높음)
+    distance: Optional[float] = None
+
+
+class SearchRequest(NamedTuple):
+    company_name: str
+    start_date: Optional[datetime.date] = None
+    end_date: Optional[datetime.date] = None
+    top_k: int = 5
+
+
+# 요청 배열(company_id, 기간, top_k, 프로파일 임베딩, 정확 검색 여부)을 unnest 한 뒤 요청별로 top_k 유사 문서를 LATERAL 조회합니다.
+# 회사명은 CompanyIds 에서 id 로 바꾸고, 프로파일 임베딩은 ProfileCache 에서 꺼내 vector[] 파라미터(바이너리)로
+# 전달하므로 DB 에서 다시 읽지 않습니다. 결과의 회사명은 요청의 회사명을 그대로 씁니다.
+# 문서가 없는 요청은 행이 없습니다. 기간 필터는 start_date, end_date 가 모두 주어진 경우에만 적용됩니다.
+#
+# 요청마다 (CandidateStats 가 추정한 회사·기간 내 문서 수에 따라) 두 경로 중 하나만 실행합니다.
+# 선택되지 않은 쪽은 One-Time Filter 로 건너뜁니다.
+#   - 정확 검색: 부분 인덱스(company_id, published_at)로 회사의 기간 내 문서만 읽어 거리순 정렬.
+#                OFFSET 0 으로 서브쿼리를 고정해 ANN 인덱스를 쓰지 않으므로 항상 정확한 top_k.
+#   - ANN 검색 : 전역 ANN 인덱스(HNSW/IVFFlat)로 가까운 문서 후보(마지막 파라미터 개수)를 뽑은 뒤
+#                회사·기간으로 거름. 후보 안에 기간 내 회사 문서가 충분히 들어오는 (문서가 매우 많은) 회사용.
+#                top_k 를 채우지 못한 요청은 _exact_retry 로 정확 검색을 한 번 더 실행.
+BATCH_SEARCH_SQL = """
+    SELECT r.idx,
+           d.id, d.doc_type, d.content, d.published_at, d.distance
+      FROM unnest(%s::int[], %s::date[], %s::date[], %s::int[], %b::vector[], %s::bool[])
+           WITH ORDINALITY AS r(company_id, start_date, end_date, top_k, embedding, exact, idx)
+     CROSS JOIN LATERAL (
+            (SELECT id, doc_type, content, published_at, distance
+               FROM (SELECT id, doc_type, content, published_at,
+                            embedding <=> r.embedding AS distance
+                       FROM company_docs
+                      WHERE doc_type != 'profile'
+                        AND company_id = r.company_id
+                        AND (r.start_date IS NULL OR r.end_date IS NULL
+                             OR published_at BETWEEN r.start_date AND r.end_date)
+                     OFFSET 0) exact_scan
+              WHERE r.exact
+              ORDER BY distance
+              LIMIT r.top_k)
+            UNION ALL
+            (SELECT id, doc_type, content, published_at, distance
+               FROM (SELECT id, company_id, doc_type, content, published_at,
+                            embedding <=> r.embedding AS distance
+                       FROM company_docs
+                      WHERE NOT r.exact
+                        AND doc_type != 'profile'
+                      ORDER BY embedding <=> r.embedding
+                      LIMIT %s) ann_scan
+              WHERE company_id = r.company_id
+                AND (r.start_date IS NULL OR r.end_date IS NULL
+                     OR published_at BETWEEN r.start_date AND r.end_date)
+              ORDER BY distance
+              LIMIT r.top_k)
+      ) d
+     ORDER BY r.idx, d.distance
+"""
+
+RequestLike = Tuple[str, Optional[datetime.date], Optional[datetime.date], int]
+
+DIAGNOSTICS_TOTAL_SQL = "SELECT COUNT(*) FROM company_docs WHERE doc_type != 'profile'"
+DIAGNOSTICS_RANGE_SQL = """
+    SELECT COUNT(*)
+      FROM company_docs
+     WHERE doc_type != 'profile'
+       AND company_id = %s
+       AND published_at BETWEEN %s AND %s
+"""
+
+# 캐시에 없는 회사가 들어왔을 때 버전 스탬프를 다시 확인하는 최소 간격 (초)
+PROFILE_MISS_RECHECK_INTERVAL = 1.0
+
+
+def _prepare(requests: Sequence[RequestLike]) -> Tuple[List[SearchRequest], List[SearchRequest], list]:
+    """요청을 정규화하고 중복을 제거한 뒤 unnest 용 배열 파라미터를 만듭니다 (첫 배열은 회사명, 실행 전 id 로 교체)."""
+    reqs = [SearchRequest(*r) for r in requests]
+    unique = list(dict.fromkeys(reqs))
+    logger.debug("most_similar_many called with %d request(s), %d unique", len(reqs), len(unique))
+    params = [
+        [r.company_name for r in unique],
+        [r.start_date for r in unique],
+        [r.end_date for r in unique],
+        [r.top_k for r in unique],
+    ]
+    return reqs, unique, params
+
+
+def _require_profiles(unique: List[SearchRequest], vectors: List[Optional[np.ndarray]]) -> None:
+    for r, vec in zip(unique, vectors):
+        if vec is None:
+            logger.error("No embedding found for company %r", r.company_name)
+            raise ValueError(f"No embedding for company {r.company_name}")
+
+
+def _search_params(params: list, company_ids: List[Optional[int]], vectors: list, candidates: CandidateStats) -> list:
+    """회사명 배열을 id 로 바꾸고 임베딩, 정확 검색 여부, ANN 후보 수를 붙인 BATCH_SEARCH_SQL 파라미터"""
+    return [company_ids, *params[1:], vectors, candidates.exact_flags(company_ids, *params[1:4]), candidates.ann_candidates]
+
+
+def _exact_retry(search_params: list, results: list) -> Tuple[List[int], Optional[list]]:
+    """ANN 검색으로 top_k 를 채우지 못한 요청 위치(0부터)와, 그 요청만 정확 검색하는 BATCH_SEARCH_SQL 파라미터"""
+    top_ks, exact = search_params[3], search_params[5]
+    found = Counter(row[0] for row in results)
+    retry = [i for i, e in enumerate(exact) if not e and found[i + 1] < top_ks[i]]
+    if not retry:
+        return retry, None
+    logger.debug("ANN search returned fewer than top_k docs for %d request(s); retrying with exact search", len(retry))
+    params = [[p[i] for i in retry] for p in search_params[:5]]
+    return retry, [*params, [True] * len(retry), search_params[6]]
+
+
+def _merge_retry(results: list, retry: List[int], retried: list) -> list:
+    """재조회한 요청의 결과를 원래 idx 로 바꿔 기존 결과(해당 요청 제외)에 합칩니다."""
+    replaced = {i + 1 for i in retry}
+    kept = [row for row in results if row[0] not in replaced]
+    return kept + [(retry[row[0] - 1] + 1, *row[1:]) for row in retried]
+
+
+def _log_profile_vectors(company_names: List[str], vectors: List[Optional[np.ndarray]]) -> None:
+    # 임베딩은 전체를 찍지 않고 샘플링된 요청에서 앞부분 몇 차원만 기록
+    if logger.isEnabledFor(logging.DEBUG) and sampled():
+        for name, vec in zip(company_names, vectors):
+            if vec is not None:
+                logger.debug("Profile embedding for %r: %s", name, preview_vector(vec))
+
+
+def _group(
+    reqs: List[SearchRequest],
+    unique: List[SearchRequest],
+    results: list,
+) -> List[List[Document]]:
+    """SQL 결과를 요청(idx)별로 그룹화하여 요청 순서대로 반환합니다."""
+    logger.debug("Fetched %d rows", len(results))
+    # 행 단위 로그는 DEBUG 에서도 샘플링된 요청만 남김
+    log_rows = logger.isEnabledFor(logging.DEBUG) and sampled()
+
+    # idx 는 1부터 시작하는 ORDINALITY
+    grouped: List[List[Document]] = [[] for _ in unique]
+    for idx, doc_id, doc_type, content, published, distance in results:
+        company = unique[idx - 1].company_name
+        if log_rows:
+            logger.debug(
+                "Row → idx=%d, company=%r, doc_type=%r, content_len=%d, published_at=%r",
+                idx, company, doc_type, len(content), published
+            )
+        grouped[idx - 1].append(Document(
+            company_name=company,
+            doc_type=doc_type,
+            content=content,
+            published_at=published,
+            id=doc_id,
+            distance=distance,
+        ))
+
+    by_request = dict(zip(unique, grouped))
+    logger.debug("Returning %d Document group(s)", len(reqs))
+    return [list(by_request[r]) for r in reqs]
 
 
 class VectorSearch:
-    def __init__(self):
-        # PostgreSQL 연결
-        logger.debug("Connecting to database: %s", DB_URL)
-        self.conn = psycopg.connect(DB_URL, autocommit=True)
-        logger.debug("Database connection established")
+    def __init__(
+        self,
+        pool: Optional[ConnectionPool] = None,
+        diagnostics: Optional[bool] = None,
+        profile_cache: Optional[ProfileCache] = None,
+        candidate_stats: Optional[CandidateStats] = None,
+        company_ids: Optional[CompanyIds] = None,
+    ):
+        self.diagnostics = DIAGNOSTICS if diagnostics is None else diagnostics
+        # 정확 검색 / ANN 검색 선택용 회사별 문서 수 추정 (프로파일 캐시 확인 시 함께 갱신)
+        self.candidates = CandidateStats() if candidate_stats is None else candidate_stats
+        # 회사명 → company_id (캐시에 없는 이름만 조회)
+        self.company_ids = CompanyIds() if company_ids is None else company_ids
+        # PostgreSQL 커넥션 풀 (요청마다 커넥션을 빌려 쓰고 반납)
+        self.pool = pool or create_pool()
+        # 회사 프로파일 임베딩 캐시 (버전 스탬프가 바뀔 때만 DB 에서 다시 읽음)
+        self.profiles = ProfileCache() if profile_cache is None else profile_cache
+        self._profiles_lock = threading.Lock()
+
+    def pool_stats(self) -> dict:
+        return pool_stats(self.pool)
+
+    def warm_up(self) -> None:
+        """커넥션을 미리 맺고 프로파일 임베딩 캐시를 채웁니다."""
+        with self.pool.connection() as conn:
+            self._refresh_profiles(conn)
+
+    def close(self) -> None:
+        self.pool.close()
 
     def most_similar(
         self,
@@ -41,96 +230,236 @@ class VectorSearch:
         top_k: int = 5,
     ) -> List[Document]:
         """
-        company_name 으로 프로파일 임베딩을 가져와서,
-        모든 문서 중 유사도 순으로 정렬하되,
+        company_name 의 프로파일 임베딩과 가장 가까운 문서 top_k 개를 반환합니다.
         start_date, end_date 가 주어지면 published_at 으로 필터링 합니다.
         """
-        logger.debug(
-            "most_similar called with company_name=%r, start_date=%r, end_date=%r, top_k=%d",
-            company_name, start_date, end_date, top_k
-        )
+        return self.most_similar_many(
+            [SearchRequest(company_name, start_date, end_date, top_k)]
+        )[0]
 
-        with self.conn.cursor() as cur:
-            # 1) 회사 프로파일 임베딩 조회
-            logger.debug("Fetching profile embedding for %r", company_name)
-            cur.execute(
-                """
-                SELECT embedding
-                  FROM company_docs
-                 WHERE doc_type = 'profile'
-                   AND company_name = %s
-                 LIMIT 1
-                """,
-                (company_name,),
-            )
-            row = cur.fetchone()
-            logger.debug("Profile embedding (first 100 chars): %s…", str(row[0])[:100])
+    def most_similar_many(self, requests: Sequence[RequestLike]) -> List[List[Document]]:
+        """
+        (company_name, start_date, end_date, top_k) 요청 목록을 하나의 SQL 로 처리합니다.
+
+        unnest 로 요청 배열을 펼친 뒤, 요청별로 LATERAL 조인하여 유사도 검색을 수행합니다.
+        결과는 요청 순서대로 그룹화된 리스트로 반환됩니다. 동일한 요청은 한 번만 조회합니다.
+        """
+        if not requests:
+            return []
+        reqs, unique, params = _prepare(requests)
+
+        with self.pool.connection() as conn:
+            company_ids = self._company_ids(conn, params[0])
+            vectors = self._profile_vectors(conn, params[0], company_ids)
+            _require_profiles(unique, vectors)
 
-            if not row or row[0] is None:
-                logger.error("No embedding found for company %r", company_name)
-                raise ValueError(f"No embedding for company {company_name}")
-            emb = row[0]
+            with conn.cursor() as cur:
+                if self.diagnostics:
+                    for r, company_id in zip(unique, company_ids):
+                        self._log_diagnostics(cur, r.company_name, company_id, r.start_date, r.end_date)
 
-            # **디버깅용:** 전체 non-profile 문서 수 로그
-            cur.execute(
-                "SELECT COUNT(*) FROM company_docs WHERE doc_type != 'profile'"
+                logger.debug("Executing SQL search")
+                search_params = _search_params(params, company_ids, vectors, self.candidates)
+                cur.execute(BATCH_SEARCH_SQL, search_params)
+                results = cur.fetchall()
+                retry, retry_params = _exact_retry(search_params, results)
+                if retry:
+                    cur.execute(BATCH_SEARCH_SQL, retry_params)
+                    results = _merge_retry(results, retry, cur.fetchall())
+
+        return _group(reqs, unique, results)
+
+    def _company_ids(self, conn, company_names: List[str]) -> List[Optional[int]]:
+        company_ids = self.company_ids.lookup(company_names)
+        missing = [n for n, c in zip(company_names, company_ids) if c is None]
+        if missing:
+            with conn.cursor() as cur:
+                cur.execute(COMPANY_IDS_SQL, (missing,))
+                self.company_ids.add(cur.fetchall())
+            company_ids = self.company_ids.lookup(company_names)
+        return company_ids
+
+    def _profile_vectors(
+        self, conn, company_names: List[str], company_ids: List[Optional[int]]
+    ) -> List[Optional[np.ndarray]]:
+        if self.profiles.due_for_check():
+            self._refresh_profiles(conn)
+        vectors = self.profiles.lookup(company_ids)
+        # 캐시에 없는 회사가 있으면 그 사이 임베딩이 추가됐는지 버전만 다시 확인
+        if any(v is None for v in vectors) and self.profiles.due_for_check(PROFILE_MISS_RECHECK_INTERVAL):
+            self._refresh_profiles(conn)
+            vectors = self.profiles.lookup(company_ids)
+        _log_profile_vectors(company_names, vectors)
+        return vectors
+
+    def _refresh_profiles(self, conn) -> None:
+        with self._profiles_lock, conn.cursor(binary=True) as cur:
+            if self.candidates.due_for_check():
+                cur.execute(CANDIDATE_STATS_SQL)
+                self.candidates.replace(cur.fetchall())
+            cur.execute(PROFILE_VERSION_SQL)
+            version = cur.fetchone()[0]
+            if version == self.profiles.version:
+                self.profiles.mark_checked()
+                return
+            cur.execute(PROFILE_EMBEDDINGS_SQL)
+            self.profiles.replace(version, cur.fetchall())
+
+    def _log_diagnostics(
+        self,
+        cur,
+        company_name: str,
+        company_id: int,
+        start_date: Optional[datetime.date],
+        end_date: Optional[datetime.date],
+    ) -> None:
+        """**디버깅용:** 전체/기간 내 문서 수를 로그로 남깁니다 (diagnostics 모드 전용)."""
+        cur.execute(DIAGNOSTICS_TOTAL_SQL)
+        total_docs = cur.fetchone()[0]
+        logger.debug("Total non-profile docs in DB: %d", total_docs)
+
+        if start_date is not None and end_date is not None:
+            cur.execute(DIAGNOSTICS_RANGE_SQL, (company_id, start_date, end_date))
+            in_range = cur.fetchone()[0]
+            logger.debug(
+                "Docs for %r published between %s and %s: %d",
+                company_name, start_date, end_date, in_range
             )
-            total_docs = cur.fetchone()[0]
-            logger.debug("Total non-profile docs in DB: %d", total_docs)
-
-            # 2) 유사 문서 검색 + 기간 필터링
-            query = """
-                SELECT company_name, doc_type, content, published_at
-                  FROM company_docs
-                 WHERE doc_type != 'profile'
-                   AND company_name = %s
-            """
-            params: List = [company_name]
-
-            # **디버깅용:** date 필터 전후 문서 수 로그
-            if start_date is not None and end_date is not None:
-                cur.execute(
-                    """
-                    SELECT COUNT(*)
-                      FROM company_docs
-                     WHERE doc_type != 'profile'
-                       AND company_name = %s
-                       AND published_at BETWEEN %s AND %s
-                    """,
-                    (company_name, start_date, end_date)
-                )
-                in_range = cur.fetchone()[0]
-                logger.debug(
-                    "Docs for %r published between %s and %s: %d",
-                    company_name, start_date, end_date, in_range
-                )
-                query += " AND published_at BETWEEN %s AND %s"
-                params.extend([start_date, end_date])
-
-            query += " ORDER BY embedding <=> %s LIMIT %s"
-            params.extend([emb, top_k])
-
-            logger.debug("Final SQL query: %s", query.strip())
-            logger.debug("Query parameters: %r", str(params[0])[:100])
-
-            logger.debug("Executing SQL search")
-            cur.execute(query, params)
-            results = cur.fetchall()
-            logger.debug("Fetched %d rows", len(results))
-
-        # NamedTuple 으로 변환
-        docs: List[Document] = []
-        for company, doc_type, content, published in results:
+
+
+class AsyncVectorSearch:
+    """
+    VectorSearch 의 asyncio 버전 (AsyncConnectionPool 기반).
+    풀은 이벤트 루프 안에서 처음 사용할 때 열립니다.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[AsyncConnectionPool] = None,
+        diagnostics: Optional[bool] = None,
+        profile_cache: Optional[ProfileCache] = None,
+        candidate_stats: Optional[CandidateStats] = None,
+        company_ids: Optional[CompanyIds] = None,
+    ):
+        self.diagnostics = DIAGNOSTICS if diagnostics is None else diagnostics
+        # 정확 검색 / ANN 검색 선택용 회사별 문서 수 추정 (프로파일 캐시 확인 시 함께 갱신)
+        self.candidates = CandidateStats() if candidate_stats is None else candidate_stats
+        self.company_ids = CompanyIds() if company_ids is None else company_ids
+        self.pool = pool or create_async_pool()
+        self.profiles = ProfileCache() if profile_cache is None else profile_cache
+        self._profiles_lock: Optional[asyncio.Lock] = None
+
+    async def open(self) -> None:
+        # 이미 열린 풀에 대해 다시 호출해도 안전합니다.
+        await self.pool.open()
+
+    def pool_stats(self) -> dict:
+        return pool_stats(self.pool)
+
+    async def warm_up(self) -> None:
+        """풀을 열어 커넥션을 미리 맺고 프로파일 임베딩 캐시를 채웁니다."""
+        await self.open()
+        async with self.pool.connection() as conn:
+            await self._refresh_profiles(conn)
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+    async def most_similar(
+        self,
+        company_name: str,
+        start_date: Optional[datetime.date] = None,
+        end_date: Optional[datetime.date] = None,
+        top_k: int = 5,
+    ) -> List[Document]:
+        groups = await self.most_similar_many(
+            [SearchRequest(company_name, start_date, end_date, top_k)]
+        )
+        return groups[0]
+
+    async def most_similar_many(self, requests: Sequence[RequestLike]) -> List[List[Document]]:
+        """VectorSearch.most_similar_many 와 동일한 단일 SQL 일괄 검색 (비동기)"""
+        if not requests:
+            return []
+        reqs, unique, params = _prepare(requests)
+
+        if self.pool.closed:
+            await self.open()
+        async with self.pool.connection() as conn:
+            company_ids = await self._company_ids(conn, params[0])
+            vectors = await self._profile_vectors(conn, params[0], company_ids)
+            _require_profiles(unique, vectors)
+
+            async with conn.cursor() as cur:
+                if self.diagnostics:
+                    for r, company_id in zip(unique, company_ids):
+                        await self._log_diagnostics(cur, r.company_name, company_id, r.start_date, r.end_date)
+
+                logger.debug("Executing SQL search")
+                search_params = _search_params(params, company_ids, vectors, self.candidates)
+                await cur.execute(BATCH_SEARCH_SQL, search_params)
+                results = await cur.fetchall()
+                retry, retry_params = _exact_retry(search_params, results)
+                if retry:
+                    await cur.execute(BATCH_SEARCH_SQL, retry_params)
+                    results = _merge_retry(results, retry, await cur.fetchall())
+
+        return _group(reqs, unique, results)
+
+    async def _company_ids(self, conn, company_names: List[str]) -> List[Optional[int]]:
+        company_ids = self.company_ids.lookup(company_names)
+        missing = [n for n, c in zip(company_names, company_ids) if c is None]
+        if missing:
+            async with conn.cursor() as cur:
+                await cur.execute(COMPANY_IDS_SQL, (missing,))
+                self.company_ids.add(await cur.fetchall())
+            company_ids = self.company_ids.lookup(company_names)
+        return company_ids
+
+    async def _profile_vectors(
+        self, conn, company_names: List[str], company_ids: List[Optional[int]]
+    ) -> List[Optional[np.ndarray]]:
+        if self.profiles.due_for_check():
+            await self._refresh_profiles(conn)
+        vectors = self.profiles.lookup(company_ids)
+        if any(v is None for v in vectors) and self.profiles.due_for_check(PROFILE_MISS_RECHECK_INTERVAL):
+            await self._refresh_profiles(conn)
+            vectors = self.profiles.lookup(company_ids)
+        _log_profile_vectors(company_names, vectors)
+        return vectors
+
+    async def _refresh_profiles(self, conn) -> None:
+        # asyncio.Lock 은 이벤트 루프 안에서 생성
+        if self._profiles_lock is None:
+            self._profiles_lock = asyncio.Lock()
+        async with self._profiles_lock, conn.cursor(binary=True) as cur:
+            if self.candidates.due_for_check():
+                await cur.execute(CANDIDATE_STATS_SQL)
+                self.candidates.replace(await cur.fetchall())
+            await cur.execute(PROFILE_VERSION_SQL)
+            version = (await cur.fetchone())[0]
+            if version == self.profiles.version:
+                self.profiles.mark_checked()
+                return
+            await cur.execute(PROFILE_EMBEDDINGS_SQL)
+            self.profiles.replace(version, await cur.fetchall())
+
+    async def _log_diagnostics(
+        self,
+        cur,
+        company_name: str,
+        company_id: int,
+        start_date: Optional[datetime.date],
+        end_date: Optional[datetime.date],
+    ) -> None:
+        await cur.execute(DIAGNOSTICS_TOTAL_SQL)
+        total_docs = (await cur.fetchone())[0]
+        logger.debug("Total non-profile docs in DB: %d", total_docs)
+
+        if start_date is not None and end_date is not None:
+            await cur.execute(DIAGNOSTICS_RANGE_SQL, (company_id, start_date, end_date))
+            in_range = (await cur.fetchone())[0]
             logger.debug(
-                "Row → company=%r, doc_type=%r, content_len=%d, published_at=%r",
-                company, doc_type, len(content), published
+                "Docs for %r published between %s and %s: %d",
+                company_name, start_date, end_date, in_range
             )
-            docs.append(Document(
-                company_name=company,
-                doc_type=doc_type,
-                content=content,
-                published_at=published,
-            ))
-
-        logger.debug("Returning %d Document(s)", len(docs))
-        return docs
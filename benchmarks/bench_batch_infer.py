@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+단건 /infer 반복 호출 vs /infer/batch 의 처리량(candidates/min) 벤치마크 (DB·LLM 없이 실행)
+
+- single : 지원자마다 POST /infer 호출 (변경 전 야간 태깅 방식). --client-concurrency 의 값마다
+           (기본: 순차 1개, INFER_BATCH_CONCURRENCY 개 동시) 측정
+- batch  : --batch-size 명씩 묶어 POST /infer/batch 를 순서대로 호출
+           (배치 안에서 같은 회사·기간 검색은 한 번, LLM 호출은 INFER_BATCH_CONCURRENCY 개까지 동시)
+
+지원자는 example_datas/talent_ex*.json 을 돌려 쓰므로 회사·기간이 지원자 사이에 겹칩니다.
+검색은 호출마다 --search-ms 가 걸리고 커넥션 풀(--pool-size)만큼만 동시에 실행되는 가짜 AsyncVectorSearch,
+LLM 은 --llm-ms 뒤 tests/real_response_ex1.json 을 돌려주는 가짜 클라이언트가 대신하며,
+태그 캐시는 끄고 ASGI 앱을 프로세스 안에서 직접 호출합니다 (프롬프트 토큰화에 tiktoken 인코딩 필요).
+
+    python -m benchmarks.bench_batch_infer --candidates 400 --batch-size 50
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+
+from app.deps import get_async_openai_client, get_async_vector_search, get_tag_cache
+from app.main import app
+from app.services.inference import INFER_BATCH_CONCURRENCY
+from app.services.vector_search import Document
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class FakeVectorSearch:
+    """most_similar_many 호출당 search_ms 가 걸리는 검색. 호출 수와 요청(포지션) 수를 셉니다."""
+
+    def __init__(self, search_ms, pool_size):
+        self.delay = search_ms / 1000
+        self.pool = asyncio.Semaphore(pool_size)
+        self.calls = 0
+        self.requests = 0
+
+    async def most_similar_many(self, requests):
+        self.calls += 1
+        self.requests += len(requests)
+        async with self.pool:
+            await asyncio.sleep(self.delay)
+        return [
+            [Document(r.company_name, "news", f"{r.company_name} 뉴스 {j}", datetime.date(2024, 1, 1), j, 0.1 * j)
+             for j in range(r.top_k)]
+            for r in requests
+        ]
+
+
+class FakeLLM:
+    def __init__(self, llm_ms):
+        self.delay = llm_ms / 1000
+        self.calls = 0
+        content = (ROOT / "tests" / "real_response_ex1.json").read_text(encoding="utf-8")
+        self.resp = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.resp
+
+
+def candidates(n):
+    talents = [json.loads(p.read_text(encoding="utf-8")) for p in sorted((ROOT / "example_datas").glob("talent_ex*.json"))]
+    return [dict(talents[i % len(talents)], headline=f"candidate {i}") for i in range(n)]
+
+
+async def run_single(client, items, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def post(item):
+        async with sem:
+            resp = await client.post("/infer", json=item)
+            assert resp.status_code == 200, resp.text
+
+    await asyncio.gather(*(post(item) for item in items))
+
+
+async def run_batch(client, items, batch_size):
+    for i in range(0, len(items), batch_size):
+        resp = await client.post("/infer/batch", json={"items": items[i:i + batch_size]})
+        assert resp.status_code == 200, resp.text
+        assert all(r["error"] is None for r in resp.json()["results"])
+
+
+async def measure(mode, items, args, concurrency=None):
+    vsearch = FakeVectorSearch(args.search_ms, args.pool_size)
+    llm = FakeLLM(args.llm_ms)
+    app.dependency_overrides[get_async_vector_search] = lambda: vsearch
+    app.dependency_overrides[get_async_openai_client] = lambda: llm
+    app.dependency_overrides[get_tag_cache] = lambda: None
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        t0 = time.perf_counter()
+        if mode == "single":
+            await run_single(client, items, concurrency)
+        else:
+            await run_batch(client, items, args.batch_size)
+        seconds = time.perf_counter() - t0
+
+    label = f"single x{concurrency}" if mode == "single" else f"batch of {args.batch_size}"
+    print(
+        f"{label:<12} {len(items) / seconds * 60:8.0f} candidates/min  ({seconds:.2f}s, "
+        f"search calls={vsearch.calls}, position searches={vsearch.requests}, LLM calls={llm.calls})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=400)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--client-concurrency", default=f"1,{INFER_BATCH_CONCURRENCY}",
+                        help="single 모드의 동시 요청 수 목록")
+    parser.add_argument("--llm-ms", type=float, default=500)
+    parser.add_argument("--search-ms", type=float, default=20)
+    parser.add_argument("--pool-size", type=int, default=10)
+    args = parser.parse_args()
+
+    items = candidates(args.candidates)
+    print(f"{args.candidates} candidates, LLM {args.llm_ms:.0f} ms, search {args.search_ms:.0f} ms/call, "
+          f"batch LLM concurrency {INFER_BATCH_CONCURRENCY}")
+    for concurrency in (int(c) for c in args.client_concurrency.split(",")):
+        asyncio.run(measure("single", items, args, concurrency))
+    asyncio.run(measure("batch", items, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+임베딩 요청 배칭 벤치마크 (로컬 스텁 임베딩 서버 대상, DB·네트워크 불필요)
+
+- before    : 청크마다 embeddings 요청 1회, 순차 실행 (변경 전 embed_docs.py)
+- batched   : 토큰·입력 수 제한 내에서 여러 청크를 한 요청으로 묶음 (워커 1개)
+- concurrent: 배치를 --concurrency 개의 워커로 동시에 전송
+- cold/warm cache: 임시 SQLite 임베딩 캐시를 사용해 같은 문서를 두 번 임베딩 (두 번째는 요청 0회)
+
+example_datas/company_news.csv 의 뉴스(제목 + 링크)를 문서로 사용하며,
+요청당 왕복 지연(--latency-ms)을 주어 docs/sec, tokens/sec, 요청 수를 비교합니다.
+
+    python -m benchmarks.bench_embedding --docs 500 --latency-ms 100 --batch-items 64 --concurrency 4
+"""
+import argparse
+import csv
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import tiktoken
+from openai import OpenAI
+
+from app.services.embedding import EmbeddingBatcher
+from app.services.embedding_cache import EmbeddingCache
+from scripts.stub_embedding_server import serve
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_news(limit):
+    with open(ROOT / "example_datas" / "company_news.csv", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    texts = [f"{r['title']}\n\n{r['original_link']}" for r in rows]
+    # 필요한 만큼 반복해서 문서 수를 맞춤
+    return [texts[i % len(texts)] + ("" if i < len(texts) else f" #{i}") for i in range(limit)]
+
+
+def run(label, client, enc, texts, counters, **limits):
+    before = dict(counters)
+    batcher = EmbeddingBatcher(client, enc, **limits)
+    vectors = batcher.embed(texts)
+    assert len(vectors) == len(texts)
+    print(f"{label:<10} requests={counters['requests'] - before['requests']:<5} {batcher.stats.summary()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--port", type=int, default=18099)
+    parser.add_argument("--batch-tokens", type=int, default=250_000)
+    parser.add_argument("--batch-items", type=int, default=2048)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    server, counters = serve(args.port, args.latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = OpenAI(api_key="stub", base_url=f"http://127.0.0.1:{args.port}/v1")
+    enc = tiktoken.get_encoding("cl100k_base")
+    texts = load_news(args.docs)
+
+    try:
+        run("before", client, enc, texts, counters, batch_max_items=1, concurrency=1)
+        limits = dict(batch_max_tokens=args.batch_tokens, batch_max_items=args.batch_items)
+        run("batched", client, enc, texts, counters, concurrency=1, **limits)
+        run("concurrent", client, enc, texts, counters, concurrency=args.concurrency, **limits)
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EmbeddingCache(os.path.join(tmp, "cache.sqlite"), model="bench")
+            for label in ("cold cache", "warm cache"):
+                run(label, client, enc, texts, counters, concurrency=args.concurrency, cache=cache, **limits)
+            print(f"{'cache':<10} {cache.stats.summary()}")
+            cache.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
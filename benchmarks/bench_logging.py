@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+로깅 모드별 요청당 CPU 시간 부하 테스트 (DB·LLM 없이 InferenceService.run 전체 경로)
+
+- debug-all : DEBUG + 모든 요청 샘플링 (변경 전처럼 행·프롬프트·LLM 응답을 모두 기록)
+- debug     : DEBUG + 기본 샘플링 비율 (LOG_SAMPLE_RATE)
+- info      : INFO (운영 기본값)
+
+검색 결과 행과 LLM 응답은 가짜 커넥션 풀 / 클라이언트가 돌려주며, 로그는 /dev/null 로 버립니다.
+
+    python -m benchmarks.bench_logging --requests 2000
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+import app.logging_config as logging_config
+from app.logging_config import configure_logging
+from app.schemas import DetailedTalentInput
+from app.services.inference import InferenceService, map_service_to_company
+from app.services.profile_cache import ProfileCache
+from app.services.vector_search import VectorSearch
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class FakeCursor:
+    """BATCH_SEARCH_SQL 파라미터를 보고 요청별 top_k 개의 행을 돌려주는 커서"""
+
+    def __init__(self):
+        self._params = None
+
+    def execute(self, query, params=None):
+        self._params = params
+
+    def fetchall(self):
+        names, _, _, top_ks, _ = self._params
+        return [
+            (i + 1, i * 10 + j, name, "news", f"{name} 뉴스 제목 {j}\n\nhttps://news.example.com/{i}/{j}" * 3,
+             datetime.date(2024, 1, 1))
+            for i, (name, k) in enumerate(zip(names, top_ks))
+            for j in range(k)
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class FakeConn:
+    def cursor(self, binary=False):
+        return FakeCursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class FakePool:
+    def connection(self):
+        return FakeConn()
+
+
+def fake_llm(raw):
+    resp = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=raw))])
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kw: resp)))
+
+
+def build_service(payload):
+    names = {map_service_to_company(p.companyName) for p in payload.positions}
+    profiles = ProfileCache(check_interval=float("inf"))
+    rng = np.random.default_rng(0)
+    profiles.replace(1, [(n, rng.normal(size=1536)) for n in names])
+
+    raw = "```json\n" + (ROOT / "tests" / "real_response_ex4.json").read_text(encoding="utf-8") + "\n```"
+    vs = VectorSearch(pool=FakePool(), diagnostics=False, profile_cache=profiles)
+    return InferenceService(llm_client=fake_llm(raw), vector_search=vs)
+
+
+def measure(label, level, sample_rate, svc, payload, n):
+    configure_logging(level=level, force=True)
+    logging.getLogger("app").handlers[0].setStream(open(os.devnull, "w"))
+    logging_config.LOG_SAMPLE_RATE = sample_rate
+
+    for _ in range(50):  # warm-up
+        svc.run(payload)
+    t0 = time.process_time()
+    for _ in range(n):
+        svc.run(payload)
+    cpu_us = (time.process_time() - t0) / n * 1e6
+    print(f"{label:<10} level={level:<5} sample={sample_rate:<5} cpu/request={cpu_us:8.1f}µs")
+    return cpu_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--talent", default="talent_ex4")
+    args = parser.parse_args()
+
+    data = json.loads((ROOT / "example_datas" / f"{args.talent}.json").read_text(encoding="utf-8"))
+    payload = DetailedTalentInput(**data)
+    svc = build_service(payload)
+
+    default_rate = logging_config.LOG_SAMPLE_RATE
+    before = measure("debug-all", "DEBUG", 1.0, svc, payload, args.requests)
+    measure("debug", "DEBUG", default_rate, svc, payload, args.requests)
+    after = measure("info", "INFO", default_rate, svc, payload, args.requests)
+    print(f"CPU saved per request at INFO: {before - after:.1f}µs ({(1 - after / before) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
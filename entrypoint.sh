@@ -12,11 +12,14 @@ echo "▶️ Initializing database schema and indexes..."
 python scripts/init_db.py
 
 echo "▶️ Loading example data..."
-python example_datas/setup_company_data.py
-python example_datas/setup_company_news_data.py
+python -m example_datas.setup_company_data
+python -m example_datas.setup_company_news_data
 
 echo "▶️ Embedding documents..."
-python scripts/embed_docs.py
+python -m scripts.embed_docs
+
+echo "▶️ Building ANN index on the loaded embeddings..."
+python -m scripts.manage_index build
 
 echo "▶️ Starting FastAPI server..."
 exec uvicorn app.main:app --host 0.0.0.0 --port 9000
@@ -4,10 +4,11 @@ import json
 import glob
 import logging
 
-import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+import psycopg
 from dotenv import load_dotenv
 
+from app.services.bulk_load import bulk_load_companies
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -30,17 +31,17 @@ DB_CONFIG = {
 def connect_to_db():
     """데이터베이스에 연결"""
     try:
-        conn = psycopg2.connect(
+        conn = psycopg.connect(
             host=DB_CONFIG["host"],
             port=DB_CONFIG["port"],
             user=DB_CONFIG["user"],
             password=DB_CONFIG["password"],
-            database=DB_CONFIG["database"],
+            dbname=DB_CONFIG["database"],
+            autocommit=True,
         )
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
         logger.info(f"성공적으로 {DB_CONFIG['database']} 데이터베이스에 연결했습니다.")
         return conn
-    except psycopg2.Error as e:
+    except psycopg.Error as e:
         logger.error(f"데이터베이스 연결 오류: {e}")
         raise
 
@@ -78,7 +79,12 @@ def create_company_table(conn):
                 logger.info(
                     "company 테이블이 이미 존재합니다. 테이블 생성을 건너뜁니다."
                 )
-    except psycopg2.Error as e:
+
+            # 벌크 적재의 ON CONFLICT (name) 병합에 필요한 유니크 인덱스
+            cursor.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_company_name ON company (name)"
+            )
+    except psycopg.Error as e:
         logger.error(f"테이블 생성 오류: {e}")
         raise
 
@@ -96,31 +102,27 @@ def load_company_data(file_path):
         return None, None
 
 
-def insert_company_data(conn, name, data):
-    """회사 데이터를 데이터베이스에 삽입"""
+def insert_company_data(conn, companies):
+    """
+    회사 데이터를 데이터베이스에 삽입
+    COPY 로 스테이징한 뒤 한 번의 INSERT ... ON CONFLICT 로 병합하며, 이미 존재하는 회사는 건너뜁니다.
+    """
     try:
-        with conn.cursor() as cursor:
-            # 이미 존재하는지 확인
-            cursor.execute("SELECT COUNT(*) FROM company WHERE name = %s", (name,))
-            count = cursor.fetchone()[0]
+        result = bulk_load_companies(conn, companies)
+        if result.skipped:
+            logger.info(f"이미 존재하는 {result.skipped}개 회사의 삽입을 건너뛰었습니다.")
+        return result.inserted
+    except psycopg.Error as e:
+        logger.error(f"데이터 삽입 오류: {e}")
+        return 0
 
-            if count > 0:
-                logger.info(
-                    f"회사 '{name}'의 데이터가 이미 존재합니다. 삽입을 건너뜁니다."
-                )
-                return False
 
-            # 데이터 삽입
-            cursor.execute(
-                "INSERT INTO company (name, data) VALUES (%s, %s)",
-                (name, json.dumps(data)),
-            )
-            logger.info(f"회사 '{name}'의 데이터가 성공적으로 삽입되었습니다.")
-            return True
-    except psycopg2.Error as e:
-        logger.error(f"데이터 삽입 오류: {e}")
-        conn.rollback()
-        return False
+def iter_company_files(company_files):
+    """유효한 회사 데이터 파일에서 (회사명, 데이터) 를 차례로 생성"""
+    for file_path in company_files:
+        company_name, company_data = load_company_data(file_path)
+        if company_name and company_data:
+            yield company_name, company_data
 
 
 def main():
@@ -139,12 +141,7 @@ def main():
         logger.info(f"{len(company_files)}개의 회사 데이터 파일을 찾았습니다.")
 
         # 데이터 처리 및 삽입
-        success_count = 0
-        for file_path in sorted(company_files):
-            company_name, company_data = load_company_data(file_path)
-            if company_name and company_data:
-                if insert_company_data(conn, company_name, company_data):
-                    success_count += 1
+        success_count = insert_company_data(conn, iter_company_files(sorted(company_files)))
 
         logger.info(f"총 {success_count}개의 회사 데이터가 성공적으로 삽입되었습니다.")
 
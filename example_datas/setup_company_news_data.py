@@ -5,8 +5,9 @@ import logging
 from datetime import datetime
 from dotenv import load_dotenv
 
-import psycopg2
-from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+import psycopg
+
+from app.services.bulk_load import bulk_load_news
 
 
 logging.basicConfig(
@@ -31,17 +32,17 @@ DB_CONFIG = {
 def connect_to_db():
     """데이터베이스에 연결"""
     try:
-        conn = psycopg2.connect(
+        conn = psycopg.connect(
             host=DB_CONFIG["host"],
             port=DB_CONFIG["port"],
             user=DB_CONFIG["user"],
             password=DB_CONFIG["password"],
-            database=DB_CONFIG["database"],
+            dbname=DB_CONFIG["database"],
+            autocommit=True,
         )
-        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
         logger.info(f"성공적으로 {DB_CONFIG['database']} 데이터베이스에 연결했습니다.")
         return conn
-    except psycopg2.Error as e:
+    except psycopg.Error as e:
         logger.error(f"데이터베이스 연결 오류: {e}")
         raise
 
@@ -82,14 +83,25 @@ def create_company_news_table(conn):
                 logger.info(
                     "company_news 테이블이 이미 존재합니다. 테이블 생성을 건너뜁니다."
                 )
-    except psycopg2.Error as e:
+
+            # 벌크 적재의 ON CONFLICT (company_id, title, news_date) 병합에 필요한 유니크 인덱스
+            cursor.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_company_news_unique
+                    ON company_news (company_id, title, news_date)
+                """
+            )
+    except psycopg.Error as e:
         logger.error(f"테이블 생성 오류: {e}")
         raise
 
 
 def load_news_data(filename):
-    """뉴스 데이터 CSV 파일 불러오기"""
-    news_data = []
+    """
+    뉴스 데이터 CSV 파일 불러오기
+    파일 전체를 메모리에 올리지 않도록 한 행씩 읽어 생성하는 제너레이터입니다.
+    """
+    loaded = 0
     base_dir = os.path.dirname(__file__)
     file_path = os.path.join(base_dir, filename)
     try:
@@ -103,105 +115,62 @@ def load_news_data(filename):
                     day = int(row["day"])
                     news_date = datetime(year, month, day).strftime("%Y-%m-%d")
 
-                    news_data.append(
-                        {
-                            "company_name": row["name"],
-                            "title": row["title"],
-                            "original_link": row["original_link"],
-                            "news_date": news_date,
-                        }
-                    )
+                    news = {
+                        "company_name": row["name"],
+                        "title": row["title"],
+                        "original_link": row["original_link"],
+                        "news_date": news_date,
+                    }
                 except (ValueError, KeyError) as e:
                     logger.error(f"데이터 행 처리 오류: {e}, 행: {row}")
                     continue
 
-            logger.info(f"{len(news_data)}개의 뉴스 데이터를 로드했습니다.")
-            return news_data
+                loaded += 1
+                yield news
+
+            logger.info(f"{loaded}개의 뉴스 데이터를 로드했습니다.")
     except FileNotFoundError as e:
         logger.error(f"파일 로드 오류 ({file_path}): {e}")
-        return []
 
 
-def get_company_map(conn):
-    """회사 이름을 ID로 매핑하는 딕셔너리 생성"""
+def has_companies(conn):
+    """company 테이블에 회사가 하나라도 있는지 확인"""
     try:
-        company_map = {}
         with conn.cursor() as cursor:
-            cursor.execute("SELECT id, name FROM company")
-            for company_id, company_name in cursor.fetchall():
-                company_map[company_name] = company_id
-
-        logger.info(f"{len(company_map)}개의 회사 매핑을 로드했습니다.")
-        return company_map
-    except psycopg2.Error as e:
-        logger.error(f"회사 매핑 로드 오류: {e}")
-        return {}
-
-
-def insert_news_data(conn, news_data, company_map):
-    """뉴스 데이터를 데이터베이스에 삽입"""
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM company)")
+            return cursor.fetchone()[0]
+    except psycopg.Error as e:
+        logger.error(f"회사 정보 확인 오류: {e}")
+        return False
+
+
+def insert_news_data(conn, news_data):
+    """
+    뉴스 데이터를 데이터베이스에 삽입
+    COPY 로 스테이징한 뒤 회사 ID 매핑과 중복 제거를 한 번의 INSERT ... ON CONFLICT 로 처리합니다.
+    news_data 는 이터러블이면 되며, 읽는 대로 COPY 로 흘려보냅니다.
+    """
     try:
-        inserted_count = 0
-        skipped_count = 0
-        missing_company_count = 0
-
-        with conn.cursor() as cursor:
-            for news in news_data:
-                company_name = news["company_name"]
-
-                # 회사 ID 찾기
-                if company_name not in company_map:
-                    missing_company_count += 1
-                    logger.warning(
-                        f"회사 '{company_name}'가 데이터베이스에 존재하지 않습니다. 해당 뉴스를 건너뜁니다."
-                    )
-                    continue
-
-                company_id = company_map[company_name]
-
-                # 중복 확인
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) FROM company_news 
-                    WHERE company_id = %s AND title = %s AND news_date = %s
-                    """,
-                    (company_id, news["title"], news["news_date"]),
-                )
-                count = cursor.fetchone()[0]
-
-                if count > 0:
-                    skipped_count += 1
-                    continue
-
-                # 데이터 삽입
-                cursor.execute(
-                    """
-                    INSERT INTO company_news (company_id, title, original_link, news_date) 
-                    VALUES (%s, %s, %s, %s)
-                    """,
-                    (
-                        company_id,
-                        news["title"],
-                        news["original_link"],
-                        news["news_date"],
-                    ),
-                )
-                inserted_count += 1
-
-                # 로깅 (100개마다)
-                if inserted_count % 100 == 0:
-                    logger.info(f"{inserted_count}개의 뉴스 데이터가 삽입되었습니다.")
+        result = bulk_load_news(
+            conn,
+            (
+                (news["company_name"], news["title"], news["original_link"], news["news_date"])
+                for news in news_data
+            ),
+        )
+        if not result.staged:
+            logger.error("뉴스 데이터를 로드하지 못했습니다.")
+            return 0
 
-        logger.info(f"총 {inserted_count}개의 뉴스 데이터가 삽입되었습니다.")
-        logger.info(f"중복으로 {skipped_count}개의 데이터가 건너뛰어졌습니다.")
+        logger.info(f"총 {result.inserted}개의 뉴스 데이터가 삽입되었습니다.")
+        logger.info(f"중복으로 {result.skipped}개의 데이터가 건너뛰어졌습니다.")
         logger.info(
-            f"존재하지 않는 회사로 인해 {missing_company_count}개의 데이터가 건너뛰어졌습니다."
+            f"존재하지 않는 회사로 인해 {result.missing}개의 데이터가 건너뛰어졌습니다."
         )
 
-        return inserted_count
-    except psycopg2.Error as e:
+        return result.inserted
+    except psycopg.Error as e:
         logger.error(f"데이터 삽입 오류: {e}")
-        conn.rollback()
         return 0
 
 
@@ -214,20 +183,13 @@ def main():
         # company_news 테이블 생성
         create_company_news_table(conn)
 
-        # 회사 매핑 가져오기
-        company_map = get_company_map(conn)
-        if not company_map:
+        # 회사 정보가 있는지 확인 (회사명 매칭은 삽입 시 DB 에서 처리)
+        if not has_companies(conn):
             logger.error("회사 정보를 가져오지 못했습니다. 프로세스를 중단합니다.")
             return
 
-        # 뉴스 데이터 로드
-        news_data = load_news_data("company_news.csv")
-        if not news_data:
-            logger.error("뉴스 데이터를 로드하지 못했습니다. 프로세스를 중단합니다.")
-            return
-
-        # 데이터 삽입
-        insert_news_data(conn, news_data, company_map)
+        # 뉴스 데이터를 읽는 대로 삽입
+        insert_news_data(conn, load_news_data("company_news.csv"))
 
     except Exception as e:
         logger.error(f"예상치 못한 오류가 발생했습니다: {e}")
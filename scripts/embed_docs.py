@@ -1,118 +1,314 @@
+"""
+Embed new and changed company profiles and news into company_docs.
+
+Batching, rate limits, retries, checkpoints and the local embedding cache are
+described in the README (embedding pipeline section).
+
+    python -m scripts.embed_docs [--concurrency N] [--rpm N] [--tpm N] [--checkpoint PATH]
+    python -m scripts.embed_docs --refresh-profiles    # re-embed every profile
+    python -m scripts.embed_docs --no-cache            # bypass the local embedding cache
+
+Point OPENAI_BASE_URL at scripts/stub_embedding_server.py to run offline.
+"""
 import os
 import json
+import hashlib
+import argparse
+from itertools import islice
+
 import psycopg
 import tiktoken
 from openai import OpenAI
 from dotenv import load_dotenv
-import hashlib  # for computing content_hash
-from datetime import date
+from pgvector.psycopg import register_vector
+
+from app.services.bulk_load import bulk_load_docs
+from app.services.embedding import (
+    EMBED_BATCH_MAX_ITEMS,
+    EMBED_BATCH_MAX_TOKENS,
+    EMBED_CONCURRENCY,
+    EMBED_MAX_INPUT_TOKENS,
+    EMBED_MAX_RETRIES,
+    EMBED_POOLING,
+    EMBED_RPM,
+    EMBED_TPM,
+    EMBEDDING_MODEL,
+    EmbeddingBatcher,
+    EmbeddingCheckpoint,
+    POOLING_STRATEGIES,
+    RateLimiter,
+)
+from app.services.embedding_cache import EMBED_CACHE_PATH, EmbeddingCache
+from app.services.profile_text import profile_text
 
 # Load environment variables
 load_dotenv()
 
-db_url = os.getenv("DATABASE_URL")
-client = OpenAI()
+# Rows inserted (and checkpointed) at a time while embedding results arrive
+FLUSH_ROWS = 200
+# Rows fetched per round trip from the server-side cursors
+FETCH_ROWS = 1000
+# Docs held in memory (texts, chunks, vectors) per embedding window
+WINDOW_DOCS = int(os.getenv("EMBED_WINDOW_DOCS", "5000"))
+
+
+# Profile content is the company's JSONB data rendered by Postgres, so changed
+# profiles are found by comparing hashes in SQL without shipping unchanged data
+CURRENT_PROFILE = """
+    EXISTS (
+        SELECT 1
+          FROM company_docs cd
+         WHERE cd.company_id   = c.id
+           AND cd.doc_type     = 'profile'
+           AND cd.content_hash = md5(c.data::text)
+    )
+"""
+
+UNCHANGED_PROFILES_SQL = f"SELECT COUNT(*) FROM company c WHERE {CURRENT_PROFILE}"
+
+ALL_PROFILES_SQL = """
+    SELECT c.id
+         , c.name
+         , c.data::text
+         , EXISTS (
+               SELECT 1
+                 FROM company_docs cd
+                WHERE cd.company_id = c.id
+                  AND cd.doc_type   = 'profile'
+           ) AS has_profile
+      FROM company c
+"""
+
+PENDING_PROFILES_SQL = f"{ALL_PROFILES_SQL} WHERE NOT {CURRENT_PROFILE}"
+
+PENDING_NEWS_SQL = """
+    SELECT cn.company_id
+         , cn.title
+         , cn.original_link
+         , cn.news_date
+    FROM company_news cn
+    LEFT JOIN company_docs cd
+      ON cd.company_id   = cn.company_id
+     AND cd.doc_type     = 'news'
+     AND cd.content_hash = md5(cn.title || '\n\n' || cn.original_link)
+    WHERE cd.id IS NULL
+"""
+
+
+def stream(conn, name, query):
+    """
+    Iterate a query through a named server-side cursor, FETCH_ROWS rows at a
+    time. WITH HOLD keeps the cursor open on the autocommit connection while
+    other statements (the bulk loads) run in between fetches.
+    """
+    with conn.cursor(name=name, withhold=True) as cur:
+        cur.itersize = FETCH_ROWS
+        cur.execute(query)
+        yield from cur
+
+
+def pending_profiles(conn, refresh=False):
+    """
+    Companies whose profile is missing or stale (every company with refresh):
+    (company_id, name, content, has_profile).
+    """
+    return stream(conn, "pending_profiles", ALL_PROFILES_SQL if refresh else PENDING_PROFILES_SQL)
+
 
-# Connect to Postgres
-conn = psycopg.connect(db_url, autocommit=True)
+def compact_profiles(profiles, encoder, saved):
+    """
+    Add the compact embedding text to each profile:
+    (company_id, name, content, has_profile, text). Prints the tokens saved per profile
+    compared with embedding the raw JSON and accumulates them in saved.
+    """
+    for company_id, name, content, has_profile in profiles:
+        text = profile_text(json.loads(content))
+        raw_tokens, text_tokens = len(encoder.encode(content)), len(encoder.encode(text))
+        saved["raw"] += raw_tokens
+        saved["text"] += text_tokens
+        print(f"  {name}: {raw_tokens} → {text_tokens} tokens ({raw_tokens - text_tokens} saved)")
+        yield company_id, name, content, has_profile, text
 
-# Tokenizer setup for embedding chunking
-enc = tiktoken.get_encoding("cl100k_base")
-MAX_TOKENS = 8000
 
-def chunk_text(text, max_tokens=MAX_TOKENS):
+def pending_news(conn):
     """
-    Split text into chunks not exceeding max_tokens tokens each.
+    News rows without an embedding yet: (company_id, content, news_date).
     """
-    tokens = enc.encode(text)
-    for i in range(0, len(tokens), max_tokens):
-        yield enc.decode(tokens[i : i + max_tokens])
-
-with conn.cursor() as cur:
-    # Prepare a mapping from company_id to company_name
-    cur.execute("SELECT id, name FROM company;")
-    company_map = {row[0]: row[1] for row in cur.fetchall()}
-
-    # 1) Process only unembedded company profiles
-    cur.execute("SELECT name, data FROM company;")
-    for name, data in cur.fetchall():
-        # Skip if profile embedding already exists
-        cur.execute(
-            """
-            SELECT 1
-              FROM company_docs
-             WHERE company_name = %s
-               AND doc_type     = 'profile'
-            """,
-            (name,)
+    rows = stream(conn, "pending_news", PENDING_NEWS_SQL)
+    return ((company_id, f"{title}\n\n{link}", news_date) for company_id, title, link, news_date in rows)
+
+
+def content_hash(text):
+    """
+    Same value as the company_docs.content_hash generated column.
+    """
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def embed_and_insert(
+    cur, batcher, checkpoint, docs, text_of, row_of, label,
+    window=WINDOW_DOCS, replace=False, on_flush=None,
+):
+    """
+    Embed docs concurrently and insert them as they complete, flushing every
+    FLUSH_ROWS rows so an interrupted run loses at most the in-flight work.
+    Documents that still fail after retries are recorded in the checkpoint and
+    skipped; the rest of the run continues. docs may be any iterable; it is
+    consumed `window` docs at a time. With replace=True each flush replaces
+    the existing docs of the same company and doc_type; on_flush receives the
+    docs loaded by each flush.
+    """
+    docs = iter(docs)
+    buffer, failed, inserted = [], {}, 0
+
+    def flush():
+        nonlocal buffer, failed, inserted
+        if buffer:
+            rows = (row_of(d, vec) for d, vec in buffer)
+            inserted += bulk_load_docs(cur.connection, rows, replace=replace).inserted
+            if on_flush is not None:
+                on_flush([d for d, _ in buffer])
+        checkpoint.record(
+            done=len(buffer),
+            failed=failed,
+            succeeded=[content_hash(text_of(d)) for d, _ in buffer],
         )
-        if cur.fetchone():
+        print(f"{label} → {inserted} inserted, {len(checkpoint.failed)} failed")
+        buffer, failed = [], {}
+
+    while batch := list(islice(docs, window)):
+        texts = [text_of(d) for d in batch]
+        for result in batcher.embed_iter(texts):
+            if result.vector is None:
+                failed[content_hash(texts[result.index])] = result.error
+            else:
+                buffer.append((batch[result.index], result.vector))
+            if len(buffer) + len(failed) >= FLUSH_ROWS:
+                flush()
+        flush()
+    return inserted
+
+
+def skip_failed(docs, text_of, checkpoint, retry_failed):
+    if retry_failed or not checkpoint.failed:
+        yield from docs
+        return
+    previous, skipped = set(checkpoint.failed), 0
+    for d in docs:
+        if content_hash(text_of(d)) in previous:
+            skipped += 1
             continue
+        yield d
+    if skipped:
+        print(f"Skipped {skipped} doc(s) that failed in a previous run (use --retry-failed)")
 
-        content = json.dumps(data, ensure_ascii=False)
-        chunks = list(chunk_text(content))
-        embeddings = []
-        for chunk in chunks:
-            resp = client.embeddings.create(
-                input=chunk,
-                model="text-embedding-ada-002"
-            )
-            embeddings.append(resp.data[0].embedding)
-        avg_emb = [sum(vals) / len(vals) for vals in zip(*embeddings)]
-
-        cur.execute(
-            """
-            INSERT INTO company_docs (company_name, doc_type, content, embedding)
-            VALUES (%s, 'profile', %s, %s)
-            """,
-            (name, content, avg_emb)
-        )
-        print(f"Profile → {name} ({len(chunks)} chunk(s))")
-
-    # 2) Process only unembedded company news, now pulling news_date too
-    cur.execute(
-        """
-        SELECT cn.company_id
-             , cn.title
-             , cn.original_link
-             , cn.news_date      -- ← 추가
-        FROM company_news cn
-        JOIN company c
-          ON c.id = cn.company_id
-        LEFT JOIN company_docs cd
-          ON cd.company_name = c.name
-         AND cd.doc_type     = 'news'
-         AND cd.content_hash = md5(cn.title || '\n\n' || cn.original_link)
-        WHERE cd.company_name IS NULL
-        """
+
+def embed_profiles(cur, batcher, checkpoint, retry_failed=False, window=WINDOW_DOCS, refresh=False):
+    """
+    Embed new and changed company profiles; unchanged ones are not touched
+    unless refresh is set. A changed profile's old row is replaced only once
+    its new embedding is loaded, so a failed re-embed keeps serving the
+    previous one.
+    """
+    unchanged = 0 if refresh else cur.execute(UNCHANGED_PROFILES_SQL).fetchone()[0]
+    counts = {"refreshed": 0, "added": 0}
+    saved = {"raw": 0, "text": 0}
+
+    def tally(loaded):
+        for _, _, _, has_profile, _ in loaded:
+            counts["refreshed" if has_profile else "added"] += 1
+
+    text_of = lambda d: d[4]
+    profiles = compact_profiles(pending_profiles(cur.connection, refresh), batcher.encoder, saved)
+    profiles = skip_failed(profiles, text_of, checkpoint, retry_failed)
+    embed_and_insert(
+        cur, batcher, checkpoint, profiles, text_of,
+        lambda d, vec: (d[0], "profile", d[2], vec, None),
+        "Profiles",
+        window,
+        replace=True,
+        on_flush=tally,
     )
-    for comp_id, title, link, news_date in cur.fetchall():
-        company_name = company_map.get(comp_id, "Unknown")
-        text = f"{title}\n\n{link}"
-
-        # Compute content_hash the same way as table does
-        content_hash = hashlib.md5(text.encode('utf-8')).hexdigest()
-
-        chunks = list(chunk_text(text))
-        embeddings = []
-        for chunk in chunks:
-            resp = client.embeddings.create(
-                input=chunk,
-                model="text-embedding-ada-002"
+    print(
+        f"Profiles: {unchanged} unchanged (skipped), "
+        f"{counts['refreshed']} refreshed, {counts['added']} added; "
+        f"profile text {saved['text']} tokens vs {saved['raw']} as raw JSON "
+        f"({saved['raw'] - saved['text']} saved)"
+    )
+
+    # Invalidate the API's in-memory profile cache
+    inserted = counts["refreshed"] + counts["added"]
+    if inserted:
+        cur.execute("SELECT nextval('profile_embedding_version')")
+    return inserted
+
+
+def embed_news(cur, batcher, checkpoint, retry_failed=False, window=WINDOW_DOCS):
+    text_of = lambda d: d[1]
+    news = skip_failed(pending_news(cur.connection), text_of, checkpoint, retry_failed)
+    return embed_and_insert(
+        cur, batcher, checkpoint, news, text_of,
+        lambda d, vec: (d[0], "news", d[1], vec, d[2]),
+        "News",
+        window,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed company profiles and news into company_docs")
+    parser.add_argument("--max-input-tokens", type=int, default=EMBED_MAX_INPUT_TOKENS)
+    parser.add_argument("--batch-tokens", type=int, default=EMBED_BATCH_MAX_TOKENS)
+    parser.add_argument("--batch-items", type=int, default=EMBED_BATCH_MAX_ITEMS)
+    parser.add_argument("--concurrency", type=int, default=EMBED_CONCURRENCY)
+    parser.add_argument("--rpm", type=int, default=EMBED_RPM, help="requests per minute budget (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, default=EMBED_TPM, help="tokens per minute budget (0 = unlimited)")
+    parser.add_argument("--max-retries", type=int, default=EMBED_MAX_RETRIES)
+    parser.add_argument("--window", type=int, default=WINDOW_DOCS, help="docs embedded per in-memory window")
+    parser.add_argument("--checkpoint", default=os.getenv("EMBED_CHECKPOINT", ".embed_checkpoint.json"))
+    parser.add_argument("--retry-failed", action="store_true", help="retry docs that failed in a previous run")
+    parser.add_argument("--refresh-profiles", action="store_true", help="re-embed every profile, changed or not")
+    parser.add_argument("--pooling", choices=POOLING_STRATEGIES, default=EMBED_POOLING, help="chunk vector pooling")
+    parser.add_argument("--cache", default=EMBED_CACHE_PATH, help="local embedding cache file (empty = disabled)")
+    parser.add_argument("--no-cache", dest="cache", action="store_const", const="", help="disable the embedding cache")
+    args = parser.parse_args()
+
+    checkpoint = EmbeddingCheckpoint(args.checkpoint)
+    # Chunks already embedded with this model (in any previous run) are served locally
+    cache = EmbeddingCache(args.cache, model=EMBEDDING_MODEL) if args.cache else None
+    batcher = EmbeddingBatcher(
+        # Retries are handled by the batcher (backoff with jitter + rate limiter)
+        OpenAI(max_retries=0),
+        # Tokenizer used for chunking and batch packing
+        tiktoken.get_encoding("cl100k_base"),
+        max_input_tokens=args.max_input_tokens,
+        batch_max_tokens=args.batch_tokens,
+        batch_max_items=args.batch_items,
+        concurrency=args.concurrency,
+        rate_limiter=RateLimiter(args.rpm, args.tpm),
+        max_retries=args.max_retries,
+        pooling=args.pooling,
+        cache=cache,
+    )
+
+    with psycopg.connect(os.getenv("DATABASE_URL"), autocommit=True) as conn:
+        # Send embeddings as float32 NumPy arrays over the binary protocol
+        register_vector(conn)
+        with conn.cursor() as cur:
+            # 1) Process only unembedded company profiles
+            n_profiles = embed_profiles(
+                cur, batcher, checkpoint, args.retry_failed, args.window, args.refresh_profiles
             )
-            embeddings.append(resp.data[0].embedding)
-        avg_emb = [sum(vals) / len(vals) for vals in zip(*embeddings)]
-
-        cur.execute(
-            """
-            INSERT INTO company_docs
-              (company_name, doc_type, content, embedding, published_at)
-            VALUES
-              (%s, 'news', %s, %s, %s)     -- ← published_at 추가
-            ON CONFLICT (company_name, doc_type, content_hash) DO NOTHING;
-            """,
-            (company_name, text, avg_emb, news_date)
-        )
-        print(f"News → {company_name} ({len(chunks)} chunk(s))")
+            # 2) Process only unembedded company news
+            n_news = embed_news(cur, batcher, checkpoint, args.retry_failed, args.window)
+
+    print(f"✅ Embedding insertion complete ({n_profiles} profiles, {n_news} news)")
+    print(f"Throughput: {batcher.stats.summary()}")
+    if cache is not None:
+        print(f"Embedding cache ({args.cache}): {cache.stats.summary()}")
+        cache.close()
+    if checkpoint.failed:
+        print(f"⚠️ {len(checkpoint.failed)} doc(s) failed; see {args.checkpoint}")
+
 
-print("✅ Embedding insertion complete")
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,9 @@ print(f"Connecting to database: {db_url}")
 
 # Establish a connection to PostgreSQL with autocommit enabled
 with psycopg.connect(db_url, autocommit=True) as conn:
+    # Surface RAISE NOTICE output from the migration steps (not the
+    # "already exists, skipping" notices)
+    conn.add_notice_handler(lambda diag: diag.sqlstate == "00000" and print(diag.message_primary))
     with conn.cursor() as cur:
         cur.execute("""
         -- 1) Enable the pgvector extension if not already present
@@ -37,23 +40,107 @@ with psycopg.connect(db_url, autocommit=True) as conn:
           news_date     DATE        NOT NULL
         );
 
-        -- 4) Create the 'company_docs' table
+        -- 4) Create the 'company_docs' table, keyed by company id (a rename
+        --    does not orphan docs) with doc_type as a 4-byte enum
+        DO $$
+        BEGIN
+          IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'doc_type') THEN
+            CREATE TYPE doc_type AS ENUM ('profile', 'news');
+          END IF;
+        END $$;
+
         CREATE TABLE IF NOT EXISTS company_docs (
           id           SERIAL PRIMARY KEY,
-          company_name TEXT                  NOT NULL,
-          doc_type     TEXT                  NOT NULL,
+          company_id   INTEGER               NOT NULL
+                        REFERENCES company(id) ON DELETE CASCADE,
+          doc_type     doc_type              NOT NULL,
           content      TEXT                  NOT NULL,
           embedding    VECTOR(1536),
           content_hash TEXT GENERATED ALWAYS AS (md5(content)) STORED,
           published_at DATE
         );
 
-        -- 5) Create an index on the embedding column for vector similarity search
-        CREATE INDEX IF NOT EXISTS idx_company_docs_embedding
-          ON company_docs USING ivfflat (embedding vector_cosine_ops);
+        -- 4b) Migrate a company_docs created before company_id: resolve names
+        --     to ids once, drop docs whose company no longer exists, and drop
+        --     the name-keyed indexes (recreated on company_id below; rebuild
+        --     the ANN index afterwards with scripts.manage_index build)
+        DO $$
+        DECLARE
+          orphans BIGINT;
+        BEGIN
+          IF EXISTS (SELECT 1 FROM information_schema.columns
+                      WHERE table_schema = current_schema()
+                        AND table_name   = 'company_docs'
+                        AND column_name  = 'company_name') THEN
+            DROP INDEX IF EXISTS idx_company_docs_news_full, idx_company_docs_company_published,
+                                 idx_company_docs_profile, idx_company_docs_embedding;
+            ALTER TABLE company_docs
+              ADD COLUMN company_id INTEGER REFERENCES company(id) ON DELETE CASCADE;
+            UPDATE company_docs d SET company_id = c.id FROM company c WHERE c.name = d.company_name;
+            DELETE FROM company_docs WHERE company_id IS NULL;
+            GET DIAGNOSTICS orphans = ROW_COUNT;
+            RAISE NOTICE 'company_docs migrated to company_id (% orphaned docs removed)', orphans;
+            ALTER TABLE company_docs
+              ALTER COLUMN company_id SET NOT NULL,
+              ALTER COLUMN doc_type TYPE doc_type USING doc_type::doc_type,
+              DROP COLUMN company_name;
+          END IF;
+        END $$;
+
+        -- 5) The ANN index on company_docs.embedding is built after the data
+        --    is loaded (python -m scripts.manage_index build): IVFFlat trained
+        --    on an empty table has useless centroids.
 
-        -- 6) Ensure uniqueness of (company_name, doc_type, content_hash)
+        -- 6) Ensure uniqueness of (company_id, doc_type, content_hash)
         CREATE UNIQUE INDEX IF NOT EXISTS idx_company_docs_news_full
-          ON company_docs (company_name, doc_type, content_hash);
+          ON company_docs (company_id, doc_type, content_hash);
+
+        -- 7) Version stamp for profile embeddings (bumped by embed_docs.py,
+        --    polled by the API's in-memory profile cache)
+        CREATE SEQUENCE IF NOT EXISTS profile_embedding_version;
+
+        -- 8) Natural keys used by the bulk loaders' INSERT ... ON CONFLICT merge
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_company_name
+          ON company (name);
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_company_news_unique
+          ON company_news (company_id, title, news_date);
+
+        -- 9) Partial indexes for the per-company similarity search: the
+        --    exact path scans one company's non-profile docs (optionally by
+        --    date), and the API's profile cache reads profiles in
+        --    (company_id, id) order
+        CREATE INDEX IF NOT EXISTS idx_company_docs_company_published
+          ON company_docs (company_id, published_at) WHERE doc_type <> 'profile';
+        CREATE INDEX IF NOT EXISTS idx_company_docs_profile
+          ON company_docs (company_id, id) WHERE doc_type = 'profile';
+        ANALYZE company_docs;
+
+        -- 10) Tagging jobs (POST /jobs): each item keeps its input resume and,
+        --     once processed, the result or error, so workers resume from the
+        --     first unfinished item after a restart. A running job whose
+        --     updated_at is older than JOB_LEASE_SECONDS is picked up again.
+        CREATE TABLE IF NOT EXISTS tag_job (
+          id          UUID        PRIMARY KEY,
+          status      TEXT        NOT NULL DEFAULT 'loading',  -- loading | queued | running | done
+          total       INTEGER     NOT NULL DEFAULT 0,
+          completed   INTEGER     NOT NULL DEFAULT 0,
+          failed      INTEGER     NOT NULL DEFAULT 0,
+          created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+          updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+          finished_at TIMESTAMPTZ
+        );
+        CREATE TABLE IF NOT EXISTS tag_job_item (
+          job_id UUID    NOT NULL REFERENCES tag_job(id) ON DELETE CASCADE,
+          idx    INTEGER NOT NULL,
+          input  JSONB   NOT NULL,
+          result JSONB,
+          error  TEXT,
+          done   BOOLEAN NOT NULL DEFAULT false,
+          PRIMARY KEY (job_id, idx)
+        );
+        CREATE INDEX IF NOT EXISTS idx_tag_job_item_pending
+          ON tag_job_item (job_id, idx) WHERE NOT done;
+        CREATE INDEX IF NOT EXISTS idx_tag_job_open
+          ON tag_job (created_at) WHERE status IN ('queued', 'running');
         """)
         print("Schema and indexes have been successfully created or verified.")
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Build, inspect and drop the ANN index on company_docs.embedding.
+
+The index has to be built after the bulk load: IVFFlat trains its list
+centroids on the rows present at build time (an index created on an empty
+table has useless centroids), and building HNSW once over loaded data is much
+faster than maintaining it row by row. `build` sizes IVFFlat `lists` from the
+current row count, builds the new index CONCURRENTLY under a temporary name
+and swaps it in, so searches never run without an index. Rerun it after large
+loads.
+
+    python -m scripts.manage_index build [--method hnsw|ivfflat] [--lists N] [--m N] [--ef-construction N]
+    python -m scripts.manage_index status
+    python -m scripts.manage_index drop
+
+Query-time recall/speed is tuned with VECTOR_IVFFLAT_PROBES / VECTOR_HNSW_EF_SEARCH
+(applied to every pooled connection, see app/db.py); compare the options with
+benchmarks/bench_ann_index.py.
+"""
+import os
+import time
+import argparse
+
+import psycopg
+from dotenv import load_dotenv
+
+from app.services.ann_index import (
+    ANN_INDEX_METHOD,
+    ANN_INDEX_NAME,
+    ANN_INDEX_WHERE,
+    HNSW_EF_CONSTRUCTION,
+    HNSW_M,
+    INDEX_METHODS,
+    index_ddl,
+    ivfflat_lists,
+    ivfflat_probes,
+)
+
+# Load environment variables
+load_dotenv()
+
+TABLE = "company_docs"
+BUILD_NAME = f"{ANN_INDEX_NAME}_build"
+
+ROWS_SQL = f"SELECT COUNT(*) FROM {TABLE} WHERE embedding IS NOT NULL AND {ANN_INDEX_WHERE}"
+INDEX_INFO_SQL = """
+    SELECT am.amname, pg_get_indexdef(i.indexrelid), pg_relation_size(i.indexrelid),
+           c.reloptions, i.indisvalid
+      FROM pg_index i
+      JOIN pg_class c ON c.oid = i.indexrelid
+      JOIN pg_am am ON am.oid = c.relam
+     WHERE c.relname = %s
+"""
+
+
+def index_info(conn, name=ANN_INDEX_NAME):
+    return conn.execute(INDEX_INFO_SQL, (name,)).fetchone()
+
+
+def build(conn, method, lists=None, m=HNSW_M, ef_construction=HNSW_EF_CONSTRUCTION, maintenance_work_mem=None):
+    rows = conn.execute(ROWS_SQL).fetchone()[0]
+    if method == "ivfflat" and rows == 0:
+        print("⚠️ company_docs has no embeddings; IVFFlat centroids need data, rebuild after loading")
+    if maintenance_work_mem:
+        # A graph/centroid build that fits in memory is several times faster
+        conn.execute("SELECT set_config('maintenance_work_mem', %s, false)", (maintenance_work_mem,))
+
+    # Leftover from an interrupted CONCURRENTLY build (left INVALID)
+    conn.execute(f"DROP INDEX IF EXISTS {BUILD_NAME}")
+    ddl = index_ddl(method, rows, name=BUILD_NAME, table=TABLE, lists=lists, m=m, ef_construction=ef_construction)
+    print(f"Building over {rows} rows: {ddl}")
+    t0 = time.perf_counter()
+    conn.execute(ddl)
+    # Swap atomically: readers see either the old or the new index
+    with conn.transaction():
+        conn.execute(f"DROP INDEX IF EXISTS {ANN_INDEX_NAME}")
+        conn.execute(f"ALTER INDEX {BUILD_NAME} RENAME TO {ANN_INDEX_NAME}")
+    conn.execute(f"ANALYZE {TABLE}")
+
+    _, _, size, options, _ = index_info(conn)
+    print(f"✅ {ANN_INDEX_NAME} built in {time.perf_counter() - t0:.1f}s ({size / 2**20:.1f} MB, {options})")
+    if method == "ivfflat":
+        n_lists = int(options[0].split("=")[1])
+        print(f"Suggested VECTOR_IVFFLAT_PROBES: {ivfflat_probes(n_lists)} (sqrt(lists))")
+
+
+def status(conn):
+    rows = conn.execute(ROWS_SQL).fetchone()[0]
+    info = index_info(conn)
+    print(f"{TABLE}: {rows} indexed rows ({ANN_INDEX_WHERE}) with embeddings")
+    if info is None:
+        print(f"{ANN_INDEX_NAME}: missing (searches fall back to exact scans); run `build`")
+        return
+    method, ddl, size, options, valid = info
+    print(f"{ANN_INDEX_NAME}: {ddl}")
+    print(f"  size {size / 2**20:.1f} MB, valid={valid}")
+    if method == "ivfflat":
+        # lists is absent from reloptions when the index used the default (100)
+        current = int(options[0].split("=")[1]) if options else 100
+        recommended = ivfflat_lists(rows)
+        if not recommended / 2 <= current <= recommended * 2:
+            print(f"  ⚠️ lists={current} but {recommended} suits {rows} rows; rebuild with `build --method ivfflat`")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the ANN index on company_docs.embedding")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="(re)build the index over the loaded rows")
+    p_build.add_argument("--method", choices=INDEX_METHODS, default=ANN_INDEX_METHOD)
+    p_build.add_argument("--lists", type=int, help="IVFFlat lists (default: sized from row count)")
+    p_build.add_argument("--m", type=int, default=HNSW_M, help="HNSW max connections per layer")
+    p_build.add_argument("--ef-construction", type=int, default=HNSW_EF_CONSTRUCTION)
+    p_build.add_argument("--maintenance-work-mem", help="e.g. 1GB, for the build session only")
+    sub.add_parser("status", help="show the index definition, size and sizing advice")
+    sub.add_parser("drop", help="drop the index")
+    args = parser.parse_args()
+
+    db_url = os.getenv("DATABASE_URL")
+    if not db_url:
+        raise SystemExit("DATABASE_URL is not set")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with psycopg.connect(db_url, autocommit=True) as conn:
+        if args.command == "build":
+            build(conn, args.method, args.lists, args.m, args.ef_construction, args.maintenance_work_mem)
+        elif args.command == "status":
+            status(conn)
+        else:
+            conn.execute(f"DROP INDEX IF EXISTS {ANN_INDEX_NAME}")
+            print(f"Dropped {ANN_INDEX_NAME}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Run tagging job workers outside the API process.
+
+Workers claim queued jobs (POST /jobs) with FOR UPDATE SKIP LOCKED, so any
+number of these processes can run, next to optional in-process workers in the
+API (JOB_WORKERS, 0 by default). Each worker
+processes JOB_CHUNK_SIZE items per InferenceService.arun_batch call and saves
+them before moving on; a job left running by a crashed process is picked up
+again once JOB_LEASE_SECONDS pass without progress, from its first unfinished
+item.
+
+    python -m scripts.run_job_workers [--workers N]
+"""
+import asyncio
+import argparse
+
+from dotenv import load_dotenv
+
+from app.deps import close_all, get_async_openai_client, get_async_vector_search, get_job_store, get_tag_cache
+from app.logging_config import configure_logging
+from app.services.inference import InferenceService
+from app.services.jobs import JobWorker
+
+# Load environment variables
+load_dotenv()
+
+
+def service():
+    return InferenceService(
+        llm_client=get_async_openai_client(),
+        vector_search=get_async_vector_search(),
+        cache=get_tag_cache(),
+    )
+
+
+async def run(workers):
+    try:
+        await asyncio.gather(*(JobWorker(get_job_store(), service).run_forever() for _ in range(workers)))
+    finally:
+        await close_all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run tagging job workers")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    configure_logging()
+    try:
+        asyncio.run(run(args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Local stub of the OpenAI embeddings endpoint for offline runs and benchmarks.
+
+Returns deterministic unit vectors (seeded by the input text), enforces the
+per-request item and token limits, and can add a fixed latency per request to
+emulate network round trips. --error-rate injects transient 429/503 responses
+and --poison rejects any request containing the given substring with a 400, to
+exercise retries and per-document failure isolation.
+
+    python -m scripts.stub_embedding_server --port 18080 --latency-ms 150
+    OPENAI_BASE_URL=http://127.0.0.1:18080/v1 OPENAI_API_KEY=stub python -m scripts.embed_docs
+"""
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import tiktoken
+
+DIM = 1536
+
+
+def stub_vector(text):
+    """
+    Deterministic unit vector for a given input.
+    """
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    vec = np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+    return (vec / np.linalg.norm(vec)).tolist()
+
+
+def make_handler(latency, max_items, max_tokens, enc, counters, error_rate=0.0, poison=None):
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body):
+            raw = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/embeddings"):
+                return self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            inputs = body["input"]
+            inputs = [inputs] if isinstance(inputs, str) else inputs
+            n_tokens = sum(len(enc.encode(t)) for t in inputs)
+            with lock:
+                counters["requests"] += 1
+                counters["inputs"] += len(inputs)
+                counters["tokens"] += n_tokens
+
+            if error_rate and random.random() < error_rate:
+                with lock:
+                    counters["errors"] += 1
+                status = random.choice((429, 503))
+                return self._send(status, {"error": {"message": f"injected {status}", "type": "server_error"}})
+            if poison and any(poison in t for t in inputs):
+                return self._send(400, {"error": {"message": "poisoned input", "type": "invalid_request_error"}})
+            if len(inputs) > max_items or n_tokens > max_tokens:
+                return self._send(400, {"error": {
+                    "message": f"{len(inputs)} inputs / {n_tokens} tokens exceeds the per-request limit",
+                    "type": "invalid_request_error",
+                }})
+
+            time.sleep(latency)
+            self._send(200, {
+                "object": "list",
+                "model": body.get("model"),
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": stub_vector(t)}
+                    for i, t in enumerate(inputs)
+                ],
+                "usage": {"prompt_tokens": n_tokens, "total_tokens": n_tokens},
+            })
+
+    return Handler
+
+
+def serve(port=18080, latency_ms=0.0, max_items=2048, max_tokens=300_000, error_rate=0.0, poison=None):
+    """
+    Start the stub server; returns (server, counters). Call server.serve_forever() or run it in a thread.
+    """
+    counters = {"requests": 0, "inputs": 0, "tokens": 0, "errors": 0}
+    handler = make_handler(
+        latency_ms / 1000, max_items, max_tokens, tiktoken.get_encoding("cl100k_base"), counters,
+        error_rate=error_rate, poison=poison,
+    )
+    return ThreadingHTTPServer(("127.0.0.1", port), handler), counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub OpenAI embeddings server")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--max-items", type=int, default=2048)
+    parser.add_argument("--max-tokens", type=int, default=300_000)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 429/503")
+    parser.add_argument("--poison", help="reject requests containing this substring with a 400")
+    args = parser.parse_args()
+
+    server, _ = serve(args.port, args.latency_ms, args.max_items, args.max_tokens, args.error_rate, args.poison)
+    print(f"Stub embedding server on http://127.0.0.1:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from types import SimpleNamespace
 
 from fastapi.testclient import TestClient
 from app.main import app
+from app.deps import get_async_openai_client
 
 # 실제 API 테스트 클라이언트
 @pytest.fixture(scope="session")
@@ -28,7 +29,7 @@ cases = [
 ]
 
 @pytest.mark.parametrize("talent_file, resp_key, must_include", cases)
-def test_infer_tags(client, mocker, talent_file, resp_key, must_include):
+def test_infer_tags(client, talent_file, resp_key, must_include):
     # 1) payload 로드
     payload_path = os.path.join(
         os.path.dirname(__file__),
@@ -50,23 +51,24 @@ def test_infer_tags(client, mocker, talent_file, resp_key, must_include):
         ]
     )
 
-    # 3) fake_client 정의 (chat.completions.create 호출 시 fake_resp 반환)
+    # 3) fake_client 정의 (비동기 chat.completions.create 호출 시 fake_resp 반환)
+    async def create(*args, **kwargs):
+        return fake_resp
+
     fake_client = SimpleNamespace(
         chat=SimpleNamespace(
-            completions=SimpleNamespace(
-                create=lambda *args, **kwargs: fake_resp
-            )
+            completions=SimpleNamespace(create=create)
         )
     )
 
-    # 4) OpenAI 호출 patch: get_openai_client() 가 fake_client 반환하도록
-    mocker.patch(
-        "app.deps.get_openai_client",
-        return_value=fake_client
-    )
+    # 4) OpenAI 호출 대체: /infer 가 주입받는 AsyncOpenAI 대신 fake_client 사용
+    app.dependency_overrides[get_async_openai_client] = lambda: fake_client
 
     # 5) 엔드포인트 호출 및 검증
-    res = client.post("/infer", json=payload)
+    try:
+        res = client.post("/infer", json=payload)
+    finally:
+        app.dependency_overrides.pop(get_async_openai_client, None)
     assert res.status_code == 200, res.text
 
     tags = res.json().get("tags", [])
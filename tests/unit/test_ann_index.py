@@ -0,0 +1,25 @@
+# tests/unit/test_ann_index.py
+
+import pytest
+from app.services.ann_index import index_ddl, ivfflat_lists, ivfflat_probes
+
+
+def test_ivfflat_lists_follow_row_count():
+    assert ivfflat_lists(0) == 1                     # 빈 테이블에도 유효한 값
+    assert ivfflat_lists(20_000) == 20               # 100만 행까지 rows / 1000
+    assert ivfflat_lists(4_000_000) == 2000          # 그 이상은 sqrt(rows)
+    assert ivfflat_probes(400) == 20
+
+
+def test_index_ddl_per_method():
+    assert index_ddl("hnsw", m=8, ef_construction=32) == (
+        "CREATE INDEX CONCURRENTLY idx_company_docs_embedding ON company_docs "
+        "USING hnsw (embedding vector_cosine_ops) WITH (m = 8, ef_construction = 32) "
+        "WHERE doc_type <> 'profile'"
+    )
+    assert index_ddl("ivfflat", rows=50_000, name="tmp", concurrently=False, where=None) == (
+        "CREATE INDEX tmp ON company_docs USING ivfflat (embedding vector_cosine_ops) WITH (lists = 50)"
+    )
+    assert "WITH (lists = 7)" in index_ddl("ivfflat", rows=50_000, lists=7)
+    with pytest.raises(ValueError):
+        index_ddl("flat")
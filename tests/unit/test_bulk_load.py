@@ -0,0 +1,134 @@
+# tests/unit/test_bulk_load.py
+
+import contextlib
+import numpy as np
+from psycopg.types.json import Jsonb
+from app.services.bulk_load import (
+    DOCS_COPY_TYPES,
+    DOCS_MERGE_SQL,
+    DOCS_MISSING_COMPANY_SQL,
+    DOCS_REPLACE_SQL,
+    NEWS_MERGE_SQL,
+    NEWS_MISSING_COMPANY_SQL,
+    bulk_load_companies,
+    bulk_load_docs,
+    bulk_load_news,
+)
+
+
+class DummyCopy:
+    def __init__(self):
+        self.rows = []
+        self.types = None
+
+    def set_types(self, types):
+        self.types = types
+
+    def write_row(self, row):
+        self.rows.append(row)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+class DummyCursor:
+    def __init__(self, rowcount, missing=0):
+        self.queries = []
+        self.copies = []
+        self.rowcount = rowcount
+        self._missing = missing
+
+    def execute(self, query, params=None):
+        self.queries.append(query)
+
+    def fetchone(self):
+        return (self._missing,)
+
+    def copy(self, statement):
+        copy = DummyCopy()
+        self.copies.append((statement, copy))
+        return copy
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+class DummyConn:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.transactions = 0
+
+    def cursor(self):
+        return self._cursor
+
+    @contextlib.contextmanager
+    def transaction(self):
+        self.transactions += 1
+        yield
+
+
+def test_news_streams_rows_through_copy_and_merges_once():
+    cur = DummyCursor(rowcount=2, missing=1)
+    conn = DummyConn(cur)
+    rows = iter([
+        ("A", "t1", "l1", "2025-01-01"),
+        ("A", "t1", "l1", "2025-01-01"),   # 스테이징 내 중복
+        ("B", "t2", "l2", "2025-01-02"),
+        ("없는회사", "t3", "l3", "2025-01-03"),
+    ])
+
+    result = bulk_load_news(conn, rows)
+
+    assert conn.transactions == 1
+    statement, copy = cur.copies[0]
+    assert statement.startswith("COPY news_stage (company_name, title, original_link, news_date) FROM STDIN")
+    assert "BINARY" not in statement
+    assert len(copy.rows) == 4
+    # 스테이징 생성 → 누락 회사 집계 → 단일 병합 INSERT
+    assert cur.queries[1:] == [NEWS_MISSING_COMPANY_SQL, NEWS_MERGE_SQL]
+    assert "ON CONFLICT (company_id, title, news_date) DO NOTHING" in NEWS_MERGE_SQL
+    assert (result.staged, result.inserted, result.missing, result.skipped) == (4, 2, 1, 1)
+
+
+def test_docs_use_binary_copy_with_vector_types():
+    cur = DummyCursor(rowcount=1)
+    vec = np.ones(3, dtype=np.float32)
+
+    result = bulk_load_docs(DummyConn(cur), [(1, "news", "content", vec, None)])
+
+    statement, copy = cur.copies[0]
+    assert statement.startswith("COPY docs_stage (company_id, doc_type,")
+    assert statement.endswith("FROM STDIN (FORMAT BINARY)")
+    assert copy.types == DOCS_COPY_TYPES
+    assert copy.rows[0][3] is vec
+    assert cur.queries[-2:] == [DOCS_MISSING_COMPANY_SQL, DOCS_MERGE_SQL]
+    assert "ON CONFLICT (company_id, doc_type, content_hash) DO NOTHING" in DOCS_MERGE_SQL
+    assert result.inserted == 1 and result.skipped == 0
+
+
+def test_companies_wrap_data_as_jsonb():
+    cur = DummyCursor(rowcount=0)
+
+    result = bulk_load_companies(DummyConn(cur), [("A", {"k": 1})])
+
+    _, copy = cur.copies[0]
+    name, data = copy.rows[0]
+    assert name == "A" and isinstance(data, Jsonb) and data.obj == {"k": 1}
+    # 이미 존재하는 회사는 중복으로 집계
+    assert result.skipped == 1
+
+
+def test_docs_replace_deletes_superseded_rows_in_same_transaction():
+    cur = DummyCursor(rowcount=1)
+    conn = DummyConn(cur)
+
+    result = bulk_load_docs(conn, [(1, "profile", "new", np.ones(3, dtype=np.float32), None)], replace=True)
+
+    assert conn.transactions == 1
+    # COPY 후 기존 profile 삭제 → 병합 순서
+    assert cur.queries[-2:] == [DOCS_REPLACE_SQL, DOCS_MERGE_SQL]
+    assert result.replaced == 1 and result.inserted == 1
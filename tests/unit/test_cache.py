@@ -0,0 +1,104 @@
+# tests/unit/test_cache.py
+import datetime
+import json
+import pytest
+from types import SimpleNamespace
+from app.schemas import DetailedTalentInput
+from app.services.cache import RedisCache, TagCache, TTLCache, tag_cache_key
+from app.services.inference import InferenceService
+from app.services.prompt_builder import PromptBuilder
+from app.services.vector_search import Document
+
+@pytest.fixture
+def payload():
+    return DetailedTalentInput(**{
+        "positions": [{
+            "title": "Engineer",
+            "companyName": "테스트사",
+            "startEndDate": {"start": {"year": 2024, "month": 1}},
+        }],
+        "skills": ["Python"],
+    })
+
+@pytest.fixture
+def docs():
+    return [Document("테스트사", "news", "snippet", datetime.date(2024, 1, 1), id=1)]
+
+class FakeRedis:
+    """Redis 호환 공유 계층 대용 (get / set(ex=))"""
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+def test_ttl_cache_evicts_lru_and_expires(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("app.services.cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")          # a 를 최근 사용으로
+    cache.set("c", 3)       # b 가 밀려남
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    now[0] = 11.0
+    assert cache.get("a") is None
+
+def test_tag_cache_shared_tier_fills_local():
+    redis = FakeRedis()
+    writer = TagCache(TTLCache(10, 60), RedisCache(redis))
+    writer.set("k", {"tags": ["A"]})
+
+    reader = TagCache(TTLCache(10, 60), RedisCache(redis))
+    assert reader.get("k") == {"tags": ["A"]}
+    assert reader.get("k") == {"tags": ["A"]}
+    assert reader.get("missing") is None
+
+    stats = reader.stats()
+    assert (stats["hits_shared"], stats["hits_local"], stats["misses"]) == (1, 1, 1)
+
+def test_cache_key_is_canonical_and_tracks_inputs(payload, docs):
+    base = tag_cache_key(payload, "m", "v1", docs)
+    reordered = DetailedTalentInput(**json.loads(json.dumps(payload.model_dump(), sort_keys=True)))
+    assert tag_cache_key(reordered, "m", "v1", docs) == base
+
+    assert tag_cache_key(payload, "m", "v2", docs) != base
+    assert tag_cache_key(payload, "other", "v1", docs) != base
+    changed = [docs[0]._replace(content="updated snippet")]
+    assert tag_cache_key(payload, "m", "v1", changed) != base
+
+def test_inference_service_skips_llm_on_cache_hit(payload, docs):
+    calls = []
+    def create(**kwargs):
+        calls.append(kwargs)
+        content = json.dumps({"tags": ["태그1"]})
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=900, completion_tokens=30),
+        )
+
+    svc = InferenceService(
+        llm_client=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+        vector_search=SimpleNamespace(most_similar_many=lambda requests: [docs for _ in requests]),
+        cache=TagCache(TTLCache(10, 60)),
+        # 문자 단위 토크나이저 (tiktoken BPE 파일 없이 실행)
+        prompt_builder=PromptBuilder(SimpleNamespace(encode=list, decode="".join), max_tokens=6000),
+    )
+    first = svc.run(payload)
+    second = svc.run(payload)
+
+    assert first.tags == second.tags == ["태그1"]
+    assert len(calls) == 1
+    assert svc.cache.stats()["hits_local"] == 1
+
+    # usage 는 캐시하지 않음: 적중 시 LLM 토큰 수는 None, 프롬프트 토큰 수는 이번 요청 기준
+    assert (first.usage.llm_prompt_tokens, first.usage.completion_tokens) == (900, 30)
+    assert (second.usage.llm_prompt_tokens, second.usage.completion_tokens) == (None, None)
+    assert second.usage.prompt_tokens == first.usage.prompt_tokens
+    key = tag_cache_key(payload, "gpt-3.5-turbo", svc.prompts.version, docs)
+    assert svc.cache.get(key) == {"tags": ["태그1"]}
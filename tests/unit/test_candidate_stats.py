@@ -0,0 +1,54 @@
+# tests/unit/test_candidate_stats.py
+
+import datetime
+
+from app.services.candidate_stats import CandidateStats
+
+
+def test_estimates_follow_planner_statistics():
+    stats = CandidateStats(exact_max_rows=1000, ann_candidates=40)
+    # company_id 기준 10000 행 (1 = big, 2 = mid), n_distinct 음수 = 행 수 대비 비율 (-0.01 → 100 개 회사)
+    stats.replace([(10000.0, -0.01, [1, 2], [0.5, 0.1], None)])
+
+    assert stats.estimate(1) == 5000
+    assert stats.estimate(2) == 1000
+    # 나머지 40% 를 남은 98 개 회사로 나눔
+    assert round(stats.estimate(3), 1) == 40.8
+    assert stats.exact_flags([1, 2, 3], [None] * 3, [None] * 3, [5, 5, 5]) == [False, True, True]
+    # 후보 40 개 중 big 문서는 약 20 개 → top_k 가 10 을 넘으면 ANN 으로 다 채우지 못하므로 정확 검색
+    assert stats.exact_flags([1, 1], [None] * 2, [None] * 2, [10, 11]) == [False, True]
+
+
+def test_date_filter_scales_candidates_by_histogram():
+    stats = CandidateStats(exact_max_rows=1000, ann_candidates=40)
+    # published_at 히스토그램: 2021~2024 를 4개 구간(구간마다 25%)으로 나눔
+    bounds = [datetime.date(y, 1, 1) for y in range(2021, 2026)]
+    stats.replace([(10000.0, -0.01, [1], [0.5], bounds)])
+
+    assert stats.date_fraction(None, datetime.date(2024, 1, 1)) == 1.0      # 한쪽 날짜만 있으면 필터 없음
+    assert stats.date_fraction(datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)) == 0.25
+    assert round(stats.date_fraction(datetime.date(2024, 1, 1), datetime.date(2024, 3, 31)), 3) == 0.062
+    assert stats.date_fraction(datetime.date(2019, 1, 1), datetime.date(2020, 12, 31)) == 0.0
+
+    two_years = (datetime.date(2023, 1, 1), datetime.date(2024, 12, 31))    # big 문서 약 2500 개
+    one_year = (datetime.date(2024, 1, 1), datetime.date(2024, 12, 31))     # 약 1250 개 → 후보 40 개 중 약 5 개
+    quarter = (datetime.date(2024, 1, 1), datetime.date(2024, 3, 31))       # 약 310 개 → exact_max_rows 이하
+    assert stats.exact_flags(
+        [1, 1, 1, 1], *zip(two_years, one_year, one_year, quarter), [5, 5, 2, 2]
+    ) == [False, True, False, True]
+
+
+def test_date_filter_without_histogram_is_exact():
+    stats = CandidateStats(exact_max_rows=1000, ann_candidates=40)
+    stats.replace([(10000.0, -0.01, [1], [0.5], None)])
+    start, end = datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)
+    assert stats.exact_flags([1, 1], [start, None], [end, None], [5, 5]) == [True, False]
+
+
+def test_without_statistics_always_exact():
+    stats = CandidateStats(exact_max_rows=0)
+    assert stats.due_for_check()
+    stats.replace([(-1.0, None, None, None, None)])      # ANALYZE 전 테이블
+    assert stats.estimate(1) is None
+    assert stats.exact_flags([1], [None], [None], [5]) == [True]
+    assert not stats.due_for_check()
@@ -0,0 +1,20 @@
+# tests/unit/test_company_ids.py
+
+from app.services.company_ids import CompanyIds
+
+
+def test_lookup_returns_cached_ids_and_none_for_unknown():
+    company_ids = CompanyIds(ttl=3600)
+    assert company_ids.lookup(["A"]) == [None]
+
+    company_ids.add([("A", 1), ("B", 2)])
+    assert company_ids.lookup(["B", "A", "C"]) == [2, 1, None]
+    assert len(company_ids) == 2
+
+
+def test_mapping_expires_after_ttl():
+    company_ids = CompanyIds(ttl=0)
+    company_ids.add([("A", 1)])
+    # 회사명이 바뀌었을 수 있으므로 ttl 이 지나면 다시 조회하도록 비움
+    assert company_ids.lookup(["A"]) == [None]
+    assert len(company_ids) == 0
@@ -0,0 +1,193 @@
+# tests/unit/test_embedding.py
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from app.services.embedding import (
+    Chunk, EmbeddingBatcher, EmbeddingCheckpoint, RateLimiter, chunk_documents, is_retryable, pack_batches,
+)
+from app.services.embedding_cache import EmbeddingCache
+
+
+class CharEncoder:
+    """문자 하나를 토큰 하나로 취급하는 테스트용 인코더"""
+
+    def encode(self, text):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.calls = []
+
+    def create(self, input, model):
+        self.calls.append(list(input))
+        # 입력 길이를 값으로 갖는 벡터를 역순으로 반환 (index 로 매칭되는지 확인)
+        data = [SimpleNamespace(index=i, embedding=[float(len(t))] * 2) for i, t in enumerate(input)]
+        return SimpleNamespace(data=data[::-1])
+
+
+def test_chunk_documents_splits_only_long_texts():
+    chunks = chunk_documents(["abc", "abcdefg"], CharEncoder(), max_tokens=3)
+    assert chunks == [
+        Chunk(0, "abc", 3),
+        Chunk(1, "abc", 3), Chunk(1, "def", 3), Chunk(1, "g", 1),
+    ]
+
+
+def test_chunk_documents_keeps_paragraphs_and_lines_together():
+    text = "aa\nbb\n\ncc\n\ndddddddd"
+    chunks = chunk_documents([text], CharEncoder(), max_tokens=6)
+    # 문단 경계에서 나누고(합치면 한도 초과), 경계가 없는 긴 문단만 토큰 단위로 자름
+    assert [c.text for c in chunks] == ["aa\nbb", "cc", "dddddd", "dd"]
+    assert all(c.n_tokens <= 6 for c in chunks)
+
+
+def test_pack_batches_respects_token_and_item_limits():
+    chunks = [Chunk(i, "x" * n, n) for i, n in enumerate([4, 4, 3, 1, 1, 1])]
+    batches = list(pack_batches(chunks, max_tokens=8, max_items=2))
+    assert [[c.n_tokens for c in b] for b in batches] == [[4, 4], [3, 1], [1, 1]]
+    assert all(sum(c.n_tokens for c in b) <= 8 and len(b) <= 2 for b in batches)
+
+
+def test_batcher_maps_vectors_back_and_averages_chunks():
+    embeddings = FakeEmbeddings()
+    batcher = EmbeddingBatcher(
+        SimpleNamespace(embeddings=embeddings), CharEncoder(),
+        max_input_tokens=3, batch_max_tokens=100, batch_max_items=100,
+    )
+    vectors = batcher.embed(["ab", "abcdefg"])
+
+    assert len(embeddings.calls) == 1                  # 모든 청크를 한 요청으로
+    assert vectors[0].dtype == np.float32
+    assert vectors[0].tolist() == [2.0, 2.0]
+    assert np.allclose(vectors[1], [7 / 3, 7 / 3])     # 청크 길이 3, 3, 1 의 평균
+    assert (batcher.stats.docs, batcher.stats.chunks, batcher.stats.tokens) == (2, 4, 9)
+
+
+def test_batcher_requests_only_uncached_chunks(tmp_path):
+    embeddings = FakeEmbeddings()
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite"), model="m")
+    batcher = EmbeddingBatcher(
+        SimpleNamespace(embeddings=embeddings), CharEncoder(),
+        max_input_tokens=3, batch_max_tokens=100, batch_max_items=100, cache=cache,
+    )
+    first = batcher.embed(["ab", "abcdefg"])
+    second = batcher.embed(["abcdefg", "xy"])
+
+    # 두 번째 실행은 새 텍스트 "xy" 만 요청
+    assert embeddings.calls == [["ab", "abc", "def", "g"], ["xy"]]
+    assert np.allclose(second[0], first[1])
+    assert (batcher.stats.chunks, batcher.stats.cached, batcher.stats.tokens) == (8, 3, 11)
+
+
+def test_batcher_token_weighted_pooling():
+    batcher = EmbeddingBatcher(
+        SimpleNamespace(embeddings=FakeEmbeddings()), CharEncoder(),
+        max_input_tokens=3, batch_max_tokens=100, batch_max_items=100, pooling="token_mean",
+    )
+    [vector] = batcher.embed(["abcdefg"])
+    # 청크 길이 3, 3, 1 을 토큰 수로 가중: (3*3 + 3*3 + 1*1) / 7
+    assert np.allclose(vector, [19 / 7, 19 / 7])
+
+    with pytest.raises(ValueError):
+        EmbeddingBatcher(None, CharEncoder(), pooling="max")
+
+
+class FlakyEmbeddings(FakeEmbeddings):
+    """처음 fail_times 번은 429, 'bad' 가 포함된 요청은 항상 400 으로 실패"""
+
+    def __init__(self, fail_times=0):
+        super().__init__()
+        self.fail_times = fail_times
+
+    def create(self, input, model):
+        self.calls.append(list(input))
+        if self.fail_times:
+            self.fail_times -= 1
+            raise StatusError(429)
+        if any("bad" in t for t in input):
+            raise StatusError(400)
+        data = [SimpleNamespace(index=i, embedding=[float(len(t))] * 2) for i, t in enumerate(input)]
+        return SimpleNamespace(data=data)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def make_batcher(embeddings, sleeps=None, **kwargs):
+    return EmbeddingBatcher(
+        SimpleNamespace(embeddings=embeddings), CharEncoder(),
+        max_input_tokens=100, batch_max_tokens=1000, batch_max_items=100,
+        concurrency=2, max_retries=3,
+        sleep=(sleeps.append if sleeps is not None else lambda s: None),
+        **kwargs,
+    )
+
+
+def test_batcher_retries_transient_errors_with_backoff():
+    embeddings, sleeps = FlakyEmbeddings(fail_times=2), []
+    batcher = make_batcher(embeddings, sleeps)
+
+    vectors = batcher.embed(["ab", "abc"])
+
+    assert [v.tolist() for v in vectors] == [[2.0, 2.0], [3.0, 3.0]]
+    assert len(embeddings.calls) == 3 and len(sleeps) == 2
+    assert batcher.stats.retries == 2
+
+
+def test_batcher_isolates_failing_document():
+    embeddings = FlakyEmbeddings()
+    batcher = make_batcher(embeddings)
+
+    results = {d.index: d for d in batcher.embed_iter(["ok", "bad", "fine"])}
+
+    assert results[0].vector.tolist() == [2.0, 2.0]
+    assert results[2].vector.tolist() == [4.0, 4.0]
+    assert results[1].vector is None and "400" in results[1].error
+    # 배치 1회 실패 후 문서별 3회 요청, 400 은 재시도하지 않음
+    assert len(embeddings.calls) == 4
+    assert batcher.stats.failed == 1
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (StatusError(429), True),
+    (StatusError(408), True),
+    (StatusError(503), True),
+    (StatusError(400), False),
+    (StatusError(409), False),     # Conflict 는 다시 보내도 같은 결과
+    (TimeoutError(), True),
+    (ValueError(), False),
+])
+def test_is_retryable(exc, expected):
+    assert is_retryable(exc) is expected
+
+
+def test_rate_limiter_waits_for_budget():
+    now, sleeps = [0.0], []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rpm=60, tpm=600, clock=lambda: now[0], sleep=sleep)
+    limiter.acquire(500)                    # 버킷이 가득 찬 상태로 시작
+    waited = limiter.acquire(200)           # 토큰 100 부족 → 10 tokens/s 로 10초 대기
+    assert waited == sum(sleeps) == 10
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / "ckpt.json")
+    ckpt = EmbeddingCheckpoint(path)
+    ckpt.record(done=3, failed={"h1": "400", "h2": "timeout"})
+    ckpt.record(done=1, succeeded=["h2"])
+
+    restored = EmbeddingCheckpoint(path)
+    assert restored.done == 4
+    assert restored.failed == {"h1": "400"}
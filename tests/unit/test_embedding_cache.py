@@ -0,0 +1,49 @@
+# tests/unit/test_embedding_cache.py
+
+import numpy as np
+from app.services.embedding_cache import EmbeddingCache
+
+
+def test_round_trip_is_keyed_by_model_and_text(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = EmbeddingCache(path, model="m1")
+    cache.put_many(["a", "b"], [np.array([1, 2], dtype=np.float32), np.array([3, 4], dtype=np.float64)])
+
+    got = cache.get_many(["b", "c", "a"])
+    assert got[0].dtype == np.float32 and got[0].tolist() == [3.0, 4.0]
+    assert got[1] is None
+    assert got[2].tolist() == [1.0, 2.0]
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.writes, cache.stats.entries) == (2, 1, 2, 2)
+    cache.close()
+
+    # 파일에 영속되며, 다른 모델의 벡터는 조회되지 않음
+    assert EmbeddingCache(path, model="m1").get_many(["a"])[0].tolist() == [1.0, 2.0]
+    assert EmbeddingCache(path, model="m2").get_many(["a"]) == [None]
+
+
+def test_evicts_least_recently_used_beyond_size_limit(tmp_path):
+    vec = np.zeros(256, dtype=np.float32)           # 1 KB
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite"), max_mb=3 / 1024)
+    cache.put_many(["a"], [vec])
+    cache.put_many(["b"], [vec])
+    cache.put_many(["c"], [vec])
+    cache.get_many(["a"])                           # a 를 최근 사용으로 갱신
+
+    # 4 KB > 3 KB → 한도의 90% 이하가 될 때까지 오래된 b, c 제거
+    cache.put_many(["d"], [vec])
+
+    assert [v is not None for v in cache.get_many(["a", "b", "c", "d"])] == [True, False, False, True]
+    assert cache.stats.evictions == 2 and cache.stats.size_bytes <= 0.9 * 3 * 1024
+
+
+def test_size_is_tracked_incrementally_across_overwrites(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = EmbeddingCache(path, model="m1")
+    cache.put_many(["a", "b"], [np.zeros(4), np.zeros(4)])
+    # 기존 항목 덮어쓰기(크기 변경)와 같은 배치 안의 중복 텍스트
+    cache.put_many(["a", "c", "c"], [np.zeros(8), np.zeros(2), np.zeros(2)])
+    assert (cache.stats.entries, cache.stats.size_bytes) == (3, (8 + 4 + 2) * 4)
+
+    # 증분으로 센 값이 전체를 다시 센 값과 같음
+    reopened = EmbeddingCache(path, model="m1")
+    assert (reopened.stats.entries, reopened.stats.size_bytes) == (3, 56)
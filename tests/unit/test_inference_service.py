@@ -1,10 +1,26 @@
 # tests/unit/test_inference_service.py
+import asyncio
 import json
+import time
 import pytest
 from types import SimpleNamespace
 from app.services.inference import InferenceService
+from app.services.prompt_builder import PromptBuilder
 from app.schemas import DetailedTalentInput, Position, DateInfo, StartEndDate
 
+class CharEncoder:
+    """문자 하나를 토큰 하나로 취급하는 테스트용 인코더 (tiktoken BPE 파일 없이 실행)"""
+
+    def encode(self, text):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+def char_prompts(max_tokens=6000):
+    return PromptBuilder(CharEncoder(), max_tokens=max_tokens)
+
 @pytest.fixture
 def dummy_payload():
     pos = Position(
@@ -35,10 +51,323 @@ def fake_llm(monkeypatch):
 
 @pytest.fixture
 def fake_vs(fake_docs):
-    # vector_search.most_similar이 fake_docs를 반환하도록
-    return SimpleNamespace(most_similar=lambda *args, **kwargs: fake_docs)
+    # vector_search.most_similar_many가 요청마다 fake_docs를 반환하도록
+    return SimpleNamespace(most_similar_many=lambda requests: [fake_docs for _ in requests])
 
 def test_inference_service_parses_tags(dummy_payload, fake_llm, fake_vs):
-    svc = InferenceService(llm_client=fake_llm, vector_search=fake_vs)
+    svc = InferenceService(llm_client=fake_llm, vector_search=fake_vs, prompt_builder=char_prompts())
     result = svc.run(dummy_payload)
     assert result.tags == ["태그1","태그2"]
+    # 빌더가 센 프롬프트 토큰 수 (가짜 LLM 응답에는 usage 가 없음)
+    assert result.usage.docs_included == result.usage.docs_available == 1
+    assert result.usage.prompt_tokens <= result.usage.max_prompt_tokens
+    assert result.usage.llm_prompt_tokens is None
+
+def test_inference_service_batches_retrieval(dummy_payload, fake_llm, fake_docs):
+    calls = []
+    def most_similar_many(requests):
+        calls.append(list(requests))
+        return [fake_docs for _ in requests]
+
+    payload = DetailedTalentInput(positions=dummy_payload.positions * 3)
+    svc = InferenceService(
+        prompt_builder=char_prompts(),
+        llm_client=fake_llm,
+        vector_search=SimpleNamespace(most_similar_many=most_similar_many),
+    )
+    svc.run(payload)
+
+    # 포지션 수와 무관하게 검색은 한 번만 호출되어야 함
+    assert len(calls) == 1
+    assert len(calls[0]) == 3
+    assert calls[0][0].company_name == "테스트사"
+
+@pytest.mark.asyncio
+async def test_inference_service_arun_parses_tags(dummy_payload, fake_docs):
+    real = {"tags": ["태그1", "태그2"]}
+    fake_resp = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(real)))]
+    )
+
+    async def create(*args, **kwargs):
+        return fake_resp
+
+    async def most_similar_many(requests):
+        return [fake_docs for _ in requests]
+
+    svc = InferenceService(
+        prompt_builder=char_prompts(),
+        llm_client=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+        vector_search=SimpleNamespace(most_similar_many=most_similar_many),
+    )
+    result = await svc.arun(dummy_payload)
+    assert result.tags == ["태그1", "태그2"]
+
+def _position(company, year):
+    return Position(
+        title="Engineer",
+        companyName=company,
+        startEndDate=StartEndDate(
+            start=DateInfo(year=year, month=1),
+            end=DateInfo(year=year, month=12)
+        )
+    )
+
+def test_fanout_degrades_slow_position_after_deadline(fake_llm, fake_docs):
+    def most_similar(company, start_date, end_date, top_k):
+        if company == "느린회사":
+            time.sleep(0.5)
+        return fake_docs
+
+    payload = DetailedTalentInput(positions=[_position("빠른회사", 2020), _position("느린회사", 2021)])
+    svc = InferenceService(
+        prompt_builder=char_prompts(),
+        llm_client=fake_llm,
+        vector_search=SimpleNamespace(most_similar=most_similar),
+        retrieval_mode="fanout",
+        retrieval_deadline=0.1,
+    )
+    groups, complete = svc._retrieve(svc._search_requests(payload))
+    assert groups == [fake_docs, []]
+    assert not complete
+
+def test_sync_fanout_shares_executor_and_respects_concurrency_limit(fake_llm, fake_docs):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def most_similar(company, start_date, end_date, top_k):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return fake_docs
+
+    executor = ThreadPoolExecutor(max_workers=8)
+    payload = DetailedTalentInput(positions=[_position(f"회사{i}", 2020) for i in range(6)])
+    svc = InferenceService(
+        prompt_builder=char_prompts(),
+        llm_client=fake_llm,
+        vector_search=SimpleNamespace(most_similar=most_similar),
+        retrieval_mode="fanout",
+        retrieval_concurrency=2,
+        executor=executor,
+    )
+    for _ in range(2):
+        groups, complete = svc._retrieve(svc._search_requests(payload))
+        assert groups == [fake_docs] * 6 and complete
+    assert peak == 2
+    executor.shutdown()
+
+def test_sync_batch_retrieval_applies_deadline(fake_llm, fake_docs):
+    def most_similar_many(requests):
+        time.sleep(0.5)
+        return [fake_docs for _ in requests]
+
+    svc = InferenceService(
+        prompt_builder=char_prompts(),
+        llm_client=fake_llm,
+        vector_search=SimpleNamespace(most_similar_many=most_similar_many),
+        retrieval_deadline=0.05,
+    )
+    payload = DetailedTalentInput(positions=[_position("느린회사", 2021), _position("회사B", 2020)])
+    t0 = time.monotonic()
+    groups, complete = svc._retrieve(svc._search_requests(payload))
+    assert time.monotonic() - t0 < 0.4
+    assert groups == [[], []]
+    assert not complete
+
+@pytest.mark.asyncio
+async def test_async_fanout_respects_concurrency_limit(fake_docs):
+    running = 0
+    peak = 0
+
+    async def most_similar(company, start_date, end_date, top_k):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return fake_docs
+
+    payload = DetailedTalentInput(positions=[_position(f"회사{i}", 2020) for i in range(6)])
+    svc = InferenceService(
+        prompt_builder=char_prompts(),
+        llm_client=SimpleNamespace(),
+        vector_search=SimpleNamespace(most_similar=most_similar),
+        retrieval_mode="fanout",
+        retrieval_concurrency=2,
+    )
+    groups, complete = await svc._aretrieve(svc._search_requests(payload))
+    assert len(groups) == 6
+    assert complete
+    assert peak == 2
+
+@pytest.mark.asyncio
+async def test_async_fanout_degrades_slow_position_after_deadline(fake_docs):
+    async def most_similar(company, start_date, end_date, top_k):
+        if company == "느린회사":
+            await asyncio.sleep(1)
+        return fake_docs
+
+    payload = DetailedTalentInput(positions=[_position("느린회사", 2021), _position("빠른회사", 2020)])
+    svc = InferenceService(
+        prompt_builder=char_prompts(),
+        llm_client=SimpleNamespace(),
+        vector_search=SimpleNamespace(most_similar=most_similar),
+        retrieval_mode="fanout",
+        retrieval_deadline=0.05,
+    )
+    groups, complete = await svc._aretrieve(svc._search_requests(payload))
+    assert groups == [[], fake_docs]
+    assert not complete
+
+@pytest.mark.asyncio
+async def test_arun_batch_dedupes_retrieval_and_keeps_item_order(fake_docs):
+    calls = []
+    running = 0
+    peak = 0
+
+    async def most_similar_many(requests):
+        calls.append(list(requests))
+        if any(r.company_name == "없는회사" for r in requests):
+            raise ValueError("No embedding for company 없는회사")
+        return [fake_docs for _ in requests]
+
+    async def create(*args, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        content = kwargs["messages"][0]["content"]
+        tag = "A" if "회사A" in content else "B"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps({"tags": [tag]})))])
+
+    payloads = [
+        DetailedTalentInput(positions=[_position("회사A", 2020), _position("회사B", 2021)]),
+        DetailedTalentInput(positions=[_position("회사B", 2021)]),
+        DetailedTalentInput(positions=[]),
+        DetailedTalentInput(positions=[_position("회사B", 2021)] * 4),
+    ]
+    svc = InferenceService(
+        prompt_builder=char_prompts(),
+        llm_client=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+        vector_search=SimpleNamespace(most_similar_many=most_similar_many),
+    )
+    results = await svc.arun_batch(payloads, concurrency=2)
+
+    # 배치 전체에서 (회사, 기간) 이 같은 검색은 한 번만 요청
+    assert len(calls) == 1
+    assert [r.company_name for r in calls[0]] == ["회사A", "회사B"]
+    assert [r.index for r in results] == [0, 1, 2, 3]
+    assert results[0].result.tags == ["A"] and results[1].result.tags == ["B"] and results[3].result.tags == ["B"]
+    assert results[2].result is None and "비어있습니다" in results[2].error
+    assert not any(r.degraded for r in results)
+    assert peak == 2
+
+    # 프로파일이 없는 회사가 섞이면 지원자별로 다시 검색해 그 지원자만 실패
+    calls.clear()
+    results = await svc.arun_batch([payloads[1], DetailedTalentInput(positions=[_position("없는회사", 2020)])])
+    assert len(calls) == 3
+    assert results[0].result.tags == ["B"]
+    assert "없는회사" in results[1].error
+
+@pytest.mark.asyncio
+async def test_astream_sends_retrieval_then_tags_then_done(dummy_payload, fake_docs):
+    answer = '```json\n{"tags": ["태그1", "태그2"]}\n```'
+
+    async def stream():
+        for i in range(0, len(answer), 5):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=answer[i:i + 5]))], usage=None)
+        # 마지막 청크: choices 없이 usage 만
+        yield SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=120, completion_tokens=15))
+
+    async def create(*args, **kwargs):
+        assert kwargs["stream"] is True
+        return stream()
+
+    async def most_similar_many(requests):
+        return [fake_docs for _ in requests]
+
+    svc = InferenceService(
+        prompt_builder=char_prompts(),
+        llm_client=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+        vector_search=SimpleNamespace(most_similar_many=most_similar_many),
+    )
+    events = [e async for e in svc.astream(dummy_payload)]
+
+    assert [name for name, _ in events] == ["retrieval", "tag", "tag", "done"]
+    assert events[0][1]["docs"][0]["company_name"] == "테스트사" and not events[0][1]["cached"]
+    assert [data["tag"] for name, data in events if name == "tag"] == ["태그1", "태그2"]
+    done = events[-1][1]
+    assert done["tags"] == ["태그1", "태그2"]
+    assert done["usage"]["llm_prompt_tokens"] == 120 and done["usage"]["completion_tokens"] == 15
+
+@pytest.mark.asyncio
+async def test_arun_coalesces_identical_in_flight_requests(dummy_payload, fake_docs):
+    from app.services.single_flight import SingleFlight
+    llm_calls = 0
+    search_calls = 0
+
+    async def create(*args, **kwargs):
+        nonlocal llm_calls
+        llm_calls += 1
+        await asyncio.sleep(0.02)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"tags": ["태그1"]}'))])
+
+    async def most_similar_many(requests):
+        nonlocal search_calls
+        search_calls += 1
+        return [fake_docs for _ in requests]
+
+    flight = SingleFlight()
+
+    def service():
+        # 요청마다 새 InferenceService 를 만드는 라우터처럼, single_flight 만 공유
+        return InferenceService(
+            prompt_builder=char_prompts(),
+            llm_client=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+            vector_search=SimpleNamespace(most_similar_many=most_similar_many),
+            single_flight=flight,
+        )
+
+    other = DetailedTalentInput(positions=dummy_payload.positions, skills=["Go"])
+    results = await asyncio.gather(*(service().arun(p) for p in [dummy_payload] * 3 + [other]))
+
+    assert [r.tags for r in results] == [["태그1"]] * 4
+    # 같은 이력서 3건은 검색·LLM 호출을 한 번만, 다른 이력서는 따로 실행
+    assert llm_calls == search_calls == 2
+    assert flight.stats()["coalesced"] == 2
+
+@pytest.mark.asyncio
+async def test_arun_batch_applies_deadline_per_retrieval_chunk(fake_docs):
+    async def most_similar_many(requests):
+        if any(r.company_name == "느린회사" for r in requests):
+            await asyncio.sleep(1)
+        return [fake_docs for _ in requests]
+
+    async def create(*args, **kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"tags": ["태그1"]}'))])
+
+    payloads = [
+        DetailedTalentInput(positions=[_position("회사A", 2020), _position("회사B", 2021)]),
+        DetailedTalentInput(positions=[_position("느린회사", 2020)]),
+        DetailedTalentInput(positions=[_position("회사B", 2021), _position("회사C", 2022)]),
+    ]
+    svc = InferenceService(
+        prompt_builder=char_prompts(),
+        llm_client=SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))),
+        vector_search=SimpleNamespace(most_similar_many=most_similar_many),
+        retrieval_deadline=0.05,
+    )
+    # 검색 4건을 2건씩: [회사A, 회사B], [느린회사, 회사C] → 두 번째 청크만 마감 초과
+    results = await svc.arun_batch(payloads, retrieval_chunk=2)
+
+    assert all(r.result.tags == ["태그1"] for r in results)
+    assert [r.degraded for r in results] == [False, True, True]
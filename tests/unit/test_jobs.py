@@ -0,0 +1,131 @@
+# tests/unit/test_jobs.py
+import asyncio
+import pytest
+from app.schemas import INTERNAL_ERROR, BatchItemResult, TagResponse
+from app.services.jobs import JobWorker, input_path, jsonl_lines
+
+
+async def chunks(*parts):
+    for p in parts:
+        yield p
+
+
+@pytest.mark.asyncio
+async def test_jsonl_lines_splits_across_chunks_and_skips_blank_lines():
+    # 멀티바이트 문자가 청크 경계에서 나뉘어도 줄 단위로 디코딩
+    data = '{"a": "가"}\n\n{"b": 2}\n{"c": 3}'.encode("utf-8")
+    lines = [x async for x in jsonl_lines(chunks(data[:8], data[8:15], data[15:]))]
+    assert lines == [(1, '{"a": "가"}'), (3, '{"b": 2}'), (4, '{"c": 3}')]
+
+
+def test_input_path_stays_inside_input_dir(tmp_path):
+    (tmp_path / "requests.jsonl").write_text("{}\n")
+    (tmp_path / "notes.txt").write_text("")
+    assert input_path("requests.jsonl", root=str(tmp_path)) == tmp_path / "requests.jsonl"
+    for name in ("../requests.jsonl", "notes.txt", "missing.jsonl", "/etc/passwd"):
+        with pytest.raises(ValueError):
+            input_path(name, root=str(tmp_path))
+
+
+class FakeStore:
+    """tag_job_item 을 메모리에 두는 저장소 (idx → [입력, 결과, 오류, 완료 여부])"""
+
+    def __init__(self, n, done=()):
+        item = {"positions": [{"title": "Engineer", "companyName": "A", "startEndDate": {"start": {"year": 2020, "month": 1}}}]}
+        self.items = {i: [item, None, None, i in done] for i in range(n)}
+        self.saved = []
+        self.touched = 0
+        self.finished = False
+
+    async def claim(self, lease):
+        return None if self.finished else "job-1"
+
+    async def pending(self, job_id, after, limit):
+        return [(i, v[0]) for i, v in sorted(self.items.items()) if not v[3] and i > after][:limit]
+
+    async def save(self, job_id, rows):
+        self.saved.append([idx for idx, _, _ in rows])
+        for idx, result, error in rows:
+            self.items[idx][1:] = [result, error, True]
+
+    async def touch(self, job_id):
+        self.touched += 1
+
+    async def finish(self, job_id):
+        self.finished = True
+
+
+class FakeService:
+    async def arun_batch(self, payloads):
+        return [
+            BatchItemResult(index=i, error="positions 리스트가 비어있습니다.") if i == 1
+            else BatchItemResult(index=i, result=TagResponse(tags=["태그"]))
+            for i in range(len(payloads))
+        ]
+
+
+@pytest.mark.asyncio
+async def test_worker_processes_pending_items_in_chunks_and_resumes():
+    # 0, 1 번 항목은 재시작 전에 이미 저장됨
+    store = FakeStore(7, done={0, 1})
+    worker = JobWorker(store, FakeService, chunk_size=2)
+
+    assert await worker.run_once()
+    assert store.saved == [[2, 3], [4, 5], [6]]
+    assert store.finished
+    assert store.items[2][1] == {"tags": ["태그"], "usage": None}
+    # 청크 안에서 실패한 항목은 오류만 기록되고 나머지는 계속 처리
+    assert store.items[3][1:] == [None, "positions 리스트가 비어있습니다.", True]
+    assert not await worker.run_once()
+
+
+class FlakyService:
+    """처음 몇 번은 LLM 장애처럼 내부 오류를 내는 서비스 (항목별 호출 횟수 기준)"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    async def arun_batch(self, payloads):
+        self.calls += 1
+        return [
+            BatchItemResult(index=i, error=INTERNAL_ERROR) if self.calls <= self.failures
+            else BatchItemResult(index=i, result=TagResponse(tags=["태그"]))
+            for i in range(len(payloads))
+        ]
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_transient_failures_before_saving():
+    store = FakeStore(3)
+    svc = FlakyService(failures=2)     # 첫 바퀴의 두 청크가 실패
+    worker = JobWorker(store, lambda: svc, chunk_size=2, max_attempts=3, retry_backoff=0)
+
+    assert await worker.run_once()
+    # 실패한 항목은 저장하지 않고 (빈 저장으로 lease 만 연장) 다음 바퀴에서 다시 처리
+    assert store.saved == [[], [], [0, 1], [2]]
+    assert store.touched == 1 and store.finished
+    assert all(store.items[i][1:] == [{"tags": ["태그"], "usage": None}, None, True] for i in range(3))
+
+
+@pytest.mark.asyncio
+async def test_worker_saves_failure_after_last_attempt():
+    store = FakeStore(1)
+    worker = JobWorker(store, lambda: FlakyService(failures=10), max_attempts=2, retry_backoff=0)
+
+    assert await worker.run_once()
+    assert store.saved == [[], [0]]
+    assert store.items[0][1:] == [None, INTERNAL_ERROR, True]
+
+
+@pytest.mark.asyncio
+async def test_worker_stops_when_job_tables_are_missing():
+    from psycopg.errors import UndefinedTable
+
+    class MissingTableStore(FakeStore):
+        async def claim(self, lease):
+            raise UndefinedTable('relation "tag_job" does not exist')
+
+    worker = JobWorker(MissingTableStore(0), FakeService, poll_interval=0)
+    # 다시 시도하지 않고 바로 반환
+    await asyncio.wait_for(worker.run_forever(), timeout=1)
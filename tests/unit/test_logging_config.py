@@ -0,0 +1,34 @@
+# tests/unit/test_logging_config.py
+import json
+import logging
+import app.logging_config as logging_config
+from app.logging_config import JsonFormatter, configure_logging, preview_text, preview_vector, sampled
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.makeLogRecord({
+        "name": "app.test", "levelno": logging.WARNING, "levelname": "WARNING",
+        "msg": "deadline %s", "args": (5,), "company": "A",
+    })
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["msg"] == "deadline 5"
+    assert entry["level"] == "WARNING"
+    assert entry["company"] == "A"
+
+def test_configure_logging_sets_app_level_once(monkeypatch):
+    monkeypatch.setattr(logging_config, "_configured", False)
+    app_logger = logging.getLogger("app")
+    saved = (app_logger.handlers[:], app_logger.level, app_logger.propagate)
+    try:
+        configure_logging(level="INFO")
+        assert not logging.getLogger("app.services.inference").isEnabledFor(logging.DEBUG)
+        configure_logging(level="DEBUG")                  # 이미 설정됨 → 무시
+        assert app_logger.level == logging.INFO
+        assert len(app_logger.handlers) == 1
+    finally:
+        app_logger.handlers[:], app_logger.level, app_logger.propagate = saved
+
+def test_sampling_and_previews():
+    assert sampled(0) is False
+    assert sampled(1) is True
+    assert preview_text("x" * 10, limit=4) == "xxxx… (+6 chars)"
+    assert preview_vector([0.5] * 1536, dims=2) == "[0.5000, 0.5000, …] (dim=1536)"
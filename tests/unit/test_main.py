@@ -0,0 +1,73 @@
+# tests/unit/test_main.py
+import asyncio
+import time
+from fastapi.testclient import TestClient
+import app.main as main
+
+def test_lifespan_warms_up_and_closes(monkeypatch):
+    calls = []
+
+    async def warm_up():
+        calls.append("warm_up")
+
+    async def close_all():
+        calls.append("close_all")
+
+    monkeypatch.setattr(main, "WARMUP_ON_STARTUP", True)
+    monkeypatch.setattr(main, "warm_up", warm_up)
+    monkeypatch.setattr(main, "close_all", close_all)
+    monkeypatch.setattr(main, "JOB_WORKERS", 0)
+
+    with TestClient(main.app):
+        assert calls == ["warm_up"]
+    assert calls == ["warm_up", "close_all"]
+
+def test_lifespan_survives_warm_up_failure(monkeypatch):
+    async def warm_up():
+        raise ConnectionError("db down")
+
+    async def close_all():
+        pass
+
+    monkeypatch.setattr(main, "WARMUP_ON_STARTUP", True)
+    monkeypatch.setattr(main, "warm_up", warm_up)
+    monkeypatch.setattr(main, "close_all", close_all)
+    monkeypatch.setattr(main, "JOB_WORKERS", 0)
+
+    # warm-up 실패는 기동을 막지 않고 지연 생성으로 넘어가야 함
+    with TestClient(main.app) as client:
+        assert client.get("/openapi.json").status_code == 200
+
+def test_lifespan_starts_and_cancels_job_workers(monkeypatch):
+    state = {"running": 0, "cancelled": 0}
+
+    class FakeWorker:
+        def __init__(self, store, service_factory):
+            pass
+
+        async def run_forever(self):
+            state["running"] += 1
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                state["cancelled"] += 1
+                raise
+
+    async def close_all():
+        pass
+
+    monkeypatch.setattr(main, "WARMUP_ON_STARTUP", False)
+    monkeypatch.setattr(main, "close_all", close_all)
+    monkeypatch.setattr(main, "JOB_WORKERS", 2)
+    monkeypatch.setattr(main, "JobWorker", FakeWorker)
+    monkeypatch.setattr(main, "get_job_store", lambda: None)
+
+    with TestClient(main.app):
+        # 워커는 이벤트 루프(다른 스레드)에서 시작되므로 잠시 기다림
+        for _ in range(100):
+            if state["running"] == 2:
+                break
+            time.sleep(0.01)
+        assert state["running"] == 2
+    # 종료 시 워커를 취소 (처리 중이던 청크는 재시작 후 다시 처리됨)
+    assert state["cancelled"] == 2
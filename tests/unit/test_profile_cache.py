@@ -0,0 +1,28 @@
+# tests/unit/test_profile_cache.py
+
+import numpy as np
+from app.services.profile_cache import ProfileCache
+
+
+def test_replace_builds_float32_matrix_and_keeps_first_row():
+    cache = ProfileCache()
+    cache.replace(3, [
+        (1, [1.0, 2.0]),
+        (2, np.array([3.0, 4.0], dtype=np.float64)),
+        (1, [9.0, 9.0]),                   # 중복 회사는 첫 행만 사용
+    ])
+
+    a, b, missing = cache.lookup([1, 2, None])
+    assert cache.version == 3 and len(cache) == 2
+    assert a.dtype == np.float32 and a.tolist() == [1.0, 2.0]
+    assert b.tolist() == [3.0, 4.0]
+    assert missing is None
+
+
+def test_due_for_check_until_loaded_then_by_interval():
+    cache = ProfileCache(check_interval=3600)
+    assert cache.due_for_check()           # 아직 로드되지 않음
+
+    cache.replace(1, [])
+    assert not cache.due_for_check()
+    assert cache.due_for_check(0)
@@ -0,0 +1,37 @@
+# tests/unit/test_profile_text.py
+
+import json
+import os
+from app.services.profile_text import profile_sections, profile_text
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "..", "example_datas")
+
+
+def load_example(name):
+    with open(os.path.join(EXAMPLES, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_profile_sections_extract_fields_without_json_noise():
+    data = load_example("company_ex1_비바리퍼블리카.json")
+    sections = dict(profile_sections(data))
+
+    assert {"개요", "투자", "조직", "재무"} <= set(sections)
+    assert "비바리퍼블리카" in sections["개요"]
+    assert "series G" in sections["투자"]
+    # 인원 시계열은 월별 한 줄로 압축
+    assert "2025-01 1105(+66/-23)" in sections["조직"]
+
+    text = profile_text(data)
+    assert "https://" not in text and '{"' not in text
+    assert len(text) < len(json.dumps(data, ensure_ascii=False)) / 2
+
+
+def test_profile_text_tolerates_sparse_and_flat_profiles():
+    # seedCorp 없이 최상위에 회사 정보가 있고 products 가 문자열 목록인 경우
+    data = {"corpNameKr": "테스트", "products": ["A", "B"], "finance": {"data": [{"year": 2023, "aum": 5}]}}
+    text = profile_text(data)
+
+    assert text.split("\n\n")[0] == "[개요]\n회사: 테스트"
+    assert "- A" in text and "- 2023: aum 5" in text
+    assert profile_text({}) == ""
@@ -0,0 +1,90 @@
+# tests/unit/test_prompt_builder.py
+
+import datetime
+
+import pytest
+from app.services.prompt_builder import DOCS_HEADER, TRUNCATED, PromptBuilder, prune_resume
+from app.services.vector_search import Document
+
+
+class CharEncoder:
+    """문자 하나를 토큰 하나로 취급하는 테스트용 인코더"""
+
+    def encode(self, text):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+def doc(i, distance, content=None):
+    return Document(
+        id=i,
+        company_name="A",
+        doc_type="news",
+        content=content or f"뉴스 {i}",
+        published_at=datetime.date(2024, 1, i),
+        distance=distance,
+    )
+
+
+def test_prune_resume_keeps_tag_fields_only():
+    data = {
+        "firstName": "홍",
+        "photoUrl": "https://example.com/a.png",
+        "headline": "Backend Engineer",
+        "summary": "",
+        "skills": ["Python"],
+        "positions": [{
+            "title": "팀장",
+            "companyName": "A",
+            "companyLogo": "https://example.com/logo.png",
+            "description": "",
+            "startEndDate": {"start": {"year": 2019, "month": 2}, "end": None},
+        }],
+    }
+    assert prune_resume(data) == {
+        "headline": "Backend Engineer",
+        "skills": ["Python"],
+        "positions": [{"title": "팀장", "companyName": "A", "startEndDate": "2019.02–현재"}],
+    }
+
+
+def test_build_stays_within_budget_and_drops_least_relevant_docs():
+    builder = PromptBuilder(CharEncoder(), max_tokens=10_000, field_max_tokens=20, doc_max_tokens=30)
+    resume = {"headline": "x" * 100}
+    docs = [doc(3, 0.9, "가" * 100), doc(1, 0.1), doc(2, 0.5), doc(1, 0.1)]
+    full = builder.build(resume, docs)
+    # 중복 제거 후 거리 순, 긴 필드·스니펫은 말줄임표로 잘림
+    assert full.docs_available == 3 and full.docs_included == 3
+    listed = full.text.split(DOCS_HEADER)[1]
+    assert listed.index("뉴스 1") < listed.index("뉴스 2") < listed.index("가")
+    assert "x" * 19 + "…" in full.text and "가" * 29 + "…" in full.text
+    assert full.tokens == len(full.text)
+
+    # 관련도가 가장 낮은 문서 줄이 들어갈 자리를 빼면 그 문서만 빠짐
+    last_line = 1 + len("- [news] A (2024-01-03): ") + 30
+    tight = PromptBuilder(CharEncoder(), max_tokens=full.tokens - 1, field_max_tokens=20, doc_max_tokens=30)
+    prompt = tight.build(resume, docs)
+    assert prompt.docs_included == 2
+    assert prompt.tokens == full.tokens - last_line <= prompt.max_tokens
+    assert "가" * 29 not in prompt.text
+
+
+def test_budget_must_leave_room_after_template():
+    static = PromptBuilder(CharEncoder(), max_tokens=10_000).static_tokens
+    with pytest.raises(ValueError, match="leaves no room"):
+        PromptBuilder(CharEncoder(), max_tokens=static)
+    assert PromptBuilder(CharEncoder(), max_tokens=static + 1).static_tokens == static
+
+
+def test_truncate_respects_non_positive_limits():
+    builder = PromptBuilder(CharEncoder(), max_tokens=10_000)
+    assert builder._truncate("abcdef", 3).endswith(TRUNCATED)
+    assert len(builder._truncate("abcdef", 3)) == 2 + len(TRUNCATED)
+    assert builder._truncate("abcdef", 0) == ""
+    assert builder._truncate("abcdef", -5) == ""
+    # 필드 한도가 0 이어도 이력서 설명은 통째로 남지 않음
+    zero = PromptBuilder(CharEncoder(), max_tokens=10_000, field_max_tokens=0)
+    prompt = zero.build({"positions": [{"title": "팀장", "description": "아주 긴 설명"}]}, [])
+    assert "아주 긴 설명" not in prompt.text
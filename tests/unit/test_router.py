@@ -1,10 +1,20 @@
 # tests/unit/test_router.py
 import pytest
+from types import SimpleNamespace
 from fastapi.testclient import TestClient
 from app.main import app
+from app.deps import get_async_openai_client, get_async_vector_search, get_single_flight, get_tag_cache
 
 client = TestClient(app)
 
+@pytest.fixture(autouse=True)
+def offline_deps():
+    # 검증 실패 경로만 테스트하므로 실제 OpenAI 클라이언트·커넥션 풀 대신 더미 주입
+    app.dependency_overrides[get_async_openai_client] = lambda: SimpleNamespace()
+    app.dependency_overrides[get_async_vector_search] = lambda: SimpleNamespace()
+    yield
+    app.dependency_overrides.clear()
+
 def test_infer_endpoint_empty_positions():
     resp = client.post("/infer", json={"positions": []})
     assert resp.status_code == 400
@@ -14,3 +24,39 @@ def test_infer_endpoint_invalid_payload():
     # positions 필드 자체가 없으면 FastAPI validation error
     resp = client.post("/infer", json={})
     assert resp.status_code == 422
+
+def test_infer_endpoint_uses_shared_single_flight(monkeypatch):
+    seen = []
+
+    class FakeService:
+        def __init__(self, **kwargs):
+            seen.append(kwargs["single_flight"])
+
+        async def arun(self, payload):
+            return {"tags": []}
+
+    flight = object()
+    monkeypatch.setattr("app.routers.infer.InferenceService", FakeService)
+    app.dependency_overrides[get_tag_cache] = lambda: None
+    app.dependency_overrides[get_single_flight] = lambda: flight
+    item = {"positions": [{"title": "Engineer", "companyName": "A", "startEndDate": {"start": {"year": 2020, "month": 1}}}]}
+    assert client.post("/infer", json=item).status_code == 200
+    assert seen == [flight]
+
+def test_infer_batch_rejects_oversized_batch(monkeypatch):
+    monkeypatch.setattr("app.routers.infer.INFER_BATCH_MAX_ITEMS", 1)
+    item = {"positions": [{"title": "Engineer", "companyName": "A", "startEndDate": {"start": {"year": 2020, "month": 1}}}]}
+    resp = client.post("/infer/batch", json={"items": [item, item]})
+    assert resp.status_code == 400
+    assert "최대 1건" in resp.json()["detail"]
+
+    # 빈 배치는 스키마 검증 실패
+    assert client.post("/infer/batch", json={"items": []}).status_code == 422
+
+def test_metrics_exposes_pool_stats():
+    fake_vs = SimpleNamespace(pool_stats=lambda: {"pool_size": 2, "requests_waiting": 0})
+    app.dependency_overrides[get_async_vector_search] = lambda: fake_vs
+    app.dependency_overrides[get_tag_cache] = lambda: None
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.json()["db_pool"]["pool_size"] == 2
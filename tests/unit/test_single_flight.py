@@ -0,0 +1,66 @@
+# tests/unit/test_single_flight.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.services.single_flight import SingleFlight
+
+
+def test_do_coalesces_concurrent_calls_and_shares_errors():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    runs = []
+
+    def compute():
+        runs.append(1)
+        started.set()
+        release.wait(5)
+        return {"tags": ["A"]}
+
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(flight.do, "k", compute)
+        started.wait(5)
+        followers = [pool.submit(flight.do, "k", compute) for _ in range(3)]
+        # 후속 호출이 기다리기 시작할 때까지 대기
+        while flight.stats()["coalesced"] < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [f.result() for f in [leader, *followers]]
+
+    assert len(runs) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.stats() == {"calls": 4, "executed": 1, "coalesced": 3, "in_flight": 0}
+
+    # 끝난 키는 지워지므로 다음 호출은 다시 실행되고, 예외도 그대로 전파
+    def fail():
+        raise ValueError("No embedding for company A")
+
+    with pytest.raises(ValueError):
+        flight.do("k", fail)
+    assert flight.stats()["executed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ado_coalesces_and_survives_caller_cancellation():
+    flight = SingleFlight()
+    runs = 0
+
+    async def compute():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.05)
+        return "tags"
+
+    first = asyncio.ensure_future(flight.ado("k", compute))
+    others = [asyncio.ensure_future(flight.ado("k", compute)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    # 먼저 들어온 호출자가 취소되어도 공유 실행은 계속되어 나머지가 결과를 받음
+    first.cancel()
+    assert await asyncio.gather(*others) == ["tags", "tags"]
+    assert runs == 1
+    stats = flight.stats()
+    assert stats["executed"] == 1 and stats["coalesced"] == 2 and stats["in_flight"] == 0
+
+    assert await flight.ado("other", compute) == "tags"
+    assert runs == 2
@@ -0,0 +1,27 @@
+# tests/unit/test_tag_stream.py
+import json
+from app.services.tag_stream import TagStreamParser
+
+
+def test_parser_emits_each_tag_once_it_is_closed():
+    tags = ["상위권대학교 (연세대학교)", 'M&A 경험 ("요기요" 매각)', "리더쉽 (CTO\\팀장)"]
+    answer = "```json\n" + json.dumps({"tags": tags}, ensure_ascii=False, indent=2) + "\n```"
+    parser = TagStreamParser()
+
+    # 한 글자씩 흘려 넣어도 태그가 닫히는 순간에만, 이스케이프를 풀어 반환
+    emitted = []
+    for i, ch in enumerate(answer):
+        for tag in parser.feed(ch):
+            emitted.append((tag, i))
+    assert [t for t, _ in emitted] == tags
+    first_close = answer.index('",')
+    assert emitted[0][1] == first_close
+    assert parser.closed and parser.text == answer
+
+
+def test_parser_waits_for_tags_key_and_ignores_text_after_array():
+    parser = TagStreamParser()
+    assert parser.feed('{"summary": "무시", "ta') == []
+    assert parser.feed('gs": ["A", ') == ["A"]
+    assert parser.feed('1, "B"]') == ["B"]
+    assert parser.feed(', "other": ["C"]}') == []
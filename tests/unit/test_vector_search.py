@@ -1,8 +1,30 @@
 # tests/unit/test_vector_search.py
 
 import datetime
+import numpy as np
 import pytest
-from app.services.vector_search import VectorSearch, Document
+from app.services.candidate_stats import CANDIDATE_STATS_SQL, CandidateStats
+from app.services.company_ids import COMPANY_IDS_SQL, CompanyIds
+from app.services.profile_cache import PROFILE_EMBEDDINGS_SQL, PROFILE_VERSION_SQL, ProfileCache
+from app.services.vector_search import AsyncVectorSearch, VectorSearch, Document
+
+
+def loaded_profiles(*names):
+    # 확인 주기를 길게 잡아 테스트 중에는 DB 버전 확인이 일어나지 않도록 함 (company_id 는 1 부터)
+    cache = ProfileCache(check_interval=3600)
+    cache.replace(1, [(i + 1, np.full(3, i, dtype=np.float32)) for i, n in enumerate(names)])
+    return cache
+
+
+def known_companies(*names):
+    company_ids = CompanyIds(ttl=3600)
+    company_ids.add((n, i + 1) for i, n in enumerate(names))
+    return company_ids
+
+
+def search(*names, **kwargs):
+    """names 의 id 와 프로파일이 캐시에 있는 VectorSearch"""
+    return VectorSearch(profile_cache=loaded_profiles(*names), company_ids=known_companies(*names), **kwargs)
 
 class DummyCursor:
     def __init__(self, rows):
@@ -13,12 +35,12 @@ class DummyCursor:
         self.queries.append((query, params))
 
     def fetchone(self):
-        # 호출 순서에 따라 프로파일 임베딩, total count, in-range count 반환
+        # diagnostics 모드에서 total count, in-range count 순으로 반환
         return self._rows.pop(0)
 
     def fetchall(self):
-        # 최종 similarity 결과
-        return [("A", "news", "content", datetime.date(2025, 1, 1))]
+        # 최종 similarity 결과: (idx, id, doc_type, content, published_at, distance)
+        return [(1, 1, "news", "content", datetime.date(2025, 1, 1), 0.25)]
 
     def __enter__(self):
         return self
@@ -30,30 +52,44 @@ class DummyConn:
     def __init__(self, cursor):
         self._cursor = cursor
 
-    def cursor(self):
+    def cursor(self, binary=False):
         return self._cursor
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+class DummyPool:
+    def __init__(self, conn):
+        self._conn = conn
+        self.checkouts = 0
+
+    def connection(self):
+        self.checkouts += 1
+        return self._conn
+
+    def get_stats(self):
+        return {"pool_size": 1, "requests_num": self.checkouts}
+
 @pytest.fixture
 def dummy_db(monkeypatch):
     # 1) fake rows 준비
     rows = [
-        ([0.1, 0.2, 0.3],),  # profile embedding
         (10,),               # total non-profile count
         (5,)                 # in-range count
     ]
     cursor = DummyCursor(rows)
-    conn = DummyConn(cursor)
+    pool = DummyPool(DummyConn(cursor))
 
-    # 2) 환경변수 대체
-    monkeypatch.setenv("DATABASE_URL", "dummy")
-
-    # 3) psycopg.connect 모킹 (위치·키워드 인자 모두 허용)
-    monkeypatch.setattr("psycopg.connect", lambda *args, **kwargs: conn)
+    # 2) 커넥션 풀 생성 모킹
+    monkeypatch.setattr("app.services.vector_search.create_pool", lambda: pool)
 
     return cursor
 
 def test_most_similar_filters_and_orders(dummy_db):
-    vs = VectorSearch()
+    vs = search("AnyCo")
     docs = vs.most_similar(
         "AnyCo",
         start_date=datetime.date(2024, 1, 1),
@@ -64,7 +100,202 @@ def test_most_similar_filters_and_orders(dummy_db):
     # 반환 타입 및 쿼리 구조 검증
     assert isinstance(docs, list)
     assert isinstance(docs[0], Document)
+    assert docs[0].company_name == "AnyCo"
+    assert docs[0].distance == 0.25
 
+    # 프로파일 임베딩은 캐시에서 꺼내 파라미터로 전달되고, 유사도 검색 한 번만 실행되어야 함
     queries = [q for q, _ in dummy_db.queries]
-    assert "BETWEEN %s AND %s" in queries[-2]
-    assert "ORDER BY embedding <=> %s LIMIT %s" in queries[-1]
+    assert len(queries) == 1
+    assert "unnest(" in queries[0]
+    assert "BETWEEN r.start_date AND r.end_date" in queries[0]
+    assert "ORDER BY embedding <=> r.embedding" in queries[0]
+    _, params = dummy_db.queries[0]
+    assert params[0] == [1]
+    assert params[4][0].dtype == np.float32
+
+def test_most_similar_diagnostics_runs_counts(dummy_db):
+    vs = search("AnyCo", diagnostics=True)
+    vs.most_similar(
+        "AnyCo",
+        start_date=datetime.date(2024, 1, 1),
+        end_date=datetime.date(2024, 12, 31),
+        top_k=1
+    )
+
+    queries = [q for q, _ in dummy_db.queries]
+    assert len(queries) == 3
+    assert "COUNT(*)" in queries[0]
+    assert "COUNT(*)" in queries[1]
+    assert dummy_db.queries[1][1][0] == 1            # 회사 조건은 company_id
+    assert "unnest(" in queries[2]
+
+def test_most_similar_without_profile_raises(dummy_db):
+    cache = loaded_profiles("AnyCo")
+    cache.mark_checked()
+    vs = VectorSearch(profile_cache=cache, company_ids=known_companies("AnyCo", "NoProfileCo"))
+    with pytest.raises(ValueError):
+        vs.most_similar("NoProfileCo")
+    # 캐시 미스는 검색 SQL 을 실행하기 전에 실패해야 함
+    assert dummy_db.queries == []
+
+class ProfileCursor(DummyCursor):
+    """회사 id 조회 / 버전 확인 / 프로파일 로드 쿼리에 응답하는 커서"""
+
+    def __init__(self, version, profiles, companies):
+        super().__init__([])
+        self.version = version
+        self.profiles = profiles
+        self.companies = companies
+
+    def fetchone(self):
+        return (self.version,)
+
+    def fetchall(self):
+        query, params = self.queries[-1]
+        if query == PROFILE_EMBEDDINGS_SQL:
+            return list(self.profiles)
+        if query == COMPANY_IDS_SQL:
+            return [(n, self.companies[n]) for n in params[0] if n in self.companies]
+        return []
+
+def test_profile_cache_loaded_lazily_and_reloaded_on_version_bump():
+    cursor = ProfileCursor(1, [(1, np.ones(3, dtype=np.float32))], {"AnyCo": 1, "NewCo": 2})
+    cache = ProfileCache(check_interval=0)
+    vs = VectorSearch(pool=DummyPool(DummyConn(cursor)), profile_cache=cache)
+
+    vs.most_similar("AnyCo")                    # 최초 호출: id 조회 + 후보 통계 + 버전 확인 + 전체 로드 + 검색
+    assert cache.version == 1 and len(cache) == 1
+    assert [q for q, _ in cursor.queries][:2] == [COMPANY_IDS_SQL, CANDIDATE_STATS_SQL]
+    assert len(cursor.queries) == 5
+
+    cursor.queries.clear()
+    vs.most_similar("AnyCo")                    # id 는 캐시, 버전 동일 → 다시 읽지 않음 (통계는 확인 주기 전)
+    assert [q for q, _ in cursor.queries][0] == PROFILE_VERSION_SQL
+    assert len(cursor.queries) == 2
+
+    cursor.version = 2                          # embed_docs 가 버전을 올림 → 재로드
+    cursor.profiles.append((2, np.zeros(3, dtype=np.float32)))
+    vs.most_similar("NewCo")
+    assert cache.version == 2 and len(cache) == 2
+    assert len(vs.company_ids) == 2
+
+def test_most_similar_many_groups_per_request(dummy_db, monkeypatch):
+    monkeypatch.setattr(dummy_db, "fetchall", lambda: [
+        (1, 11, "news", "a1", datetime.date(2024, 1, 1), 0.1),
+        (1, 12, "news", "a2", datetime.date(2024, 2, 1), 0.2),
+        # idx 2 (B): 프로파일은 있지만 문서 없음 → 행 없음
+        (3, 31, "news", "c1", datetime.date(2024, 3, 1), 0.3),
+    ])
+    vs = search("A", "B", "C")
+    groups = vs.most_similar_many([
+        ("A", None, None, 2),
+        ("B", datetime.date(2024, 1, 1), datetime.date(2024, 6, 30), 3),
+        ("C", None, None, 1),
+        ("A", None, None, 2),                # 중복 요청은 한 번만 조회
+    ])
+
+    assert [[d.content for d in g] for g in groups] == [["a1", "a2"], [], ["c1"], ["a1", "a2"]]
+    assert [d.company_name for d in groups[2]] == ["C"]
+    _, params = dummy_db.queries[-1]
+    assert params[0] == [1, 2, 3]
+    assert params[3] == [2, 3, 1]
+    assert [v[0] for v in params[4]] == [0, 1, 2]
+    assert params[5] == [True, True, True]       # 통계 없음 → 모두 정확 검색
+
+def test_most_similar_picks_ann_for_companies_with_many_docs(dummy_db, monkeypatch):
+    stats = CandidateStats(exact_max_rows=100, ann_candidates=40)
+    # 전체 1000행 중 A(id 1) 가 50% (ANN 후보 40 개 중 약 20 개), 나머지는 9개 회사에 고르게 (각 약 56행)
+    # published_at 히스토그램은 2023~2024 두 구간 (구간마다 50%)
+    bounds = [datetime.date(2023, 1, 1), datetime.date(2024, 1, 1), datetime.date(2025, 1, 1)]
+    stats.replace([(1000.0, 10.0, [1], [0.5], bounds)])
+    # ANN 으로 간 요청은 모두 top_k 를 채움
+    monkeypatch.setattr(dummy_db, "fetchall", lambda: [
+        (idx, idx, "news", "doc", datetime.date(2024, 1, 1), 0.1) for idx in (1, 3) for _ in range(2)
+    ])
+    vs = search("A", "B", candidate_stats=stats)
+    vs.most_similar_many([
+        ("A", None, None, 2),
+        ("B", None, None, 2),
+        ("A", datetime.date(2024, 1, 1), datetime.date(2024, 12, 31), 2),   # 기간 내 약 250 개 → ANN
+        ("A", datetime.date(2024, 1, 1), datetime.date(2024, 1, 31), 2),    # 기간 내 약 21 개 → 정확 검색
+    ])
+
+    assert len(dummy_db.queries) == 1
+    query, params = dummy_db.queries[0]
+    assert params[5] == [False, True, False, True]
+    assert params[6] == 40
+    assert "WHERE r.exact" in query and "WHERE NOT r.exact" in query
+
+def test_ann_results_short_of_top_k_are_retried_exact(dummy_db, monkeypatch):
+    stats = CandidateStats(exact_max_rows=100, ann_candidates=40)
+    stats.replace([(1000.0, 10.0, [1, 2], [0.4, 0.4], None)])
+    vs = search("A", "B", candidate_stats=stats)
+    results = iter([
+        # 1차: A(idx 1) 는 ANN 으로 top_k 를 채웠지만 B(idx 2) 는 한 건뿐
+        [(1, 11, "news", "a1", datetime.date(2024, 1, 1), 0.1),
+         (1, 12, "news", "a2", datetime.date(2024, 1, 2), 0.2),
+         (2, 21, "news", "b-ann", datetime.date(2024, 1, 3), 0.5)],
+        # 2차: B 만 정확 검색 (idx 는 재조회 배열 기준 1)
+        [(1, 22, "news", "b1", datetime.date(2024, 1, 4), 0.3),
+         (1, 21, "news", "b-ann", datetime.date(2024, 1, 3), 0.5)],
+    ])
+    monkeypatch.setattr(dummy_db, "fetchall", lambda: next(results))
+
+    groups = vs.most_similar_many([("A", None, None, 2), ("B", None, None, 2)])
+
+    assert [[d.content for d in g] for g in groups] == [["a1", "a2"], ["b1", "b-ann"]]
+    assert [d.company_name for d in groups[1]] == ["B", "B"]
+    (_, first), (_, retry) = dummy_db.queries
+    assert first[5] == [False, False]
+    assert retry[0] == [2] and retry[3] == [2] and retry[5] == [True]
+
+def test_most_similar_uses_pool_per_call(dummy_db):
+    vs = search("AnyCo")
+    vs.most_similar("AnyCo")
+    vs.most_similar("AnyCo")
+    assert vs.pool_stats()["requests_num"] == 2
+
+class AsyncDummyCursor(DummyCursor):
+    async def execute(self, query, params=None):
+        self.queries.append((query, params))
+
+    async def fetchone(self):
+        return self._rows.pop(0)
+
+    async def fetchall(self):
+        return DummyCursor.fetchall(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+class AsyncDummyConn(DummyConn):
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+class AsyncDummyPool(DummyPool):
+    closed = False
+
+@pytest.mark.asyncio
+async def test_async_most_similar_single_query():
+    cursor = AsyncDummyCursor([])
+    vs = AsyncVectorSearch(
+        pool=AsyncDummyPool(AsyncDummyConn(cursor)),
+        profile_cache=loaded_profiles("AnyCo"),
+        company_ids=known_companies("AnyCo"),
+    )
+    docs = await vs.most_similar(
+        "AnyCo",
+        start_date=datetime.date(2024, 1, 1),
+        end_date=datetime.date(2024, 12, 31),
+        top_k=1
+    )
+
+    assert [d.content for d in docs] == ["content"]
+    assert len(cursor.queries) == 1
+    assert "unnest(" in cursor.queries[0][0]